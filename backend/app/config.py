@@ -12,11 +12,16 @@ load_dotenv(_env_path)
 # ── API Keys ──────────────────────────────────────────────────
 REPLICATE_API_TOKEN = os.getenv("REPLICATE_API_TOKEN", "")
 RUNPOD_API_KEY = os.getenv("RUNPOD_API_KEY", "")
+# Required in the X-Admin-Token header of /api/admin endpoints (empty = disabled)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
 
 # ── Paths ─────────────────────────────────────────────────────
 BASE_DIR = Path(__file__).resolve().parent.parent
 OUTPUTS_DIR = BASE_DIR / "outputs"
 OUTPUTS_DIR.mkdir(exist_ok=True)
+# Local state (job database, cache indexes)
+DATA_DIR = Path(os.getenv("DATA_DIR", str(BASE_DIR / "data")))
+DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 # ── Model IDs ─────────────────────────────────────────────────
 # Replicate model for 3D mesh generation
@@ -31,6 +36,162 @@ TEXTURE_MODEL_ID = os.getenv(
     "jagilley/controlnet-depth:922c7bb67b87ec32cbc2fd11b1d5f94f0ba4f5519c4dbd02856376444127cc60"
 )
 
+# ── Provider Routing ──────────────────────────────────────────
+# RunPod serverless endpoints running the mesh/texture models (empty = Replicate only)
+RUNPOD_MESH_ENDPOINT = os.getenv("RUNPOD_MESH_ENDPOINT", "")
+RUNPOD_TEXTURE_ENDPOINT = os.getenv("RUNPOD_TEXTURE_ENDPOINT", "")
+# Predictions per provider model the latency estimates are taken over
+PROVIDER_LATENCY_WINDOW = int(os.getenv("PROVIDER_LATENCY_WINDOW", "50"))
+# Duplicate a prediction on the next provider if it has not started after
+# this many seconds (0 = no hedging)
+PROVIDER_HEDGE_AFTER = float(os.getenv("PROVIDER_HEDGE_AFTER", "0"))
+# Seconds added to a provider's expected latency per unit of recent failure rate
+PROVIDER_FAILURE_PENALTY = float(os.getenv("PROVIDER_FAILURE_PENALTY", "60"))
+
+# ── Provider Resilience ───────────────────────────────────────
+# Tries per provider HTTP call and the jittered exponential backoff
+# between them, in seconds; Retry-After is honored up to its own cap
+PROVIDER_RETRY_ATTEMPTS = int(os.getenv("PROVIDER_RETRY_ATTEMPTS", "4"))
+PROVIDER_RETRY_BASE_DELAY = float(os.getenv("PROVIDER_RETRY_BASE_DELAY", "0.5"))
+PROVIDER_RETRY_MAX_DELAY = float(os.getenv("PROVIDER_RETRY_MAX_DELAY", "20"))
+PROVIDER_RETRY_AFTER_MAX = float(os.getenv("PROVIDER_RETRY_AFTER_MAX", "60"))
+# Consecutive failures that open a provider's circuit, and seconds it
+# stays open before a probe request is let through
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("BREAKER_RESET_TIMEOUT", "30"))
+
+# ── Admission Control ─────────────────────────────────────────
+def _per_provider(value: str, cast):
+    """Parse "replicate=8,runpod=4" into {"replicate": 8, "runpod": 4}."""
+    return {
+        name.strip(): cast(limit)
+        for name, limit in (pair.split("=") for pair in value.split(",") if "=" in pair)
+    }
+
+
+# Predictions running at once and created per second, per provider model
+# (0 or missing = unlimited)
+PROVIDER_MAX_CONCURRENCY = _per_provider(os.getenv("PROVIDER_MAX_CONCURRENCY", "replicate=8,runpod=4"), int)
+PROVIDER_RATE_LIMIT = _per_provider(os.getenv("PROVIDER_RATE_LIMIT", "replicate=2,runpod=2"), float)
+PROVIDER_RATE_BURST = int(os.getenv("PROVIDER_RATE_BURST", "5"))
+# Predictions allowed to wait for a slot before requests get a 429
+PROVIDER_MAX_WAITING = int(os.getenv("PROVIDER_MAX_WAITING", "32"))
+
+# ── HTTP Connection Pools ─────────────────────────────────────
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() in ("1", "true", "yes")
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+# Per-operation timeouts, in seconds
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "10"))
+HTTP_CREATE_TIMEOUT = float(os.getenv("HTTP_CREATE_TIMEOUT", "30"))
+HTTP_POLL_TIMEOUT = float(os.getenv("HTTP_POLL_TIMEOUT", "15"))
+HTTP_DOWNLOAD_TIMEOUT = float(os.getenv("HTTP_DOWNLOAD_TIMEOUT", "120"))
+
+# ── Downloads ─────────────────────────────────────────────────
+# Largest provider asset accepted, streamed in chunks of DOWNLOAD_CHUNK_SIZE
+DOWNLOAD_MAX_BYTES = int(os.getenv("DOWNLOAD_MAX_BYTES", str(1024 ** 3)))
+DOWNLOAD_CHUNK_SIZE = int(os.getenv("DOWNLOAD_CHUNK_SIZE", str(1024 * 1024)))
+# Range-resume attempts after a connection drops mid-download
+DOWNLOAD_RESUME_ATTEMPTS = int(os.getenv("DOWNLOAD_RESUME_ATTEMPTS", "3"))
+
+# ── Prediction Completion ─────────────────────────────────────
+# Public base URL providers can reach for completion webhooks
+# (e.g. an ngrok tunnel). Leave empty to rely on polling only.
+WEBHOOK_BASE_URL = os.getenv("WEBHOOK_BASE_URL", "")
+# Shared secret appended to webhook URLs and checked on receipt
+# (required: webhooks stay off without it)
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
+# Adaptive polling bounds, in seconds
+POLL_MIN_INTERVAL = float(os.getenv("POLL_MIN_INTERVAL", "0.5"))
+POLL_MAX_INTERVAL = float(os.getenv("POLL_MAX_INTERVAL", "10"))
+# Safety-net poll interval while a webhook is expected
+POLL_WEBHOOK_INTERVAL = float(os.getenv("POLL_WEBHOOK_INTERVAL", "20"))
+
+# ── Depth Rendering ───────────────────────────────────────────
+# ControlNet depth input size and supersampling factor (1 = off)
+DEPTH_MAP_RESOLUTION = int(os.getenv("DEPTH_MAP_RESOLUTION", "512"))
+DEPTH_MAP_SUPERSAMPLE = int(os.getenv("DEPTH_MAP_SUPERSAMPLE", "2"))
+
+# ── AR Export ─────────────────────────────────────────────────
+# Face ratios of the quantized level-of-detail GLBs, finest first (below 1:
+# the full-detail level is the exported GLB)
+EXPORT_LOD_RATIOS = [
+    float(ratio) for ratio in os.getenv("EXPORT_LOD_RATIOS", "0.25,0.05").split(",") if ratio.strip()
+]
+
+# ── Static Outputs ────────────────────────────────────────────
+# Precompressed gzip/brotli copies of files in OUTPUTS_DIR
+STATIC_ENCODED_DIR = DATA_DIR / "encoded"
+# Browser cache lifetime for outputs (named by job id, never rewritten)
+STATIC_CACHE_MAX_AGE = int(os.getenv("STATIC_CACHE_MAX_AGE", str(365 * 86400)))
+
+# ── Mesh Cache ────────────────────────────────────────────────
+# Upper bound on parsed geometry kept in memory per process
+MESH_CACHE_MAX_BYTES = int(os.getenv("MESH_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+# ── Geometry Workers ──────────────────────────────────────────
+# Process pool for CPU-heavy mesh work (physics, depth maps, export)
+GEOMETRY_WORKERS = int(os.getenv("GEOMETRY_WORKERS", str(os.cpu_count() or 1)))
+# Tasks allowed to wait for a free worker before requests get a 503
+GEOMETRY_MAX_QUEUE = int(os.getenv("GEOMETRY_MAX_QUEUE", "32"))
+# Wall-clock limit per geometry task, in seconds
+GEOMETRY_TASK_TIMEOUT = float(os.getenv("GEOMETRY_TASK_TIMEOUT", "120"))
+# Most meshes accepted by one POST /api/physics/batch request
+PHYSICS_BATCH_MAX = int(os.getenv("PHYSICS_BATCH_MAX", "500"))
+# OBJ files at least this large (without a sidecar) are analyzed by the
+# streaming reader instead of being parsed into a Trimesh
+PHYSICS_STREAM_MIN_BYTES = int(os.getenv("PHYSICS_STREAM_MIN_BYTES", str(64 * 1024 * 1024)))
+PHYSICS_STREAM_CHUNK_BYTES = int(os.getenv("PHYSICS_STREAM_CHUNK_BYTES", str(4 * 1024 * 1024)))
+# Default sample budget and confidence level of mode="fast" physics
+PHYSICS_FAST_SAMPLES = int(os.getenv("PHYSICS_FAST_SAMPLES", "20000"))
+PHYSICS_FAST_CONFIDENCE = float(os.getenv("PHYSICS_FAST_CONFIDENCE", "0.95"))
+
+# ── Background Jobs ───────────────────────────────────────────
+JOBS_DB_PATH = DATA_DIR / "jobs.sqlite3"
+# Concurrent job workers and max jobs waiting in the queue
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "8"))
+JOB_MAX_QUEUED = int(os.getenv("JOB_MAX_QUEUED", "200"))
+# Per-provider cap on concurrently running jobs, e.g. "replicate=4,runpod=2"
+JOB_PROVIDER_CONCURRENCY = _per_provider(os.getenv("JOB_PROVIDER_CONCURRENCY", "replicate=4,runpod=2"), int)
+
+# ── Result Cache ──────────────────────────────────────────────
+# Content-addressed reuse of generated artifacts across requests
+RESULT_CACHE_DB_PATH = DATA_DIR / "result_cache.sqlite3"
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(5 * 1024 ** 3)))
+RESULT_CACHE_MAX_AGE = float(os.getenv("RESULT_CACHE_MAX_AGE_DAYS", "30")) * 86400
+
+# ── Single-Flight ─────────────────────────────────────────────
+# Identical concurrent generate/texture requests always share one
+# prediction within a process; with leases enabled, also across workers
+SINGLE_FLIGHT_LEASES = os.getenv("SINGLE_FLIGHT_LEASES", "false").lower() in ("1", "true", "yes")
+SINGLE_FLIGHT_DB_PATH = DATA_DIR / "leases.sqlite3"
+# Lease lifetime (renewed every third of it while running) and how often
+# waiting workers check whether the holder has finished, in seconds
+SINGLE_FLIGHT_LEASE_TTL = float(os.getenv("SINGLE_FLIGHT_LEASE_TTL", "60"))
+SINGLE_FLIGHT_POLL_INTERVAL = float(os.getenv("SINGLE_FLIGHT_POLL_INTERVAL", "1"))
+
+# ── Catalog ───────────────────────────────────────────────────
+# Furniture catalog source: a JSON list or a SQLite file with an `items` table
+CATALOG_PATH = Path(os.getenv("CATALOG_PATH", str(BASE_DIR / "app" / "data" / "catalog.json")))
+CATALOG_PAGE_SIZE = int(os.getenv("CATALOG_PAGE_SIZE", "50"))
+CATALOG_MAX_PAGE_SIZE = int(os.getenv("CATALOG_MAX_PAGE_SIZE", "200"))
+# Pre-generated catalog assets and the provider concurrency used to warm them
+CATALOG_ASSETS_DB_PATH = DATA_DIR / "catalog_assets.sqlite3"
+CATALOG_WARM_CONCURRENCY = int(
+    os.getenv("CATALOG_WARM_CONCURRENCY", str(JOB_PROVIDER_CONCURRENCY.get("replicate", 4)))
+)
+
+# ── Metrics ───────────────────────────────────────────────────
+# How often the event-loop lag probe wakes up, in seconds (0 = off)
+METRICS_LOOP_LAG_INTERVAL = float(os.getenv("METRICS_LOOP_LAG_INTERVAL", "0.5"))
+
+# ── Profiling ─────────────────────────────────────────────────
+# Admin requests sent with `X-Profile: 1` are sampled every
+# PROFILE_INTERVAL seconds and saved here as collapsed stacks
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", str(DATA_DIR / "profiles")))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.005"))
+
 # ── Server ────────────────────────────────────────────────────
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", "8000"))
@@ -1,13 +1,21 @@
 """
 White Dwarf — FastAPI Main Application
 """
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
-from .config import OUTPUTS_DIR
-from .routers import generate, physics, texture, export, catalog
+from .config import OUTPUTS_DIR, CATALOG_PATH, METRICS_LOOP_LAG_INTERVAL
+from .routers import generate, physics, texture, export, catalog, webhooks, jobs, cache, admin, providers, metrics
+from .services.executor import geometry_executor
+from .services.clients import start_clients, close_clients
+from .services.jobs import job_manager
+from .services.static_files import OutputStaticFiles
+from .services.catalog_store import catalog_store
+from .services.metrics import monitor_loop_lag
+from .services.tracing import ServerTimingMiddleware
 
 # Configure logging
 logging.basicConfig(
@@ -15,11 +23,35 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Catalog snapshot and its search indexes
+    catalog_store.load(CATALOG_PATH)
+    # Worker processes for CPU-heavy geometry, kept off the event loop
+    geometry_executor.start()
+    # Long-lived provider/download connection pools
+    start_clients()
+    # Background workers for queued generate/texture jobs
+    await job_manager.start()
+    # Event-loop lag probe feeding /metrics
+    lag_probe = None
+    if METRICS_LOOP_LAG_INTERVAL > 0:
+        lag_probe = asyncio.create_task(monitor_loop_lag(METRICS_LOOP_LAG_INTERVAL))
+    yield
+    if lag_probe is not None:
+        lag_probe.cancel()
+    await job_manager.stop()
+    await close_clients()
+    geometry_executor.shutdown()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="White Dwarf",
     description="AI-powered 3D model generator with physics validation and VR export",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS — allow frontend dev server
@@ -31,9 +63,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Server-Timing spans on every response; admin requests may ask for a profile
+app.add_middleware(ServerTimingMiddleware)
+
 # Serve generated files as static
 OUTPUTS_DIR.mkdir(exist_ok=True)
-app.mount("/outputs", StaticFiles(directory=str(OUTPUTS_DIR)), name="outputs")
+app.mount("/outputs", OutputStaticFiles(directory=str(OUTPUTS_DIR)), name="outputs")
 
 # Register routers
 app.include_router(generate.router, prefix="/api", tags=["Generate"])
@@ -41,6 +76,13 @@ app.include_router(physics.router, prefix="/api", tags=["Physics"])
 app.include_router(texture.router, prefix="/api", tags=["Texture"])
 app.include_router(export.router, prefix="/api", tags=["Export"])
 app.include_router(catalog.router, prefix="/api", tags=["Catalog"])
+app.include_router(webhooks.router, prefix="/api", tags=["Webhooks"])
+app.include_router(jobs.router, prefix="/api", tags=["Jobs"])
+app.include_router(cache.router, prefix="/api", tags=["Cache"])
+app.include_router(providers.router, prefix="/api", tags=["Providers"])
+app.include_router(admin.router, prefix="/api", tags=["Admin"])
+# Prometheus scrapes /metrics at the root by convention
+app.include_router(metrics.router, tags=["Metrics"])
 
 
 @app.get("/")
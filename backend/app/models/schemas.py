@@ -2,7 +2,7 @@
 White Dwarf — Pydantic Models / Schemas
 """
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Literal
 
 
 class GenerateRequest(BaseModel):
@@ -11,11 +11,18 @@ class GenerateRequest(BaseModel):
 
 class GenerateResponse(BaseModel):
     mesh_url: str = Field(..., description="URL path to the generated .obj mesh file")
+    cached: bool = Field(False, description="Whether the mesh was served from the result cache")
     message: str = "Mesh generated successfully"
 
 
 class PhysicsRequest(BaseModel):
     mesh_url: str = Field(..., description="URL path to the .obj mesh file to analyze")
+    mode: Literal["exact", "fast"] = Field("exact", description="'fast' samples the mesh and reports confidence intervals")
+    samples: Optional[int] = Field(None, ge=1000, le=1_000_000, description="Sample budget for fast mode")
+
+
+class PhysicsBatchRequest(BaseModel):
+    mesh_urls: List[str] = Field(..., min_length=1, description="URL paths of the .obj meshes to analyze")
 
 
 class PhysicsResult(BaseModel):
@@ -24,25 +31,63 @@ class PhysicsResult(BaseModel):
     base_support_ratio: float = Field(0.0, description="Ratio of base area to total footprint")
     bounding_box: List[float] = Field(default_factory=lambda: [0, 0, 0], description="Width, Height, Depth of bounding box")
     verdict: str = Field("", description="Human-readable stability verdict")
+    mode: str = Field("exact", description="Analysis actually used: exact or fast")
+    samples: Optional[int] = Field(None, description="Faces/vertices sampled in fast mode")
+    escalated: bool = Field(False, description="Fast mode fell back to exact because the verdict was near a threshold")
+    center_of_mass_y_ci: Optional[List[float]] = Field(None, description="Confidence interval [low, high] in fast mode")
+    base_support_ratio_ci: Optional[List[float]] = Field(None, description="Confidence interval [low, high] in fast mode")
 
 
 class TextureRequest(BaseModel):
     mesh_url: str = Field(..., description="URL path to the .obj mesh file")
     material_prompt: str = Field(..., description="Description of the desired material/texture")
+    no_cache: bool = Field(False, description="Skip the texture result cache and regenerate")
 
 
 class TextureResponse(BaseModel):
     textured_model_url: str = Field("", description="URL to the textured model (GLB)")
     texture_image_url: Optional[str] = Field(None, description="URL to the generated texture image")
+    cached: bool = Field(False, description="Whether the texture was served from the result cache")
     message: str = "Texture applied successfully"
 
 
 class ExportRequest(BaseModel):
     mesh_url: str = Field(..., description="URL path to the mesh file to export")
+    lods: bool = Field(False, description="Also produce decimated, quantized GLB levels of detail")
+
+
+class LodAsset(BaseModel):
+    ratio: float = Field(..., description="Fraction of the source faces kept")
+    faces: int
+    url: str
+    bytes: int
 
 
 class ExportResponse(BaseModel):
     glb_url: Optional[str] = Field(None, description="Download URL for .glb file")
     usdz_url: Optional[str] = Field(None, description="Download URL for .usdz file")
     public_url: Optional[str] = Field(None, description="Temporary public URL for AR preview")
+    lods: List[LodAsset] = Field(default_factory=list, description="Levels of detail, finest first")
+    cached: bool = Field(False, description="Whether up-to-date exports were reused")
+    timings: Dict[str, float] = Field(default_factory=dict, description="Seconds per conversion step")
     message: str = "Export complete"
+
+
+class JobSubmitResponse(BaseModel):
+    job_id: str = Field(..., description="Identifier to poll at GET /api/jobs/{job_id}")
+    state: str = Field(..., description="queued | running | succeeded | failed")
+    status_url: str = Field(..., description="URL path to poll for job status")
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    kind: str = Field(..., description="generate | texture")
+    state: str = Field(..., description="queued | running | succeeded | failed")
+    current_stage: Optional[str] = Field(None, description="Stage currently executing, if running")
+    stages: Dict[str, float] = Field(default_factory=dict, description="Seconds spent per completed stage")
+    result: Optional[Dict[str, Any]] = Field(None, description="Result URLs once succeeded")
+    error: Optional[str] = None
+    queue_depth: Optional[int] = Field(None, description="Jobs waiting ahead, while queued")
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
@@ -0,0 +1,43 @@
+"""
+White Dwarf — Admin Router
+Operator endpoints guarded by ADMIN_TOKEN:
+POST /api/admin/catalog/warm → Start pre-generating catalog assets
+GET  /api/admin/catalog/warm → Progress of the current/last warm run
+"""
+import hmac
+import logging
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from ..config import ADMIN_TOKEN
+from ..services.catalog_store import catalog_store
+from ..services.catalog_warm import catalog_warmer
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+def require_admin(x_admin_token: str = Header("")):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (set ADMIN_TOKEN)")
+    if not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@router.post("/admin/catalog/warm", status_code=202, dependencies=[Depends(require_admin)])
+async def warm_catalog(force: bool = False):
+    """
+    Generate, analyze and export meshes for every catalog item in the
+    background. Items already warmed with the same prompt and model are
+    skipped unless `force` is set.
+    """
+    items = [catalog_store.get(item_id) for item_id in catalog_store.ids()]
+    try:
+        return catalog_warmer.start(items, force=force)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("/admin/catalog/warm", dependencies=[Depends(require_admin)])
+async def warm_status():
+    """Return counts and per-item errors of the current or last warm run."""
+    return catalog_warmer.status()
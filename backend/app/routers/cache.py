@@ -0,0 +1,20 @@
+"""
+White Dwarf — Cache Router
+GET /api/cache/stats → Hit/miss statistics for the result caches
+"""
+from fastapi import APIRouter
+
+from ..services.result_cache import mesh_results, texture_results
+from ..services.single_flight import mesh_flights, texture_flights
+
+router = APIRouter()
+
+
+@router.get("/cache/stats")
+async def cache_stats():
+    """Return entry counts, sizes and hit ratios per result cache, plus request coalescing."""
+    return {
+        "mesh": mesh_results.stats(),
+        "texture": texture_results.stats(),
+        "single_flight": {"mesh": mesh_flights.stats(), "texture": texture_flights.stats()},
+    }
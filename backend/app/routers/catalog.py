@@ -1,136 +1,71 @@
 """
 White Dwarf — Catalog Router
-Serves the furniture catalog data.
+Serves the furniture catalog data: indexed lookups, filtered and
+cursor-paginated listings, full-text search and facet counts.
 """
-from fastapi import APIRouter, HTTPException
+import hashlib
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response
+
+from ..config import CATALOG_PAGE_SIZE, CATALOG_MAX_PAGE_SIZE
+from ..services.catalog_store import catalog_store
+from ..services.catalog_warm import catalog_warmer, asset_summary
 
 router = APIRouter()
 
-FURNITURE_CATALOG = [
-    {
-        "id": "nordic-chair",
-        "name": "Nordic Lounge Chair",
-        "description": "A beautifully sculpted Scandinavian-inspired lounge chair with organic curves and solid wood legs.",
-        "category": "Chairs",
-        "price": 899,
-        "modelPrompt": "A Nordic Scandinavian lounge chair with organic curved backrest, solid oak wood legs, minimalist design, light fabric upholstery",
-        "tags": ["modern", "scandinavian", "wood", "lounge"],
-    },
-    {
-        "id": "glass-coffee-table",
-        "name": "Crystalline Coffee Table",
-        "description": "Elegant tempered glass coffee table with a geometric brushed-gold metal frame.",
-        "category": "Tables",
-        "price": 1249,
-        "modelPrompt": "An elegant tempered glass coffee table with geometric brushed gold metal frame, contemporary design",
-        "tags": ["modern", "glass", "gold", "luxury"],
-    },
-    {
-        "id": "velvet-sofa",
-        "name": "Velvet Cloud Sofa",
-        "description": "Deep-seated velvet sofa with plush cushioning and tapered brass legs.",
-        "category": "Sofas",
-        "price": 2499,
-        "modelPrompt": "A luxurious deep-seated velvet sofa with plush cushioning, tapered brass legs, emerald green velvet",
-        "tags": ["luxury", "velvet", "green", "modern"],
-    },
-    {
-        "id": "modular-shelf",
-        "name": "Hex Modular Shelving",
-        "description": "Honeycomb-inspired modular wall shelving system in matte black steel.",
-        "category": "Storage",
-        "price": 679,
-        "modelPrompt": "Hexagonal honeycomb modular wall shelving system, matte black steel, geometric design",
-        "tags": ["modular", "geometric", "black", "wall-mount"],
-    },
-    {
-        "id": "pendant-light",
-        "name": "Aurora Pendant Light",
-        "description": "Blown glass pendant lamp with gradient amber-to-clear finish.",
-        "category": "Lighting",
-        "price": 459,
-        "modelPrompt": "A blown glass pendant lamp with gradient amber to clear finish, sculptural organic shape",
-        "tags": ["glass", "amber", "pendant", "artisan"],
-    },
-    {
-        "id": "dining-table",
-        "name": "Live Edge Dining Table",
-        "description": "Solid walnut dining table with natural live edge and matte black steel legs.",
-        "category": "Tables",
-        "price": 3299,
-        "modelPrompt": "A solid walnut live edge dining table with natural wood grain, matte black steel legs",
-        "tags": ["walnut", "rustic", "live-edge", "dining"],
-    },
-    {
-        "id": "accent-chair",
-        "name": "Bouclé Accent Chair",
-        "description": "Cozy boucle fabric accent chair with curved wraparound back and walnut dowel legs.",
-        "category": "Chairs",
-        "price": 749,
-        "modelPrompt": "A cozy boucle fabric accent chair with curved wraparound backrest, walnut dowel legs",
-        "tags": ["boucle", "cream", "mid-century", "accent"],
-    },
-    {
-        "id": "floor-lamp",
-        "name": "Arc Floor Lamp",
-        "description": "Sweeping arc floor lamp with brushed nickel finish and linen drum shade.",
-        "category": "Lighting",
-        "price": 389,
-        "modelPrompt": "A sweeping arc floor lamp with brushed nickel metal finish, linen drum shade",
-        "tags": ["nickel", "arc", "modern", "floor"],
-    },
-    {
-        "id": "sectional-sofa",
-        "name": "Modular Sectional",
-        "description": "Configurable modular sectional in performance linen.",
-        "category": "Sofas",
-        "price": 3899,
-        "modelPrompt": "A large modular sectional sofa in light gray performance linen, L-shaped configuration",
-        "tags": ["modular", "linen", "gray", "sectional"],
-    },
-    {
-        "id": "ceramic-vase",
-        "name": "Sculptural Ceramic Vase",
-        "description": "Hand-crafted ceramic vase with an asymmetric organic form and matte sage finish.",
-        "category": "Decor",
-        "price": 189,
-        "modelPrompt": "A hand-crafted sculptural ceramic vase with asymmetric organic form, matte sage green",
-        "tags": ["ceramic", "sage", "organic", "handmade"],
-    },
-    {
-        "id": "console-table",
-        "name": "Marble Console Table",
-        "description": "Slim console table with white Carrara marble top and brass hairpin legs.",
-        "category": "Tables",
-        "price": 1599,
-        "modelPrompt": "A slim console table with white Carrara marble top, brass hairpin legs",
-        "tags": ["marble", "brass", "luxury", "console"],
-    },
-    {
-        "id": "bookcase",
-        "name": "Industrial Bookcase",
-        "description": "Five-shelf industrial bookcase with reclaimed pine shelves and black iron frame.",
-        "category": "Storage",
-        "price": 949,
-        "modelPrompt": "A five-shelf industrial bookcase with reclaimed pine wood shelves, black iron metal frame",
-        "tags": ["industrial", "pine", "reclaimed", "rustic"],
-    },
-]
+
+def _etag_response(request: Request, payload, *parts: str) -> Response:
+    """JSON response tagged with the catalog version, or 304 if the client has it."""
+    digest = hashlib.sha256("\x00".join((catalog_store.version, *parts)).encode()).hexdigest()[:20]
+    etag = f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(payload, headers=headers)
 
 
 @router.get("/catalog")
-async def list_catalog(category: str | None = None):
-    """Return all furniture items, optionally filtered by category."""
-    items = FURNITURE_CATALOG
-    if category:
-        items = [i for i in items if i["category"].lower() == category.lower()]
-    return {"items": items, "total": len(items)}
+async def list_catalog(
+    request: Request,
+    category: Optional[str] = None,
+    tag: List[str] = Query(default=[]),
+    q: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(CATALOG_PAGE_SIZE, ge=1, le=CATALOG_MAX_PAGE_SIZE),
+):
+    """
+    Return furniture items, optionally filtered by category, tags (all must
+    match) and a search query over name, description and tags. Pass the
+    returned `next_cursor` back as `cursor` for the next page.
+    """
+    try:
+        page = catalog_store.query(category=category, tags=tag, q=q, cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return _etag_response(request, page, str(request.query_params))
+
+
+@router.get("/catalog/facets")
+async def catalog_facets(request: Request):
+    """Return item counts per category and per tag."""
+    return _etag_response(request, {**catalog_store.facets(), "total": len(catalog_store)}, "facets")
 
 
 @router.get("/catalog/{item_id}")
-async def get_catalog_item(item_id: str):
-    """Return a single furniture item by ID."""
-    for item in FURNITURE_CATALOG:
-        if item["id"] == item_id:
-            return item
-    raise HTTPException(status_code=404, detail=f"Item '{item_id}' not found")
+async def get_catalog_item(request: Request, item_id: str):
+    """
+    Return a single furniture item by ID, with its pre-generated mesh,
+    GLB/LOD URLs and physics result under `assets` once it has been warmed
+    (`assets.current` is false while a prompt change awaits regeneration).
+    """
+    item = catalog_store.get(item_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail=f"Item '{item_id}' not found")
+    record = catalog_warmer.store.get(item_id)
+    payload = {**item, "assets": asset_summary(record, item)}
+    version = f"{record['state']}:{record['updated_at']}" if record else "none"
+    return _etag_response(request, payload, "item", item_id, version)
@@ -3,11 +3,15 @@ White Dwarf — Export Router
 POST /api/export → Convert mesh to GLB/USDZ and generate QR code
 """
 import logging
+from pathlib import Path
 from fastapi import APIRouter, HTTPException
 
-from ..config import OUTPUTS_DIR
+from ..config import OUTPUTS_DIR, EXPORT_LOD_RATIOS
 from ..services.converter import convert_mesh
-from ..models.schemas import ExportRequest, ExportResponse
+from ..services.executor import geometry_executor, ExecutorBusyError
+from ..services.static_files import schedule_precompress
+from ..services.metrics import EXPORT_FORMAT_SECONDS, record_output
+from ..models.schemas import ExportRequest, ExportResponse, LodAsset
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -18,6 +22,8 @@ async def export_model(request: ExportRequest):
     """
     Convert the mesh to GLB (Android) and USDZ (iOS),
     and return download URLs plus a shareable public URL for QR code.
+    With `lods`, also return quantized levels of detail; the QR code then
+    points at the smallest one so phones show a preview quickly.
     """
     # Resolve mesh path
     mesh_filename = request.mesh_url.split("/")[-1]
@@ -27,8 +33,34 @@ async def export_model(request: ExportRequest):
         raise HTTPException(status_code=404, detail=f"Mesh not found: {mesh_filename}")
 
     try:
-        # Convert to GLB and USDZ
-        glb_path, usdz_path = convert_mesh(str(mesh_path), str(OUTPUTS_DIR))
+        # Convert to GLB and USDZ (skipped when the outputs are up to date)
+        result = await geometry_executor.run(
+            convert_mesh, str(mesh_path), str(OUTPUTS_DIR),
+            EXPORT_LOD_RATIOS if request.lods else None,
+        )
+        glb_path, usdz_path = result["glb_path"], result["usdz_path"]
+        lods = [
+            LodAsset(
+                ratio=lod["ratio"],
+                faces=lod["faces"],
+                url=f"/outputs/{Path(lod['path']).name}",
+                bytes=Path(lod["path"]).stat().st_size,
+            )
+            for lod in result["lods"]
+        ]
+        for path in [glb_path] + [lod["path"] for lod in result["lods"]]:
+            if path:
+                schedule_precompress(Path(path))
+        # to_glb / to_usdz ran in the worker; only the steps it actually ran have timings
+        timings = result["timings"]
+        for fmt, path in (("glb", glb_path), ("usdz", usdz_path)):
+            if fmt in timings:
+                EXPORT_FORMAT_SECONDS.labels(fmt).observe(timings[fmt])
+                if path:
+                    record_output(Path(path))
+        for lod in result["lods"]:
+            if f"lod_{lod['ratio']:g}" in timings:
+                record_output(Path(lod["path"]))
 
         glb_url = f"/outputs/{glb_path.split('/')[-1].split(chr(92))[-1]}" if glb_path else None
         usdz_url = f"/outputs/{usdz_path.split('/')[-1].split(chr(92))[-1]}" if usdz_path else None
@@ -37,15 +69,23 @@ async def export_model(request: ExportRequest):
         # In production, this would be a ngrok/Vercel URL.
         # For local dev, we use the local URL.
         public_base = "http://localhost:8000"
-        public_url = f"{public_base}{glb_url}" if glb_url else None
+        preview_url = lods[-1].url if lods else glb_url
+        public_url = f"{public_base}{preview_url}" if preview_url else None
 
         return ExportResponse(
             glb_url=glb_url,
             usdz_url=usdz_url,
             public_url=public_url,
+            lods=lods,
+            cached=result["cached"],
+            timings=result["timings"],
             message="Export complete. Scan the QR code for AR preview.",
         )
 
+    except ExecutorBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except TimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -3,34 +3,37 @@ White Dwarf — Generate Router
 POST /api/generate → Generate a 3D mesh from text/image via Replicate API
 """
 import uuid
-import httpx
 import logging
 from pathlib import Path
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 
-from ..config import REPLICATE_API_TOKEN, MESH_MODEL_ID, OUTPUTS_DIR
-from ..services.replicate_client import ReplicateClient
+from ..config import OUTPUTS_DIR
+from ..services.pipeline import generate_mesh_asset
+from ..services.clients import providers
+from ..services.provider_router import MESH
+from ..services.resilience import CircuitOpenError
+from ..services.admission import ProviderBusyError
 from ..models.schemas import GenerateResponse
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-replicate = ReplicateClient(REPLICATE_API_TOKEN)
-
 
 @router.post("/generate", response_model=GenerateResponse)
 async def generate_mesh(
     prompt: str = Form(...),
     image: UploadFile = File(None),
+    no_cache: bool = Form(False),
 ):
     """
     Generate a 3D mesh (.obj) from a text prompt and optional reference image.
     Uses Hunyuan3D-2.0 (or similar) via Replicate API.
+    Repeated requests are served from the result cache unless `no_cache` is set.
     """
-    if not REPLICATE_API_TOKEN:
+    if not providers.configured(MESH):
         raise HTTPException(
             status_code=503,
-            detail="REPLICATE_API_TOKEN is not configured. Add it to backend/.env",
+            detail="No mesh provider is configured. Add REPLICATE_API_TOKEN or RunPod settings to backend/.env",
         )
 
     job_id = uuid.uuid4().hex[:8]
@@ -46,29 +49,21 @@ async def generate_mesh(
         logger.info(f"Reference image saved: {img_path.name}")
 
     try:
-        # Call Replicate for mesh generation
-        mesh_remote_url = await replicate.generate_mesh(
-            model_version=MESH_MODEL_ID,
-            prompt=prompt,
-            image_url=image_url,
-        )
-
-        # Download the generated mesh to local outputs folder
-        obj_filename = f"{job_id}_mesh.obj"
-        obj_path = OUTPUTS_DIR / obj_filename
-
-        async with httpx.AsyncClient(timeout=120) as client:
-            resp = await client.get(mesh_remote_url)
-            resp.raise_for_status()
-            obj_path.write_bytes(resp.content)
-
-        logger.info(f"Mesh saved: {obj_filename} ({len(resp.content)} bytes)")
+        result = await generate_mesh_asset(prompt, job_id, image_url=image_url, use_cache=not no_cache)
 
         return GenerateResponse(
-            mesh_url=f"/outputs/{obj_filename}",
-            message=f"Mesh generated successfully ({len(resp.content)} bytes)",
+            mesh_url=result["mesh_url"],
+            cached=result["cached"],
+            message=(
+                f"Mesh served from cache ({result['bytes']} bytes)" if result["cached"]
+                else f"Mesh generated successfully ({result['bytes']} bytes)"
+            ),
         )
 
+    except ProviderBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -0,0 +1,88 @@
+"""
+White Dwarf — Jobs Router
+POST /api/jobs/generate → Queue mesh generation, return a job id immediately
+POST /api/jobs/texture  → Queue texture generation, return a job id immediately
+GET  /api/jobs/{job_id} → Job state, stage timings and result URLs
+"""
+import uuid
+import logging
+from pathlib import Path
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+
+from ..config import OUTPUTS_DIR
+from ..services.jobs import job_manager, JobQueueFullError
+from ..services.clients import providers
+from ..services.provider_router import MESH, TEXTURE
+from ..models.schemas import TextureRequest, JobSubmitResponse, JobStatus
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+def _require_provider(kind: str):
+    if not providers.configured(kind):
+        raise HTTPException(
+            status_code=503,
+            detail=f"No {kind} provider is configured. Add REPLICATE_API_TOKEN or RunPod settings to backend/.env",
+        )
+
+
+def _submit(kind: str, params: dict, job_id: str) -> JobSubmitResponse:
+    try:
+        job = job_manager.submit(kind, params, job_id=job_id)
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+
+    return JobSubmitResponse(
+        job_id=job["id"],
+        state=job["state"],
+        status_url=f"/api/jobs/{job['id']}",
+    )
+
+
+@router.post("/jobs/generate", response_model=JobSubmitResponse, status_code=202)
+async def submit_generate(
+    prompt: str = Form(...),
+    image: UploadFile = File(None),
+    no_cache: bool = Form(False),
+):
+    """Queue mesh generation from a text prompt and optional reference image."""
+    _require_provider(MESH)
+    job_id = uuid.uuid4().hex[:12]
+
+    image_url = None
+    if image and image.filename:
+        # Persist the upload now; the job may run after this request ends
+        img_path = OUTPUTS_DIR / f"{job_id}_ref{Path(image.filename).suffix}"
+        img_path.write_bytes(await image.read())
+        image_url = f"/outputs/{img_path.name}"
+
+    params = {"prompt": prompt, "image_url": image_url, "no_cache": no_cache}
+    return _submit("generate", params, job_id)
+
+
+@router.post("/jobs/texture", response_model=JobSubmitResponse, status_code=202)
+async def submit_texture(request: TextureRequest):
+    """Queue texture generation for an existing mesh."""
+    _require_provider(TEXTURE)
+
+    mesh_filename = request.mesh_url.split("/")[-1]
+    if not (OUTPUTS_DIR / mesh_filename).exists():
+        raise HTTPException(status_code=404, detail=f"Mesh not found: {mesh_filename}")
+
+    params = {
+        "mesh_url": request.mesh_url,
+        "material_prompt": request.material_prompt,
+        "no_cache": request.no_cache,
+    }
+    return _submit("texture", params, uuid.uuid4().hex[:12])
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """Return a job's state, per-stage timings and result URLs."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+
+    return JobStatus(job_id=job["id"], **{k: v for k, v in job.items() if k not in ("id", "params")})
@@ -0,0 +1,64 @@
+"""
+White Dwarf — Metrics Router
+GET /metrics → Prometheus text exposition of pipeline, provider, cache and worker metrics
+"""
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from ..services.metrics import CONTENT_TYPE, REGISTRY, Collector
+from ..services.result_cache import mesh_results, texture_results
+from ..services.single_flight import mesh_flights, texture_flights
+from ..services.executor import geometry_executor
+from ..services.admission import admission
+from ..services.clients import replicate, runpod
+
+router = APIRouter()
+
+_RESULT_CACHES = {"mesh": mesh_results, "texture": texture_results}
+_CIRCUITS = {"replicate": replicate.resilience, "runpod": runpod.resilience}
+
+
+def _cache_lookups():
+    for name, cache in _RESULT_CACHES.items():
+        yield (name, "hit"), cache.hits
+        yield (name, "miss"), cache.misses
+        yield (name, "bypass"), cache.bypasses
+
+
+def _cache_hit_ratio():
+    for name, cache in _RESULT_CACHES.items():
+        lookups = cache.hits + cache.misses
+        yield (name,), cache.hits / lookups if lookups else 0.0
+
+
+# Read at scrape time from counters the services already keep
+Collector(
+    "whitedwarf_result_cache_lookups_total", "Result cache lookups by outcome",
+    ["cache", "result"], _cache_lookups, kind="counter",
+)
+Collector(
+    "whitedwarf_result_cache_hit_ratio", "Result cache hits / (hits + misses) since start",
+    ["cache"], _cache_hit_ratio,
+)
+Collector(
+    "whitedwarf_single_flight_inflight", "Distinct generations in flight after coalescing", ["kind"],
+    lambda: [(("mesh",), mesh_flights.stats()["in_flight"]), (("texture",), texture_flights.stats()["in_flight"])],
+)
+Collector(
+    "whitedwarf_geometry_outstanding_tasks", "Geometry tasks running or waiting for a worker", [],
+    lambda: [((), geometry_executor.stats()["outstanding"])],
+)
+Collector(
+    "whitedwarf_admission_queue_depth", "Predictions waiting for an admission slot", ["gate"],
+    lambda: [((gate.name,), gate.waiting) for gate in admission.gates()],
+)
+Collector(
+    "whitedwarf_circuit_open", "1 while the provider's circuit breaker rejects calls", ["provider"],
+    lambda: [((name,), 0 if r.breaker.state == r.breaker.CLOSED else 1) for name, r in _CIRCUITS.items()],
+)
+
+
+@router.get("/metrics")
+async def metrics():
+    """Return all metrics in the Prometheus text format."""
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -1,13 +1,19 @@
 """
 White Dwarf — Physics Router
-POST /api/physics → Analyze structural stability of a mesh
+POST /api/physics       → Analyze structural stability of a mesh
+POST /api/physics/batch → Analyze many meshes in parallel, streamed as NDJSON
 """
+import json
+import time
 import logging
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
-from ..config import OUTPUTS_DIR
-from ..services.physics_engine import analyze_stability
-from ..models.schemas import PhysicsRequest, PhysicsResult
+from ..config import OUTPUTS_DIR, PHYSICS_BATCH_MAX
+from ..services.physics_engine import analyze_stability, analyze_stability_fast
+from ..services.physics_batch import analyze_batch
+from ..services.executor import geometry_executor, ExecutorBusyError
+from ..models.schemas import PhysicsRequest, PhysicsResult, PhysicsBatchRequest
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -18,6 +24,8 @@ async def physics_check(request: PhysicsRequest):
     """
     Run structural physics analysis on a mesh file.
     Computes center of mass, base stability, and returns a verdict.
+    With mode="fast" large meshes are sampled and the metrics come with
+    confidence intervals; borderline verdicts are recomputed exactly.
     """
     # Resolve the mesh file path
     mesh_filename = request.mesh_url.split("/")[-1]
@@ -30,9 +38,16 @@ async def physics_check(request: PhysicsRequest):
         )
 
     try:
-        result = analyze_stability(str(mesh_path))
+        if request.mode == "fast":
+            result = await geometry_executor.run(analyze_stability_fast, str(mesh_path), request.samples)
+        else:
+            result = await geometry_executor.run(analyze_stability, str(mesh_path))
         return PhysicsResult(**result)
 
+    except ExecutorBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except TimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except ValueError as e:
@@ -40,3 +55,72 @@ async def physics_check(request: PhysicsRequest):
     except Exception as e:
         logger.error(f"Physics analysis failed: {e}")
         raise HTTPException(status_code=500, detail=f"Physics analysis error: {str(e)}")
+
+
+def _error_status(error: Exception) -> int:
+    """HTTP status the single-mesh endpoint would answer for this error."""
+    if isinstance(error, ExecutorBusyError):
+        return 503
+    if isinstance(error, TimeoutError):
+        return 504
+    if isinstance(error, FileNotFoundError):
+        return 404
+    if isinstance(error, ValueError):
+        return 400
+    return 500
+
+
+@router.post("/physics/batch")
+async def physics_batch(request: PhysicsBatchRequest):
+    """
+    Analyze many meshes across the geometry worker pool.
+
+    Streams one NDJSON line per mesh as soon as it finishes, in completion
+    order: {"index", "mesh_url", "result"} or {"index", "mesh_url",
+    "error", "status"}. The last line is {"summary": {...}} with counts
+    and aggregate throughput.
+    """
+    if len(request.mesh_urls) > PHYSICS_BATCH_MAX:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(request.mesh_urls)} meshes exceeds limit of {PHYSICS_BATCH_MAX}",
+        )
+
+    found, missing = [], []
+    for index, mesh_url in enumerate(request.mesh_urls):
+        mesh_path = OUTPUTS_DIR / mesh_url.split("/")[-1]
+        (found if mesh_path.exists() else missing).append((index, mesh_url, mesh_path))
+
+    async def stream():
+        start = time.perf_counter()
+        succeeded = failed = 0
+
+        for index, mesh_url, mesh_path in missing:
+            failed += 1
+            line = {"index": index, "mesh_url": mesh_url, "error": f"Mesh file not found: {mesh_path.name}", "status": 404}
+            yield json.dumps(line) + "\n"
+
+        async for position, result, error in analyze_batch([path for _, _, path in found]):
+            index, mesh_url, _ = found[position]
+            if error is None:
+                succeeded += 1
+                line = {"index": index, "mesh_url": mesh_url, "result": PhysicsResult(**result).model_dump()}
+            else:
+                failed += 1
+                logger.error(f"Batch physics failed for {mesh_url}: {error}")
+                line = {"index": index, "mesh_url": mesh_url, "error": str(error), "status": _error_status(error)}
+            yield json.dumps(line) + "\n"
+
+        elapsed = time.perf_counter() - start
+        summary = {
+            "count": len(request.mesh_urls),
+            "succeeded": succeeded,
+            "failed": failed,
+            "elapsed_s": round(elapsed, 4),
+            "meshes_per_s": round(succeeded / elapsed, 3) if elapsed > 0 else None,
+            "workers": geometry_executor.workers,
+        }
+        logger.info(f"Batch physics: {succeeded}/{len(request.mesh_urls)} meshes in {elapsed:.2f}s")
+        yield json.dumps({"summary": summary}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
@@ -0,0 +1,21 @@
+"""
+White Dwarf — Providers Router
+GET /api/providers/stats → Rolling latency, routing counters and circuit state per provider
+"""
+from fastapi import APIRouter
+
+from ..services.clients import providers, replicate, runpod
+
+router = APIRouter()
+
+
+@router.get("/providers/stats")
+async def provider_stats():
+    """Return latency estimates, hedging counters, retries and circuit breaker state."""
+    return {
+        **providers.stats(),
+        "circuits": {
+            "replicate": replicate.resilience.stats(),
+            "runpod": runpod.resilience.stats(),
+        },
+    }
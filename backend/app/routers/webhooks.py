@@ -0,0 +1,44 @@
+"""
+White Dwarf — Webhooks Router
+POST /api/webhooks/{provider} → Provider completion callbacks
+"""
+import hmac
+import logging
+from fastapi import APIRouter, HTTPException, Request
+
+from ..config import WEBHOOK_SECRET
+from ..services.completion import completions
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Terminal statuses per provider; anything else is ignored
+_TERMINAL = {
+    "replicate": {"succeeded", "failed", "canceled"},
+    "runpod": {"COMPLETED", "FAILED", "CANCELLED", "TIMED_OUT"},
+}
+
+
+@router.post("/webhooks/{provider}")
+async def provider_webhook(provider: str, request: Request, token: str = ""):
+    """
+    Receive a completion callback from Replicate or RunPod and wake the
+    coroutine waiting on that prediction.
+    """
+    if provider not in _TERMINAL:
+        raise HTTPException(status_code=404, detail=f"Unknown provider: {provider}")
+
+    # Without a secret webhooks are disabled, so no callback is trusted
+    if not WEBHOOK_SECRET or not hmac.compare_digest(token, WEBHOOK_SECRET):
+        raise HTTPException(status_code=403, detail="Invalid webhook token")
+
+    payload = await request.json()
+    prediction_id = payload.get("id")
+    status = payload.get("status")
+
+    if not prediction_id or status not in _TERMINAL[provider]:
+        return {"accepted": False}
+
+    woke = completions.resolve(f"{provider}:{prediction_id}", payload)
+    logger.info(f"Webhook {provider}:{prediction_id} → {status} (waiter={'yes' if woke else 'no'})")
+    return {"accepted": True}
@@ -0,0 +1,206 @@
+"""
+White Dwarf — Admission Control
+Per provider-model concurrency caps and token-bucket rate limits in front of
+prediction creates, with a bounded wait queue. When the queue is full the
+caller is turned away with a Retry-After estimated from current throughput
+instead of piling more predictions onto the provider account.
+"""
+import math
+import time
+import asyncio
+import logging
+import statistics
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from ..config import (
+    PROVIDER_MAX_CONCURRENCY, PROVIDER_RATE_LIMIT, PROVIDER_RATE_BURST, PROVIDER_MAX_WAITING,
+)
+
+logger = logging.getLogger(__name__)
+
+# Completions / waits the throughput and wait-time figures are taken over
+_WINDOW = 100
+# Bounds on the Retry-After handed to rejected callers, in seconds
+_MIN_RETRY_AFTER = 1
+_MAX_RETRY_AFTER = 300
+
+
+class ProviderBusyError(RuntimeError):
+    """Raised when a provider model's admission queue is full; callers should retry later."""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Reservation-based token bucket: `rate` tokens per second, up to `burst`.
+
+    `reserve()` takes a token immediately and returns how long the caller
+    must wait for it to be covered, so concurrent callers are spaced out in
+    arrival order without a background refill task.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    def available(self) -> float:
+        """Tokens available now, without taking one."""
+        return min(self.burst, self.tokens + (time.monotonic() - self.updated) * self.rate)
+
+    def reserve(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class AdmissionGate:
+    """
+    Admission for one provider model.
+
+    At most `concurrency` predictions hold a slot at once (0 = unlimited)
+    and new slots are granted at no more than `rate` per second (0 =
+    unlimited). Up to `max_waiting` callers may wait for a slot; beyond
+    that `slot()` raises ProviderBusyError straight away.
+    """
+
+    def __init__(self, name: str, concurrency: int, rate: float, burst: int, max_waiting: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_waiting = max_waiting
+        self._semaphore = asyncio.Semaphore(concurrency) if concurrency > 0 else None
+        self._bucket = TokenBucket(rate, burst) if rate > 0 else None
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._waits: Deque[float] = deque(maxlen=_WINDOW)
+        self._finished: Deque[float] = deque(maxlen=_WINDOW)
+
+    def has_room(self) -> bool:
+        """Whether a new caller would be admitted or queued rather than rejected."""
+        return self.waiting < self.max_waiting or self._free()
+
+    def _free(self) -> bool:
+        """A slot and a token are available right now (nobody is ahead)."""
+        if self.waiting:
+            return False
+        if self._semaphore is not None and self._semaphore.locked():
+            return False
+        return self._bucket is None or self._bucket.available() >= 1
+
+    def throughput(self) -> Optional[float]:
+        """Predictions finished per second over the recent window, if measured."""
+        if len(self._finished) < 2:
+            return None
+        span = time.monotonic() - self._finished[0]
+        return (len(self._finished) - 1) / span if span > 0 else None
+
+    def retry_after(self) -> int:
+        """Seconds until a caller joining the back of the queue would likely get a slot."""
+        ahead = self.waiting + 1
+        rates = [r for r in (self.throughput(), self._bucket.rate if self._bucket else None) if r]
+        # Whichever of measured throughput and the rate limit is slower governs
+        seconds = ahead / min(rates) if rates else _MIN_RETRY_AFTER
+        return int(min(_MAX_RETRY_AFTER, max(_MIN_RETRY_AFTER, math.ceil(seconds))))
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one admission slot for the duration of a prediction."""
+        if not self._free() and self.waiting >= self.max_waiting:
+            self.rejected += 1
+            retry_after = self.retry_after()
+            logger.warning(f"[{self.name}] Admission queue full ({self.waiting} waiting), retry in {retry_after}s")
+            raise ProviderBusyError(
+                f"{self.name} is at capacity ({self.waiting} requests waiting)", retry_after=retry_after
+            )
+
+        queued_at = time.monotonic()
+        self.waiting += 1
+        acquired = False
+        try:
+            if self._semaphore is not None:
+                await self._semaphore.acquire()
+                acquired = True
+            if self._bucket is not None:
+                delay = self._bucket.reserve()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+        except BaseException:
+            if acquired:
+                self._semaphore.release()
+            raise
+        finally:
+            self.waiting -= 1
+
+        self._waits.append(time.monotonic() - queued_at)
+        self.admitted += 1
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._finished.append(time.monotonic())
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        waits = sorted(self._waits)
+
+        def pct(q: float) -> Optional[float]:
+            return round(waits[min(len(waits) - 1, int(q * len(waits)))], 3) if waits else None
+
+        throughput = self.throughput()
+        return {
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "max_concurrency": self.concurrency or None,
+            "max_waiting": self.max_waiting,
+            "rate_limit_per_s": self._bucket.rate if self._bucket else None,
+            "wait_p50_s": pct(0.5),
+            "wait_p95_s": pct(0.95),
+            "wait_mean_s": round(statistics.fmean(waits), 3) if waits else None,
+            "throughput_per_s": round(throughput, 4) if throughput else None,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+class Admission:
+    """AdmissionGate per (provider, model), limits looked up by provider name."""
+
+    def __init__(self, concurrency: Dict[str, int], rates: Dict[str, float], burst: int, max_waiting: int):
+        self.concurrency = concurrency
+        self.rates = rates
+        self.burst = burst
+        self.max_waiting = max_waiting
+        self._gates: Dict[Tuple[str, str], AdmissionGate] = {}
+
+    def gate(self, provider: str, model: str) -> AdmissionGate:
+        key = (provider, model)
+        if key not in self._gates:
+            self._gates[key] = AdmissionGate(
+                f"{provider}:{model}",
+                concurrency=self.concurrency.get(provider, 0),
+                rate=self.rates.get(provider, 0.0),
+                burst=self.burst,
+                max_waiting=self.max_waiting,
+            )
+        return self._gates[key]
+
+    def gates(self) -> List[AdmissionGate]:
+        return list(self._gates.values())
+
+    def stats(self) -> Dict[str, Any]:
+        return {gate.name: gate.stats() for gate in self.gates()}
+
+
+admission = Admission(PROVIDER_MAX_CONCURRENCY, PROVIDER_RATE_LIMIT, PROVIDER_RATE_BURST, PROVIDER_MAX_WAITING)
@@ -0,0 +1,230 @@
+"""
+White Dwarf — Catalog Store
+In-memory furniture catalog loaded from JSON or SQLite, with id, category,
+tag and full-text token indexes for constant-time lookups and cheap
+filtered, cursor-paginated queries.
+"""
+import re
+import json
+import base64
+import sqlite3
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_EMPTY = np.empty(0, dtype=np.int32)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens used for both indexing and queries."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def encode_cursor(position: int) -> str:
+    return base64.urlsafe_b64encode(str(position).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Position after which the next page starts. Raises ValueError if malformed."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    position = int(base64.urlsafe_b64decode(padded.encode()).decode())
+    if position < 0:
+        raise ValueError(f"Cursor position out of range: {position}")
+    return position
+
+
+def _load_json(path: Path) -> List[Dict[str, Any]]:
+    data = json.loads(path.read_text())
+    return data["items"] if isinstance(data, dict) else data
+
+
+def _load_sqlite(path: Path) -> List[Dict[str, Any]]:
+    """Rows of an `items` table; `tags` is a JSON array, `model_prompt` → `modelPrompt`."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute("SELECT * FROM items ORDER BY rowid").fetchall()
+    finally:
+        conn.close()
+
+    items = []
+    for row in rows:
+        item = dict(row)
+        item["tags"] = json.loads(item.get("tags") or "[]")
+        if "model_prompt" in item:
+            item["modelPrompt"] = item.pop("model_prompt")
+        items.append(item)
+    return items
+
+
+class _Snapshot:
+    """One loaded catalog version and its indexes (plus a lazily filled bitmap cache)."""
+
+    BITMAP_CACHE_MAX = 256
+
+    def __init__(self, items: List[Dict[str, Any]], version: str):
+        self.items = items
+        self.version = version
+        self.by_id: Dict[str, int] = {}
+        self.bitmaps: Dict[Tuple[str, str], np.ndarray] = {}
+        postings: Dict[Tuple[str, str], List[int]] = {}
+        categories: Dict[str, int] = {}
+        tags: Dict[str, int] = {}
+
+        for position, item in enumerate(items):
+            if item["id"] in self.by_id:
+                raise ValueError(f"Duplicate catalog id: {item['id']}")
+            self.by_id[item["id"]] = position
+
+            category = item.get("category", "")
+            postings.setdefault(("category", category.lower()), []).append(position)
+            categories[category] = categories.get(category, 0) + 1
+
+            item_tags = item.get("tags") or []
+            for tag in dict.fromkeys(t.lower() for t in item_tags):
+                postings.setdefault(("tag", tag), []).append(position)
+                tags[tag] = tags.get(tag, 0) + 1
+
+            text = " ".join([item.get("name", ""), item.get("description", ""), *item_tags])
+            for token in dict.fromkeys(tokenize(text)):
+                postings.setdefault(("token", token), []).append(position)
+
+        # Ascending positions per key
+        self.postings: Dict[Tuple[str, str], np.ndarray] = {
+            key: np.asarray(positions, dtype=np.int32) for key, positions in postings.items()
+        }
+        self.facets = {
+            "category": dict(sorted(categories.items(), key=lambda kv: (-kv[1], kv[0]))),
+            "tags": dict(sorted(tags.items(), key=lambda kv: (-kv[1], kv[0]))),
+        }
+
+    def posting(self, key: Tuple[str, str]) -> np.ndarray:
+        return self.postings.get(key, _EMPTY)
+
+    def bitmap(self, key: Tuple[str, str]) -> np.ndarray:
+        """Dense membership mask for a key, built on first use."""
+        mask = self.bitmaps.get(key)
+        if mask is None:
+            if len(self.bitmaps) >= self.BITMAP_CACHE_MAX:
+                self.bitmaps.clear()
+            mask = np.zeros(len(self.items), dtype=bool)
+            mask[self.posting(key)] = True
+            self.bitmaps[key] = mask
+        return mask
+
+
+class CatalogStore:
+    """
+    Catalog snapshot plus its indexes, swapped atomically on reload.
+
+    Items keep their source order; every index maps a key to the ascending
+    array of item positions carrying it. A filtered query starts from the
+    rarest key's array and masks it with cached bitmaps of the others, so
+    its cost scales with the rarest key, not the catalog. Cursors are
+    opaque encodings of the last position returned.
+    """
+
+    def __init__(self):
+        self.source: Optional[Path] = None
+        self._snap = _Snapshot([], "")
+
+    def __len__(self) -> int:
+        return len(self._snap.items)
+
+    @property
+    def version(self) -> str:
+        return self._snap.version
+
+    def load(self, path: Path):
+        """Load (or reload) the catalog from a .json or .sqlite/.db file."""
+        path = Path(path)
+        if path.suffix.lower() in (".sqlite", ".sqlite3", ".db"):
+            items = _load_sqlite(path)
+        else:
+            items = _load_json(path)
+        self.load_items(items, version=hashlib.sha256(path.read_bytes()).hexdigest()[:16])
+        self.source = path
+        logger.info(f"Catalog loaded: {len(items)} items from {path.name}")
+
+    def load_items(self, items: List[Dict[str, Any]], version: Optional[str] = None):
+        """Build indexes over `items` and swap them in."""
+        if version is None:
+            blob = json.dumps(items, sort_keys=True, separators=(",", ":")).encode()
+            version = hashlib.sha256(blob).hexdigest()[:16]
+        self._snap = _Snapshot(list(items), version)
+
+    def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        snap = self._snap
+        position = snap.by_id.get(item_id)
+        return snap.items[position] if position is not None else None
+
+    def ids(self) -> List[str]:
+        """All item ids in catalog order."""
+        return [item["id"] for item in self._snap.items]
+
+    def facets(self) -> Dict[str, Dict[str, int]]:
+        """Item counts per category and per tag, most common first."""
+        return self._snap.facets
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        q: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Dict[str, Any]:
+        """
+        Filter by category, all of `tags` and all tokens of `q`, then page.
+
+        Raises:
+            ValueError: if `cursor` is malformed or points past the catalog.
+
+        Returns:
+            dict with items, total and next_cursor (None on the last page).
+        """
+        snap = self._snap
+        after = decode_cursor(cursor) if cursor else -1
+        if after >= len(snap.items):
+            raise ValueError(f"Cursor position out of range: {after}")
+
+        keys = []
+        if category:
+            keys.append(("category", category.lower()))
+        keys.extend(("tag", tag.lower()) for tag in tags or [])
+        keys.extend(("token", token) for token in tokenize(q or ""))
+        keys = list(dict.fromkeys(keys))
+
+        if not keys:
+            start = after + 1
+            page = range(start, min(start + limit, len(snap.items)))
+            total = len(snap.items)
+            more = start + limit < len(snap.items)
+        else:
+            # Drive from the rarest key, masking the candidates by the others
+            keys.sort(key=lambda key: len(snap.posting(key)))
+            matches = snap.posting(keys[0])
+            for key in keys[1:]:
+                if not len(matches):
+                    break
+                matches = matches[snap.bitmap(key)[matches]]
+
+            start = int(np.searchsorted(matches, after, side="right"))
+            page = matches[start:start + limit].tolist()
+            total = len(matches)
+            more = start + limit < total
+
+        return {
+            "items": [snap.items[p] for p in page],
+            "total": total,
+            "next_cursor": encode_cursor(page[-1]) if more and page else None,
+        }
+
+
+catalog_store = CatalogStore()
@@ -0,0 +1,251 @@
+"""
+White Dwarf — Catalog Warming
+Batch pre-generation of catalog meshes (generate → physics → export) so
+the first visitor to an item gets ready-made assets instead of waiting
+on the provider. Progress is persisted per item, so runs are resumable
+and re-runs only redo items whose prompt or model changed.
+"""
+import json
+import time
+import uuid
+import asyncio
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from ..config import (
+    OUTPUTS_DIR, MESH_MODEL_ID, EXPORT_LOD_RATIOS,
+    CATALOG_ASSETS_DB_PATH, CATALOG_WARM_CONCURRENCY,
+)
+from .executor import geometry_executor
+from .physics_engine import analyze_stability
+from .converter import convert_mesh
+from .pipeline import generate_mesh_asset, mesh_cache_key
+from .result_cache import register_file_users
+
+logger = logging.getLogger(__name__)
+
+# Per-item warm states
+PENDING = "pending"
+READY = "ready"
+FAILED = "failed"
+
+
+class CatalogAssetStore:
+    """SQLite record of the pre-generated assets of each catalog item."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS catalog_assets (
+                    item_id TEXT PRIMARY KEY,
+                    content_key TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    assets TEXT,
+                    error TEXT,
+                    updated_at REAL NOT NULL
+                )
+                """
+            )
+
+    def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM catalog_assets WHERE item_id = ?", (item_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        record["assets"] = json.loads(record["assets"]) if record["assets"] else None
+        return record
+
+    def referenced(self, names: Set[str]) -> Set[str]:
+        """Output file names that some catalog item's assets link to."""
+        used = set()
+        with self._lock:
+            for name in names:
+                if self._conn.execute(
+                    "SELECT 1 FROM catalog_assets WHERE instr(assets, ?) > 0 LIMIT 1",
+                    (f'/outputs/{name}"',),
+                ).fetchone():
+                    used.add(name)
+        return used
+
+    def save(self, item_id: str, content_key: str, state: str,
+             assets: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        """Upsert an item's record; a failed attempt keeps earlier assets."""
+        previous = self.get(item_id)
+        if assets is None and previous is not None:
+            assets = previous["assets"]
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO catalog_assets VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (item_id, content_key, MESH_MODEL_ID, state,
+                 json.dumps(assets) if assets else None, error, time.time()),
+            )
+
+
+def item_content_key(item: Dict[str, Any]) -> str:
+    """Key of an item's generation inputs: normalized prompt and mesh model."""
+    return mesh_cache_key(item["modelPrompt"])
+
+
+def assets_present(assets: Optional[Dict[str, Any]]) -> bool:
+    """
+    True when every file an asset record points at is still on disk.
+
+    Catalog meshes go through the mesh result cache, whose age and size
+    eviction deletes their files without touching this store.
+    """
+    if not assets:
+        return False
+    urls = [assets.get("mesh_url"), assets.get("glb_url"), assets.get("usdz_url")]
+    urls += [lod["url"] for lod in assets.get("lods") or []]
+    return all((OUTPUTS_DIR / url.split("/")[-1]).exists() for url in urls if url)
+
+
+def asset_summary(record: Optional[Dict[str, Any]], item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Assets to attach to a catalog item response, flagged if out of date."""
+    if record is None or not assets_present(record["assets"]):
+        return None
+    return {
+        **record["assets"],
+        "current": record["state"] == READY and record["content_key"] == item_content_key(item),
+        "updated_at": record["updated_at"],
+    }
+
+
+async def warm_item(item: Dict[str, Any], content_key: str, use_cache: bool = True) -> Dict[str, Any]:
+    """Generate, analyze and export one catalog item's mesh."""
+    # Output names are unique per generation (content key plus a nonce), so
+    # a regenerated asset, even for an unchanged prompt on a forced run,
+    # never overwrites files browsers cached as immutable
+    job_id = f"catalog-{item['id']}-{content_key[:10]}-{uuid.uuid4().hex[:6]}"
+    generated = await generate_mesh_asset(item["modelPrompt"], job_id, use_cache=use_cache)
+    mesh_path = OUTPUTS_DIR / generated["mesh_url"].split("/")[-1]
+
+    physics = await geometry_executor.run(analyze_stability, str(mesh_path))
+    exported = await geometry_executor.run(
+        convert_mesh, str(mesh_path), str(OUTPUTS_DIR), EXPORT_LOD_RATIOS,
+    )
+
+    def url(path: Optional[str]) -> Optional[str]:
+        return f"/outputs/{Path(path).name}" if path else None
+
+    return {
+        "mesh_url": generated["mesh_url"],
+        "glb_url": url(exported["glb_path"]),
+        "usdz_url": url(exported["usdz_path"]),
+        "lods": [
+            {"ratio": lod["ratio"], "faces": lod["faces"], "url": url(lod["path"])}
+            for lod in exported["lods"]
+        ],
+        "physics": physics,
+    }
+
+
+class CatalogWarmer:
+    """
+    Runs one warm pass at a time over the catalog.
+
+    Items whose recorded content key matches, that are ready and whose
+    files are all still on disk are skipped unless `force` is set, so an interrupted run resumes where it
+    stopped and a re-run after prompt edits only regenerates those items.
+    At most `concurrency` items talk to the provider at once.
+    """
+
+    def __init__(self, store_path: Path, concurrency: int):
+        self.store_path = store_path
+        self.concurrency = max(1, concurrency)
+        self._store: Optional[CatalogAssetStore] = None
+        self._task: Optional[asyncio.Task] = None
+        self._status: Dict[str, Any] = {"running": False}
+
+    @property
+    def store(self) -> CatalogAssetStore:
+        if self._store is None:
+            self._store = CatalogAssetStore(self.store_path)
+        return self._store
+
+    def status(self) -> Dict[str, Any]:
+        return dict(self._status)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, items: List[Dict[str, Any]], force: bool = False) -> Dict[str, Any]:
+        """Launch a background pass; raises RuntimeError if one is running."""
+        if self.running:
+            raise RuntimeError("A catalog warm run is already in progress")
+        todo = self._plan(items, force)
+        self._task = asyncio.create_task(self._execute(todo, force))
+        return self.status()
+
+    async def run(self, items: List[Dict[str, Any]], force: bool = False) -> Dict[str, Any]:
+        """Warm every stale item and return the final status counts."""
+        return await self._execute(self._plan(items, force), force)
+
+    def _plan(self, items: List[Dict[str, Any]], force: bool) -> List[tuple]:
+        todo = []
+        skipped = 0
+        for item in items:
+            key = item_content_key(item)
+            record = self.store.get(item["id"])
+            if (not force and record and record["state"] == READY
+                    and record["content_key"] == key and assets_present(record["assets"])):
+                skipped += 1
+            else:
+                todo.append((item, key))
+
+        self._status = {
+            "running": True, "started_at": time.time(), "finished_at": None,
+            "total": len(items), "skipped": skipped, "pending": len(todo),
+            "ready": 0, "failed": 0, "errors": {},
+        }
+        logger.info(f"Catalog warm: {len(todo)} to generate, {skipped} up to date")
+        return todo
+
+    async def _execute(self, todo: List[tuple], force: bool) -> Dict[str, Any]:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def warm(item: Dict[str, Any], key: str):
+            async with semaphore:
+                self.store.save(item["id"], key, PENDING)
+                try:
+                    # Forced runs bypass the mesh result cache too
+                    assets = await warm_item(item, key, use_cache=not force)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Catalog warm failed for {item['id']}: {e}")
+                    self.store.save(item["id"], key, FAILED, error=str(e))
+                    self._status["failed"] += 1
+                    self._status["errors"][item["id"]] = str(e)
+                else:
+                    self.store.save(item["id"], key, READY, assets=assets)
+                    self._status["ready"] += 1
+                    logger.info(f"Catalog item warmed: {item['id']}")
+                finally:
+                    self._status["pending"] -= 1
+
+        try:
+            await asyncio.gather(*(warm(item, key) for item, key in todo))
+        finally:
+            self._status["running"] = False
+            self._status["finished_at"] = time.time()
+        return self.status()
+
+
+catalog_warmer = CatalogWarmer(CATALOG_ASSETS_DB_PATH, CATALOG_WARM_CONCURRENCY)
+# Result cache eviction keeps files catalog items are served from
+register_file_users(lambda names: catalog_warmer.store.referenced(names))
@@ -0,0 +1,52 @@
+"""
+White Dwarf — Shared Provider Clients
+Process-wide provider and download clients, started and stopped by the
+FastAPI lifespan so every router reuses the same connection pools.
+"""
+from ..config import (
+    REPLICATE_API_TOKEN, RUNPOD_API_KEY, MESH_MODEL_ID, TEXTURE_MODEL_ID,
+    RUNPOD_MESH_ENDPOINT, RUNPOD_TEXTURE_ENDPOINT,
+    PROVIDER_LATENCY_WINDOW, PROVIDER_HEDGE_AFTER, PROVIDER_FAILURE_PENALTY,
+)
+from .replicate_client import ReplicateClient
+from .runpod_client import RunPodClient
+from .http_pool import ManagedClient
+from .provider_router import Provider, ProviderRouter, MESH, TEXTURE
+from .admission import admission
+
+replicate = ReplicateClient(REPLICATE_API_TOKEN)
+runpod = RunPodClient(RUNPOD_API_KEY)
+
+# Mesh/texture predictions go through the router, which picks between the
+# providers above; RunPod joins only when its key and endpoints are set,
+# and a provider whose circuit is open is skipped until it may be probed
+providers = ProviderRouter(
+    [
+        Provider("replicate", replicate, {MESH: MESH_MODEL_ID, TEXTURE: TEXTURE_MODEL_ID},
+                 configured=lambda: bool(replicate.api_token),
+                 enabled=lambda: replicate.resilience.breaker.allows()),
+        Provider("runpod", runpod, {MESH: RUNPOD_MESH_ENDPOINT, TEXTURE: RUNPOD_TEXTURE_ENDPOINT},
+                 configured=lambda: bool(runpod.api_key),
+                 enabled=lambda: runpod.resilience.breaker.allows()),
+    ],
+    window=PROVIDER_LATENCY_WINDOW,
+    hedge_after=PROVIDER_HEDGE_AFTER,
+    failure_penalty=PROVIDER_FAILURE_PENALTY,
+    admission=admission,
+)
+
+# Provider CDNs (replicate.delivery etc.) for mesh and texture downloads
+downloads = ManagedClient("downloads")
+
+
+def start_clients():
+    replicate.start()
+    downloads.start()
+    if RUNPOD_API_KEY:
+        runpod.start()
+
+
+async def close_clients():
+    await replicate.aclose()
+    await runpod.aclose()
+    await downloads.aclose()
@@ -0,0 +1,156 @@
+"""
+White Dwarf — Prediction Completion
+In-process registry that lets provider webhooks wake the coroutine waiting
+on a prediction, plus an adaptive poll schedule for when webhooks are not
+reachable (local dev, multiple workers, lost callbacks).
+"""
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Any, Set
+
+from ..config import (
+    WEBHOOK_BASE_URL, WEBHOOK_SECRET,
+    POLL_MIN_INTERVAL, POLL_MAX_INTERVAL, POLL_WEBHOOK_INTERVAL,
+)
+
+logger = logging.getLogger(__name__)
+
+if WEBHOOK_BASE_URL and not WEBHOOK_SECRET:
+    logger.warning("WEBHOOK_BASE_URL is set without WEBHOOK_SECRET; webhooks stay off and predictions are polled")
+
+
+def webhook_url(provider: str) -> Optional[str]:
+    """
+    Public callback URL for a provider, or None when webhooks are off.
+
+    Webhooks need both a base URL and a secret: an unauthenticated callback
+    could inject any output URL into the pipeline.
+    """
+    if not WEBHOOK_BASE_URL or not WEBHOOK_SECRET:
+        return None
+    return f"{WEBHOOK_BASE_URL.rstrip('/')}/api/webhooks/{provider}?token={WEBHOOK_SECRET}"
+
+
+class CompletionRegistry:
+    """
+    Maps provider prediction ids to futures resolved by webhook callbacks.
+
+    Callbacks that arrive before the waiter registers (the provider can
+    finish before our create call returns) are parked briefly so the
+    waiter still picks them up.
+    """
+
+    EARLY_TTL = 600
+    EARLY_MAX = 1024
+
+    def __init__(self):
+        self._waiters: Dict[str, asyncio.Future] = {}
+        self._early: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def register(self, key: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        early = self._early.pop(key, None)
+        if early is not None:
+            future.set_result(early[1])
+        else:
+            self._waiters[key] = future
+        return future
+
+    def discard(self, key: str):
+        future = self._waiters.pop(key, None)
+        if future is not None and not future.done():
+            future.cancel()
+
+    def resolve(self, key: str, payload: Dict[str, Any]) -> bool:
+        """Deliver a terminal payload. Returns True if a waiter was woken."""
+        future = self._waiters.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(payload)
+            return True
+
+        now = time.monotonic()
+        self._early[key] = (now, payload)
+        while self._early and (
+            len(self._early) > self.EARLY_MAX
+            or now - next(iter(self._early.values()))[0] > self.EARLY_TTL
+        ):
+            self._early.popitem(last=False)
+        return False
+
+
+completions = CompletionRegistry()
+
+# Learned run time per model, used to time the first poll after start
+_run_time_ewma: Dict[str, float] = {}
+
+
+def record_run_time(model: str, seconds: Optional[float]):
+    if not seconds or seconds <= 0:
+        return
+    previous = _run_time_ewma.get(model)
+    _run_time_ewma[model] = seconds if previous is None else 0.7 * previous + 0.3 * seconds
+
+
+class PollSchedule:
+    """
+    Adaptive poll intervals driven by provider status hints.
+
+    Intervals start at POLL_MIN_INTERVAL and grow geometrically to
+    POLL_MAX_INTERVAL, resetting whenever the status changes. While a
+    prediction is running on a model with a known typical run time, the
+    next poll is aimed at its expected completion. With webhooks enabled
+    polling is only a slow safety net.
+    """
+
+    def __init__(self, model: str, webhook: bool):
+        self.model = model
+        self.webhook = webhook
+        self.interval = POLL_MIN_INTERVAL
+        self.status: Optional[str] = None
+        self.status_since = time.monotonic()
+
+    def next_interval(self, status: Optional[str], running: bool) -> float:
+        now = time.monotonic()
+        if status != self.status:
+            self.status = status
+            self.status_since = now
+            self.interval = POLL_MIN_INTERVAL
+        else:
+            # Queued/booting predictions back off faster than running ones
+            factor = 1.5 if running else 2.0
+            self.interval = min(self.interval * factor, POLL_MAX_INTERVAL)
+
+        interval = self.interval
+        expected = _run_time_ewma.get(self.model)
+        if running and expected:
+            remaining = expected - (now - self.status_since)
+            if remaining > interval:
+                interval = min(remaining, POLL_MAX_INTERVAL)
+
+        if self.webhook:
+            interval = max(interval, POLL_WEBHOOK_INTERVAL)
+        return interval
+
+
+async def wait_or_sleep(future: Optional[asyncio.Future], seconds: float) -> Optional[Dict[str, Any]]:
+    """Sleep up to `seconds`, returning early with the webhook payload if it lands."""
+    if future is None:
+        await asyncio.sleep(seconds)
+        return None
+    done, _ = await asyncio.wait({future}, timeout=seconds)
+    return future.result() if done and not future.cancelled() else None
+
+
+# Called once when a prediction leaves the provider queue and starts running
+StartCallback = Callable[[], None]
+
+_detached: Set[asyncio.Task] = set()
+
+
+def detach(coro: Awaitable):
+    """Run a best-effort coroutine (e.g. a cancel call) without awaiting it."""
+    task = asyncio.ensure_future(coro)
+    _detached.add(task)
+    task.add_done_callback(_detached.discard)
@@ -1,14 +1,26 @@
 """
 White Dwarf — Mesh Converter
-Converts .obj meshes to .glb and .usdz formats.
+Converts .obj meshes to .glb and .usdz formats, plus quantized
+level-of-detail GLBs for AR preview.
 """
-import trimesh
+import os
+import json
+import time
 import logging
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import trimesh
+
+from .mesh_cache import mesh_cache
+from .result_cache import sha256_file
+from .lod import write_lod
 
 logger = logging.getLogger(__name__)
 
+# Bump when export output changes so stale manifests reconvert
+EXPORT_MANIFEST_VERSION = 2
+
 
 def to_glb(input_path: str, output_path: Optional[str] = None) -> str:
     """
@@ -30,12 +42,8 @@ def to_glb(input_path: str, output_path: Optional[str] = None) -> str:
 
     logger.info(f"Converting {src.name} → GLB")
 
-    # Load the mesh
-    scene = trimesh.load(str(src))
-
-    if isinstance(scene, trimesh.Trimesh):
-        # Wrap single mesh in a scene for proper GLB export
-        scene = trimesh.Scene(geometry={'mesh': scene})
+    # Load the mesh (shared cache; single meshes come wrapped in a scene)
+    scene = mesh_cache.get_scene(str(src))
 
     # Export as GLB
     glb_data = scene.export(file_type='glb')
@@ -63,10 +71,7 @@ def to_usdz(input_path: str, output_path: Optional[str] = None) -> Optional[str]
 
     try:
         # Try using trimesh's built-in USDZ support (requires usd-core)
-        scene = trimesh.load(str(src))
-
-        if isinstance(scene, trimesh.Trimesh):
-            scene = trimesh.Scene(geometry={'mesh': scene})
+        scene = mesh_cache.get_scene(str(src))
 
         # Trimesh may support USDZ via pxr (USD Python bindings)
         usdz_data = scene.export(file_type='usdz')
@@ -82,19 +87,138 @@ def to_usdz(input_path: str, output_path: Optional[str] = None) -> Optional[str]
         return None
 
 
-def convert_mesh(input_path: str, output_dir: str) -> Tuple[str, Optional[str]]:
+def _source_signature(src: Path) -> Tuple[int, int]:
+    st = src.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_manifest(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        manifest = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("version") == EXPORT_MANIFEST_VERSION else None
+
+
+def _export_format(scene: trimesh.Scene, file_type: str, out: Path) -> Tuple[Optional[str], float]:
+    """Export one format; returns (path or None, seconds)."""
+    start = time.perf_counter()
+    try:
+        data = scene.export(file_type=file_type)
+    except Exception as e:
+        if file_type != "usdz":
+            raise
+        logger.warning(f"USDZ conversion not available: {e}")
+        logger.info("To enable USDZ export, install: pip install usd-core")
+        return None, round(time.perf_counter() - start, 4)
+
+    tmp = out.with_name(out.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, out)
+    logger.info(f"{file_type.upper()} saved: {out} ({len(data)} bytes)")
+    return str(out), round(time.perf_counter() - start, 4)
+
+
+def _lod_filename(stem: str, ratio: float) -> str:
+    # The exact ratio, so close ratios never share a file: 0.25 → "_lod0p25"
+    label = f"{ratio:g}".replace(".", "p")
+    return f"{stem}_lod{label}.glb"
+
+
+def convert_mesh(
+    input_path: str,
+    output_dir: str,
+    lod_ratios: Optional[Sequence[float]] = None,
+) -> Dict[str, Any]:
     """
-    Convert a mesh to both GLB and USDZ.
+    Convert a mesh to both GLB and USDZ, plus optional AR levels of detail.
+
+    The source is loaded once and exported to each format in turn.
+    A `{stem}.export.json` manifest records the source hash; outputs it
+    lists are reused while the hash still matches and the files exist.
+
+    Args:
+        input_path: Path to the source mesh file.
+        output_dir: Directory for the exported files.
+        lod_ratios: Face ratios (e.g. 0.25, 0.05) for quantized LOD GLBs. Ratios
+            of 1 or more are skipped: the full-detail level is the GLB itself.
 
     Returns:
-        Tuple of (glb_path, usdz_path_or_None)
+        dict with glb_path, usdz_path (None if unavailable), lods (list of
+        {ratio, path, faces}), cached and per-step timings in seconds.
     """
+    src = Path(input_path)
+    if not src.exists():
+        raise FileNotFoundError(f"Input mesh not found: {input_path}")
+
     out_dir = Path(output_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
-
-    stem = Path(input_path).stem
-
-    glb_path = to_glb(input_path, str(out_dir / f"{stem}.glb"))
-    usdz_path = to_usdz(input_path, str(out_dir / f"{stem}.usdz"))
-
-    return glb_path, usdz_path
+    stem = src.stem
+    glb_out = out_dir / f"{stem}.glb"
+    usdz_out = out_dir / f"{stem}.usdz"
+    manifest_path = out_dir / f"{stem}.export.json"
+    timings: Dict[str, float] = {}
+
+    # Re-hash only when the file signature changed since the last export
+    start = time.perf_counter()
+    signature = list(_source_signature(src))
+    manifest = _read_manifest(manifest_path)
+    if manifest is not None and manifest["source_signature"] == signature:
+        source_sha256 = manifest["source_sha256"]
+    else:
+        source_sha256 = sha256_file(src)
+    timings["hash"] = round(time.perf_counter() - start, 4)
+
+    if manifest is None or manifest["source_sha256"] != source_sha256:
+        manifest = {"glb": None, "usdz": None, "lods": {}, "converted": False}
+    cached = True
+
+    outputs = [out_dir / manifest[fmt] for fmt in ("glb", "usdz") if manifest.get(fmt)]
+    if not manifest.get("converted") or not all(p.exists() for p in outputs):
+        cached = False
+        logger.info(f"Converting {src.name} → GLB + USDZ")
+        start = time.perf_counter()
+        scene = mesh_cache.get_scene(str(src))
+        timings["load"] = round(time.perf_counter() - start, 4)
+
+        # One after the other: exporters touch the shared cached scene
+        # (e.g. lazily built caches) and are not safe to run on it concurrently
+        glb_path, timings["glb"] = _export_format(scene, "glb", glb_out)
+        usdz_path, timings["usdz"] = _export_format(scene, "usdz", usdz_out)
+        manifest["glb"] = glb_out.name if glb_path else None
+        manifest["usdz"] = usdz_out.name if usdz_path else None
+        manifest["converted"] = True
+
+    lods = []
+    for ratio in sorted({r for r in lod_ratios or [] if 0 < r < 1}, reverse=True):
+        entry = manifest["lods"].get(f"{ratio:g}")
+        if entry is None or not (out_dir / entry["file"]).exists():
+            cached = False
+            start = time.perf_counter()
+            arrays = mesh_cache.get_arrays(str(src))
+            filename = _lod_filename(stem, ratio)
+            faces = write_lod(arrays.vertices, arrays.faces, ratio, out_dir / filename)
+            timings[f"lod_{ratio:g}"] = round(time.perf_counter() - start, 4)
+            entry = manifest["lods"][f"{ratio:g}"] = {"file": filename, "faces": faces}
+        lods.append({"ratio": ratio, "path": str(out_dir / entry["file"]), "faces": entry["faces"]})
+
+    if not cached:
+        manifest.update({
+            "version": EXPORT_MANIFEST_VERSION,
+            "source": src.name,
+            "source_signature": signature,
+            "source_sha256": source_sha256,
+        })
+        tmp = manifest_path.with_name(manifest_path.name + ".tmp")
+        tmp.write_text(json.dumps(manifest))
+        os.replace(tmp, manifest_path)
+    else:
+        logger.info(f"Export up to date: {stem}")
+
+    return {
+        "glb_path": str(out_dir / manifest["glb"]) if manifest["glb"] else None,
+        "usdz_path": str(out_dir / manifest["usdz"]) if manifest["usdz"] else None,
+        "lods": lods,
+        "cached": cached,
+        "timings": timings,
+    }
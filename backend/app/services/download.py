@@ -0,0 +1,122 @@
+"""
+White Dwarf — Streaming Downloads
+Fetch provider assets straight to disk in fixed-size chunks, hashing on the
+fly, so peak memory per download stays constant whatever the asset size.
+"""
+import os
+import time
+import hashlib
+import logging
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import httpx
+
+from ..config import (
+    HTTP_DOWNLOAD_TIMEOUT, DOWNLOAD_MAX_BYTES, DOWNLOAD_CHUNK_SIZE, DOWNLOAD_RESUME_ATTEMPTS,
+)
+from .clients import downloads
+from .metrics import DOWNLOAD_SECONDS, DOWNLOAD_BYTES, record_output
+
+logger = logging.getLogger(__name__)
+
+
+class DownloadTooLargeError(RuntimeError):
+    """Raised when a remote asset exceeds DOWNLOAD_MAX_BYTES."""
+
+
+class DownloadResult(NamedTuple):
+    path: Path
+    bytes: int
+    sha256: str
+
+
+def _resume_offset(resp: httpx.Response) -> Optional[int]:
+    """Start offset of a 206 response's Content-Range, if any."""
+    content_range = resp.headers.get("content-range", "")
+    if resp.status_code != 206 or not content_range.startswith("bytes "):
+        return None
+    try:
+        return int(content_range[6:].split("-", 1)[0])
+    except ValueError:
+        return None
+
+
+async def download_file(
+    url: str,
+    dest: Path,
+    max_bytes: int = DOWNLOAD_MAX_BYTES,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+) -> DownloadResult:
+    """
+    Stream `url` into `dest` via a `.part` file and an atomic rename.
+
+    A connection dropped mid-body is resumed with a Range request from the
+    bytes already on disk (up to DOWNLOAD_RESUME_ATTEMPTS times); servers
+    that ignore Range restart the body from zero.
+
+    Raises:
+        DownloadTooLargeError: when the asset is larger than `max_bytes`.
+        httpx.HTTPError: on HTTP errors or when resume attempts run out.
+    """
+    start = time.perf_counter()
+    part = dest.with_name(dest.name + ".part")
+    digest = hashlib.sha256()
+    written = 0
+    attempt = 0
+
+    try:
+        with open(part, "wb") as fh:
+            while True:
+                # Identity encoding keeps Range offsets and Content-Length in raw bytes
+                headers = {"Accept-Encoding": "identity"}
+                if written:
+                    headers["Range"] = f"bytes={written}-"
+                try:
+                    async with downloads.client.stream(
+                        "GET", url, headers=headers, timeout=HTTP_DOWNLOAD_TIMEOUT,
+                    ) as resp:
+                        resp.raise_for_status()
+
+                        if written and _resume_offset(resp) != written:
+                            # Server sent the whole body again; start over
+                            logger.info(f"Range not honoured for {dest.name}, restarting download")
+                            fh.seek(0)
+                            fh.truncate()
+                            digest = hashlib.sha256()
+                            written = 0
+
+                        length = resp.headers.get("content-length")
+                        if length and length.isdigit() and written + int(length) > max_bytes:
+                            raise DownloadTooLargeError(
+                                f"{dest.name}: {written + int(length)} bytes exceeds limit of {max_bytes}"
+                            )
+
+                        async for chunk in resp.aiter_bytes(chunk_size):
+                            written += len(chunk)
+                            if written > max_bytes:
+                                raise DownloadTooLargeError(
+                                    f"{dest.name}: exceeds limit of {max_bytes} bytes"
+                                )
+                            digest.update(chunk)
+                            fh.write(chunk)
+                    break
+                except httpx.TransportError as e:
+                    attempt += 1
+                    if attempt > DOWNLOAD_RESUME_ATTEMPTS:
+                        raise
+                    fh.flush()
+                    logger.warning(
+                        f"Download of {dest.name} interrupted at {written} bytes "
+                        f"({e.__class__.__name__}), resuming ({attempt}/{DOWNLOAD_RESUME_ATTEMPTS})"
+                    )
+        os.replace(part, dest)
+    except BaseException:
+        part.unlink(missing_ok=True)
+        raise
+
+    DOWNLOAD_SECONDS.observe(time.perf_counter() - start)
+    DOWNLOAD_BYTES.inc(written)
+    record_output(dest)
+
+    return DownloadResult(path=dest, bytes=written, sha256=digest.hexdigest())
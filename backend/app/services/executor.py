@@ -0,0 +1,163 @@
+"""
+White Dwarf — Geometry Executor
+Runs CPU-heavy mesh work in a process pool so the asyncio event loop stays
+responsive while large meshes are analyzed, rendered or converted.
+"""
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config import GEOMETRY_WORKERS, GEOMETRY_MAX_QUEUE, GEOMETRY_TASK_TIMEOUT
+from .metrics import GEOMETRY_TASK_SECONDS, GEOMETRY_QUEUE_SECONDS, MESH_CACHE_LOOKUPS
+from .tracing import collect_spans, record_span
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorBusyError(RuntimeError):
+    """Raised when the pool's wait queue is full; callers should retry later."""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _timed(fn: Callable, *args) -> Tuple[Any, float, Dict[Tuple[str, ...], float], List[Tuple[str, float]]]:
+    """
+    Worker-side wrapper: the result, seconds spent computing it, and the
+    mesh cache lookups and spans (e.g. mesh_load) recorded meanwhile, for
+    the parent's /metrics and the request's Server-Timing.
+    """
+    lookups = MESH_CACHE_LOOKUPS.values()
+    with collect_spans() as spans:
+        start = time.perf_counter()
+        result = fn(*args)
+        seconds = time.perf_counter() - start
+    return result, seconds, MESH_CACHE_LOOKUPS.since(lookups), spans
+
+
+class GeometryExecutor:
+    """
+    Bounded process pool for synchronous geometry functions.
+
+    `run()` admits at most `workers + max_queue` outstanding tasks and
+    raises ExecutorBusyError beyond that. Each task gets a wall-clock
+    timeout; a timed-out task that already started keeps its worker busy
+    until it finishes, because worker processes cannot be interrupted, and
+    it keeps counting as outstanding until then.
+    Each task's run time in the worker and its wait for a worker are
+    recorded per function name.
+    """
+
+    def __init__(self, workers: int, max_queue: int, task_timeout: float):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.task_timeout = task_timeout
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._outstanding = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rejected = 0
+
+    def start(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                logger.info(
+                    f"Geometry executor started: {self.workers} workers, "
+                    f"queue {self.max_queue}, timeout {self.task_timeout}s"
+                )
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+            logger.info("Geometry executor stopped")
+
+    def _restart_broken_pool(self, broken: ProcessPoolExecutor):
+        with self._lock:
+            if self._pool is broken:
+                self._pool = None
+        broken.shutdown(wait=False, cancel_futures=True)
+        logger.warning("Geometry worker pool was broken, restarting")
+        self.start()
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None) -> Any:
+        """
+        Run `fn(*args)` in a worker process and await its result.
+
+        `fn` and its arguments must be picklable (module-level functions
+        with plain arguments). Raises ExecutorBusyError when saturated and
+        TimeoutError when the task exceeds its timeout.
+        """
+        if self._pool is None:
+            self.start()
+
+        with self._lock:
+            if self._outstanding >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorBusyError(
+                    f"Geometry workers are busy ({self._outstanding} tasks outstanding)",
+                    retry_after=max(1, int(self.task_timeout // 10)),
+                )
+            self._outstanding += 1
+            pool = self._pool
+
+        limit = self.task_timeout if timeout is None else timeout
+        submitted = time.perf_counter()
+        try:
+            try:
+                work = pool.submit(_timed, fn, *args)
+            except BaseException:
+                self._release()
+                raise
+            # The slot is held until the worker is really done: a timed-out
+            # or cancelled task keeps its process busy until it finishes
+            work.add_done_callback(self._release)
+            result, seconds, lookups, spans = await asyncio.wait_for(asyncio.wrap_future(work), timeout=limit)
+            MESH_CACHE_LOOKUPS.add(lookups)
+            for name, span_seconds in spans:
+                record_span(name, span_seconds)
+            self.completed += 1
+            task = getattr(fn, "__name__", "task")
+            waited = max(0.0, time.perf_counter() - submitted - seconds)
+            GEOMETRY_TASK_SECONDS.labels(task).observe(seconds)
+            GEOMETRY_QUEUE_SECONDS.labels(task).observe(waited)
+            record_span(task, seconds)
+            record_span(f"{task}_wait", waited)
+            return result
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise TimeoutError(f"{getattr(fn, '__name__', 'task')} exceeded {limit}s")
+        except BrokenProcessPool:
+            self.failed += 1
+            self._restart_broken_pool(pool)
+            raise RuntimeError("Geometry worker crashed; the pool has been restarted")
+        except Exception:
+            self.failed += 1
+            raise
+
+    def _release(self, _work: Optional[Future] = None):
+        with self._lock:
+            self._outstanding -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "outstanding": self._outstanding,
+            "completed": self.completed,
+            "failed": self.failed,
+            "timed_out": self.timed_out,
+            "rejected": self.rejected,
+        }
+
+
+geometry_executor = GeometryExecutor(GEOMETRY_WORKERS, GEOMETRY_MAX_QUEUE, GEOMETRY_TASK_TIMEOUT)
@@ -0,0 +1,71 @@
+"""
+White Dwarf — Pooled HTTP Clients
+Long-lived httpx clients so provider calls, polls and downloads reuse warm
+keep-alive (and HTTP/2) connections instead of handshaking every time.
+"""
+import httpx
+import logging
+import importlib.util
+from typing import Dict, Optional
+
+from ..config import (
+    HTTP2_ENABLED, HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE,
+    HTTP_KEEPALIVE_EXPIRY, HTTP_CONNECT_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional `h2` package (pip install httpx[http2])."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class ManagedClient:
+    """
+    One shared `httpx.AsyncClient` with an explicit lifecycle.
+
+    The client is created by `start()` (called from the FastAPI lifespan)
+    or lazily on first use, and closed by `aclose()`. Per-operation
+    timeouts are passed on each request; the client default only bounds
+    connection setup.
+    """
+
+    def __init__(self, name: str, headers: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.headers = headers or {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self.http2 = False
+
+    def _create(self) -> httpx.AsyncClient:
+        self.http2 = HTTP2_ENABLED and http2_available()
+        if HTTP2_ENABLED and not self.http2:
+            logger.info(f"[{self.name}] HTTP/2 unavailable, install: pip install httpx[http2]")
+
+        return httpx.AsyncClient(
+            headers=self.headers,
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(None, connect=HTTP_CONNECT_TIMEOUT),
+        )
+
+    def start(self):
+        if self._client is None or self._client.is_closed:
+            self._client = self._create()
+            logger.info(f"[{self.name}] HTTP client started (http2={self.http2})")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self.start()
+        return self._client
+
+    async def aclose(self):
+        client, self._client = self._client, None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+            logger.info(f"[{self.name}] HTTP client closed")
@@ -0,0 +1,293 @@
+"""
+White Dwarf — Background Jobs
+SQLite-backed job store and a bounded asyncio worker pool for long-running
+cloud inference (generate/texture), so HTTP requests return immediately.
+"""
+import json
+import time
+import uuid
+import asyncio
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from ..config import (
+    JOBS_DB_PATH, JOB_WORKERS, JOB_MAX_QUEUED, JOB_PROVIDER_CONCURRENCY, OUTPUTS_DIR,
+)
+from .pipeline import StageTimings, generate_mesh_asset, texture_mesh_asset
+from .admission import ProviderBusyError
+from .provider_router import job_slots
+from .result_cache import register_file_users
+
+logger = logging.getLogger(__name__)
+
+# Job lifecycle states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobQueueFullError(RuntimeError):
+    """Raised when too many jobs are waiting; callers should retry later."""
+
+
+class JobStore:
+    """Persists job state in SQLite so restarts keep in-flight and finished jobs."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    stages TEXT NOT NULL DEFAULT '{}',
+                    current_stage TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs(state)")
+
+    @staticmethod
+    def _row_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job["stages"] = json.loads(job["stages"]) if job["stages"] else {}
+        return job
+
+    def create(self, kind: str, params: Dict[str, Any], job_id: Optional[str] = None) -> Dict[str, Any]:
+        job_id = job_id or uuid.uuid4().hex[:12]
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, state, params, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, json.dumps(params), time.time()),
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def update(self, job_id: str, **fields):
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"])
+        if "stages" in fields:
+            fields["stages"] = json.dumps(fields["stages"])
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    def referenced(self, names: Set[str]) -> Set[str]:
+        """Output file names that some job's params or result links to."""
+        used = set()
+        with self._lock:
+            for name in names:
+                needle = f'/outputs/{name}"'
+                if self._conn.execute(
+                    "SELECT 1 FROM jobs WHERE instr(result, ?) > 0 OR instr(params, ?) > 0 LIMIT 1",
+                    (needle, needle),
+                ).fetchone():
+                    used.add(name)
+        return used
+
+    def unfinished(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE state IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+            ).fetchall()
+        return [self._row_to_dict(r) for r in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+async def _run_generate(params: Dict[str, Any], job_id: str, timings: StageTimings) -> Dict[str, Any]:
+    return await generate_mesh_asset(
+        params["prompt"], job_id, image_url=params.get("image_url"), timings=timings,
+        use_cache=not params.get("no_cache", False),
+    )
+
+
+async def _run_texture(params: Dict[str, Any], job_id: str, timings: StageTimings) -> Dict[str, Any]:
+    mesh_path = OUTPUTS_DIR / params["mesh_url"].split("/")[-1]
+    if not mesh_path.exists():
+        raise FileNotFoundError(f"Mesh not found: {mesh_path.name}")
+    return await texture_mesh_asset(
+        mesh_path, params["mesh_url"], params["material_prompt"], job_id, timings=timings,
+        use_cache=not params.get("no_cache", False),
+    )
+
+
+_HANDLERS: Dict[str, Callable] = {
+    "generate": _run_generate,
+    "texture": _run_texture,
+}
+
+
+class JobManager:
+    """
+    Bounded worker pool draining an in-memory queue of persisted jobs.
+
+    `JOB_WORKERS` coroutines pull jobs; each prediction a job makes holds
+    the semaphore of the provider the router sends it to, capping
+    concurrent job predictions per provider.
+    On start, jobs left queued or running by a previous process are
+    re-queued and run again from the beginning. Jobs turned away by
+    provider admission control are re-queued after its Retry-After.
+    """
+
+    def __init__(self, store_path: Path, workers: int, max_queued: int, provider_limits: Dict[str, int]):
+        self.store_path = store_path
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+        self.provider_limits = provider_limits
+        self.store: Optional[JobStore] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, provider: str) -> asyncio.Semaphore:
+        if provider not in self._semaphores:
+            self._semaphores[provider] = asyncio.Semaphore(self.provider_limits.get(provider, self.workers))
+        return self._semaphores[provider]
+
+    async def start(self):
+        if self._tasks:
+            return
+        self.store = JobStore(self.store_path)
+        self._queue = asyncio.Queue()
+
+        recovered = self.store.unfinished()
+        for job in recovered:
+            self.store.update(job["id"], state=QUEUED, current_stage=None, started_at=None)
+            self._queue.put_nowait(job["id"])
+        if recovered:
+            logger.info(f"Re-queued {len(recovered)} unfinished jobs from previous run")
+
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"Job workers started: {self.workers}")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+        logger.info("Job workers stopped")
+
+    def submit(self, kind: str, params: Dict[str, Any], job_id: Optional[str] = None) -> Dict[str, Any]:
+        """Persist a new job and enqueue it. Raises JobQueueFullError when saturated."""
+        if kind not in _HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if self.store is None:
+            raise RuntimeError("Job manager is not running")
+        if self._queue.qsize() >= self.max_queued:
+            raise JobQueueFullError(f"Too many queued jobs ({self._queue.qsize()})")
+
+        job = self.store.create(kind, params, job_id=job_id)
+        self._queue.put_nowait(job["id"])
+        logger.info(f"Job queued: {job['id']} ({kind})")
+        return job
+
+    def referenced(self, names: Set[str]) -> Set[str]:
+        """Output files linked from job records, also while the workers are stopped."""
+        if self.store is not None:
+            return self.store.referenced(names)
+        if not self.store_path.exists():
+            return set()
+        store = JobStore(self.store_path)
+        try:
+            return store.referenced(names)
+        finally:
+            store.close()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.store.get(job_id) if self.store else None
+        if job is not None and job["state"] == QUEUED:
+            job["queue_depth"] = self._queue.qsize()
+        return job
+
+    async def _worker(self, index: int):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._execute(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # never let one job kill the worker
+                logger.error(f"Job worker {index} crashed on {job_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def _execute(self, job_id: str):
+        job = self.store.get(job_id)
+        if job is None or job["state"] not in (QUEUED, RUNNING):
+            return
+
+        handler = _HANDLERS[job["kind"]]
+        timings = StageTimings()
+
+        started = time.time()
+        timings.timings["queue_wait"] = round(started - job["created_at"], 4)
+        self.store.update(job_id, state=RUNNING, started_at=started, stages=timings.timings)
+
+        # The handler's predictions pick up the per-provider semaphores from its context
+        slots = job_slots.set(self._semaphore)
+        try:
+            task = asyncio.create_task(handler(job["params"], job_id, timings))
+        finally:
+            job_slots.reset(slots)
+        try:
+            while not task.done():
+                # Persist stage progress so GET /jobs/{id} shows where it is
+                await asyncio.wait({task}, timeout=1.0)
+                self.store.update(job_id, current_stage=timings.current, stages=timings.timings)
+            result = task.result()
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        except ProviderBusyError as e:
+            # Provider admission is saturated: run the job again later
+            # rather than failing work the caller was promised
+            logger.info(f"Job {job_id} deferred {e.retry_after}s: {e}")
+            self.store.update(job_id, state=QUEUED, current_stage=None, started_at=None)
+            asyncio.get_running_loop().call_later(e.retry_after, self._queue.put_nowait, job_id)
+            return
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            self.store.update(
+                job_id, state=FAILED, error=str(e), current_stage=None,
+                stages=timings.timings, finished_at=time.time(),
+            )
+            return
+
+        self.store.update(
+            job_id, state=SUCCEEDED, result=result, current_stage=None,
+            stages=timings.timings, finished_at=time.time(),
+        )
+        logger.info(f"Job succeeded: {job_id} in {time.time() - started:.1f}s")
+
+
+job_manager = JobManager(JOBS_DB_PATH, JOB_WORKERS, JOB_MAX_QUEUED, JOB_PROVIDER_CONCURRENCY)
+# Result cache eviction keeps files that finished jobs still link to
+register_file_users(job_manager.referenced)
@@ -0,0 +1,190 @@
+"""
+White Dwarf — AR Levels of Detail
+Decimated, quantized GLB variants of a mesh so phones opening the AR link
+download a small preview first instead of the full-resolution geometry.
+"""
+import os
+import logging
+import importlib.util
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+import trimesh
+import pygltflib
+
+logger = logging.getLogger(__name__)
+
+# Quantized positions: UNSIGNED_SHORT, dequantized by the node transform
+_POSITION_BITS = 16
+_ARRAY_BUFFER = 34962
+_ELEMENT_ARRAY_BUFFER = 34963
+
+
+def quadric_available() -> bool:
+    """Quadric decimation needs the optional `fast_simplification` package."""
+    return importlib.util.find_spec("fast_simplification") is not None
+
+
+def _unique_faces(faces: np.ndarray) -> np.ndarray:
+    """Drop duplicate triangles (same vertex set), keeping the first winding."""
+    ordered = np.sort(faces, axis=1).astype(np.int64)
+    if len(faces) and ordered.max() < (1 << 21):
+        packed = (ordered[:, 0] << 42) | (ordered[:, 1] << 21) | ordered[:, 2]
+        _, first = np.unique(packed, return_index=True)
+    else:
+        _, first = np.unique(ordered, axis=0, return_index=True)
+    return faces[np.sort(first)]
+
+
+def _cluster(vertices: np.ndarray, faces: np.ndarray, cells: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Vertex clustering on a `cells`-per-longest-axis grid (no duplicate removal)."""
+    lo = vertices.min(axis=0)
+    extent = float((vertices.max(axis=0) - lo).max()) or 1.0
+    grid = np.minimum(((vertices - lo) * (cells / extent)).astype(np.int64), cells - 1)
+    cell_id = (grid[:, 0] * (cells + 1) + grid[:, 1]) * (cells + 1) + grid[:, 2]
+    unique_cells, remap = np.unique(cell_id, return_inverse=True)
+
+    # Representative vertex per cell: mean of its members
+    counts = np.bincount(remap, minlength=len(unique_cells)).astype(np.float64)
+    clustered = np.empty((len(unique_cells), 3), dtype=np.float64)
+    for axis in range(3):
+        clustered[:, axis] = np.bincount(remap, weights=vertices[:, axis], minlength=len(unique_cells)) / counts
+
+    new_faces = remap[faces]
+    keep = (
+        (new_faces[:, 0] != new_faces[:, 1])
+        & (new_faces[:, 1] != new_faces[:, 2])
+        & (new_faces[:, 0] != new_faces[:, 2])
+    )
+    return clustered, new_faces[keep]
+
+
+def decimate(vertices: np.ndarray, faces: np.ndarray, target_faces: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a mesh to roughly `target_faces` triangles.
+
+    Uses quadric decimation when `fast_simplification` is installed, and
+    otherwise vertex clustering with a grid resolution found by bisection.
+
+    Returns:
+        (vertices float64 (N, 3), faces int64 (M, 3)) with unused vertices removed.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64)
+    if target_faces >= len(faces):
+        return vertices, faces
+
+    if quadric_available():
+        mesh = trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+        simplified = mesh.simplify_quadric_decimation(face_count=target_faces)
+        return np.asarray(simplified.vertices, dtype=np.float64), np.asarray(simplified.faces, dtype=np.int64)
+
+    # Face count grows roughly with the square of the grid resolution
+    lo, hi = 2, 4096
+    best = None
+    for _ in range(12):
+        cells = (lo + hi) // 2
+        candidate = _cluster(vertices, faces, cells)
+        if len(candidate[1]) <= target_faces:
+            best, lo = candidate, cells + 1
+        else:
+            hi = cells - 1
+        if lo > hi or (best is not None and len(best[1]) >= 0.9 * target_faces):
+            break
+    if best is None:
+        best = _cluster(vertices, faces, 2)
+
+    clustered, new_faces = best
+    new_faces = _unique_faces(new_faces)
+    used, compact = np.unique(new_faces, return_inverse=True)
+    return clustered[used], compact.reshape(-1, 3)
+
+
+def _align4(blob: bytearray):
+    blob.extend(b"\x00" * (-len(blob) % 4))
+
+
+def quantized_glb(vertices: np.ndarray, faces: np.ndarray) -> bytes:
+    """
+    Encode geometry as a GLB using KHR_mesh_quantization.
+
+    Positions are stored as 16-bit integers on the mesh bounding box and
+    dequantized by the node's translation/scale, normals as normalized
+    bytes, and indices as 16-bit when the vertex count allows.
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64)
+
+    lo = vertices.min(axis=0)
+    extent = float((vertices.max(axis=0) - lo).max()) or 1.0
+    steps = (1 << _POSITION_BITS) - 1
+    scale = extent / steps
+
+    positions = np.zeros((len(vertices), 4), dtype=np.uint16)  # 8-byte stride
+    positions[:, :3] = np.rint((vertices - lo) / scale).clip(0, steps)
+
+    normals_f = trimesh.Trimesh(vertices=vertices, faces=faces, process=False).vertex_normals
+    normals = np.zeros((len(vertices), 4), dtype=np.int8)  # 4-byte stride
+    normals[:, :3] = np.rint(np.asarray(normals_f) * 127).clip(-127, 127)
+
+    small_indices = len(vertices) <= 0xFFFF
+    indices = faces.astype(np.uint16 if small_indices else np.uint32).ravel()
+
+    blob = bytearray()
+    views = []
+    for data, stride, target in (
+        (positions, 8, _ARRAY_BUFFER),
+        (normals, 4, _ARRAY_BUFFER),
+        (indices, None, _ELEMENT_ARRAY_BUFFER),
+    ):
+        offset = len(blob)
+        blob.extend(data.tobytes())
+        views.append(pygltflib.BufferView(
+            buffer=0, byteOffset=offset, byteLength=len(blob) - offset, byteStride=stride, target=target,
+        ))
+        _align4(blob)
+
+    q_min = positions[:, :3].min(axis=0).tolist()
+    q_max = positions[:, :3].max(axis=0).tolist()
+    gltf = pygltflib.GLTF2(
+        asset=pygltflib.Asset(generator="White Dwarf", version="2.0"),
+        extensionsUsed=["KHR_mesh_quantization"],
+        extensionsRequired=["KHR_mesh_quantization"],
+        scene=0,
+        scenes=[pygltflib.Scene(nodes=[0])],
+        nodes=[pygltflib.Node(mesh=0, translation=lo.tolist(), scale=[scale, scale, scale])],
+        meshes=[pygltflib.Mesh(primitives=[pygltflib.Primitive(
+            attributes=pygltflib.Attributes(POSITION=0, NORMAL=1), indices=2,
+        )])],
+        accessors=[
+            pygltflib.Accessor(
+                bufferView=0, componentType=pygltflib.UNSIGNED_SHORT, count=len(vertices),
+                type=pygltflib.VEC3, min=q_min, max=q_max,
+            ),
+            pygltflib.Accessor(
+                bufferView=1, componentType=pygltflib.BYTE, normalized=True,
+                count=len(vertices), type=pygltflib.VEC3,
+            ),
+            pygltflib.Accessor(
+                bufferView=2,
+                componentType=pygltflib.UNSIGNED_SHORT if small_indices else pygltflib.UNSIGNED_INT,
+                count=len(indices), type=pygltflib.SCALAR,
+            ),
+        ],
+        bufferViews=views,
+        buffers=[pygltflib.Buffer(byteLength=len(blob))],
+    )
+    gltf.set_binary_blob(bytes(blob))
+    return b"".join(gltf.save_to_bytes())
+
+
+def write_lod(vertices: np.ndarray, faces: np.ndarray, ratio: float, out: Path) -> int:
+    """Decimate to `ratio` of the faces, write a quantized GLB, return its face count."""
+    if ratio < 1.0:
+        vertices, faces = decimate(vertices, faces, max(4, int(len(faces) * ratio)))
+    tmp = out.with_name(out.name + ".tmp")
+    tmp.write_bytes(quantized_glb(vertices, faces))
+    os.replace(tmp, out)
+    logger.info(f"LOD {ratio:g} saved: {out.name} ({len(faces)} faces, {out.stat().st_size} bytes)")
+    return int(len(faces))
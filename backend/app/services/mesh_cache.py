@@ -0,0 +1,243 @@
+"""
+White Dwarf — Mesh Cache
+Process-wide LRU cache of parsed meshes shared by every pipeline stage.
+"""
+import os
+import threading
+import trimesh
+import numpy as np
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+from ..config import MESH_CACHE_MAX_BYTES
+from .mesh_sidecar import MeshArrays, load_sidecar, write_sidecar, geometry_sha256
+from .metrics import MESH_CACHE_LOOKUPS
+from .tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+def _estimate_nbytes(geometry) -> int:
+    """Approximate resident size of a loaded Trimesh or Scene."""
+    if isinstance(geometry, trimesh.Scene):
+        return sum(_estimate_nbytes(g) for g in geometry.geometry.values())
+
+    total = geometry.vertices.nbytes + geometry.faces.nbytes
+    uv = getattr(getattr(geometry, "visual", None), "uv", None)
+    if uv is not None:
+        total += uv.nbytes
+    return total
+
+
+def _has_visual(loaded) -> bool:
+    """Whether a loaded file carries data beyond positions and faces."""
+    if isinstance(loaded, trimesh.Scene):
+        return len(loaded.geometry) > 1 or any(
+            getattr(g, "visual", None) is not None and g.visual.kind is not None
+            for g in loaded.geometry.values()
+        )
+    return getattr(loaded, "visual", None) is not None and loaded.visual.kind is not None
+
+
+def _flatten(loaded) -> trimesh.Trimesh:
+    """Concatenate every Trimesh in a scene into one mesh."""
+    if isinstance(loaded, trimesh.Trimesh):
+        return loaded
+    if isinstance(loaded, trimesh.Scene):
+        meshes = [g for g in loaded.geometry.values() if isinstance(g, trimesh.Trimesh)]
+        if not meshes:
+            raise ValueError("No valid meshes found in the file")
+        return trimesh.util.concatenate(meshes)
+    raise ValueError(f"Unsupported mesh type: {type(loaded)}")
+
+
+class _Entry:
+    __slots__ = ("signature", "loaded", "mesh", "nbytes")
+
+    def __init__(self, signature: Tuple[int, int], loaded, nbytes: int):
+        self.signature = signature
+        self.loaded = loaded
+        self.mesh: Optional[trimesh.Trimesh] = None
+        self.nbytes = nbytes
+
+
+class MeshCache:
+    """
+    Byte-bounded LRU of parsed meshes keyed by path.
+
+    Entries are validated against the file's mtime and size on every
+    lookup, so a rewritten file is reparsed automatically. Cached objects
+    are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.sidecar_hits = 0
+
+    @staticmethod
+    def _signature(path: Path) -> Tuple[int, int]:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size
+
+    def _lookup(self, path: Path) -> _Entry:
+        key = str(path.resolve())
+        signature = self._signature(path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                MESH_CACHE_LOOKUPS.labels("hit").inc()
+                return entry
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            MESH_CACHE_LOOKUPS.labels("miss").inc()
+
+        logger.info(f"Mesh cache miss, parsing: {path.name}")
+        with span("mesh_load"):
+            loaded = trimesh.load(str(path))
+        entry = _Entry(signature, loaded, _estimate_nbytes(loaded))
+
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if entry.nbytes <= self.max_bytes:
+                self._entries[key] = entry
+                self._bytes += entry.nbytes
+                self._evict()
+        return entry
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.nbytes
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            key, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.nbytes
+            self.evictions += 1
+            logger.debug(f"Mesh cache evicted: {key}")
+
+    def _entry(self, path: str) -> _Entry:
+        src = Path(path)
+        if not src.exists():
+            raise FileNotFoundError(f"Mesh file not found: {path}")
+        return self._lookup(src)
+
+    def _flattened(self, path: str, entry: _Entry) -> trimesh.Trimesh:
+        if entry.mesh is None:
+            entry.mesh = _flatten(entry.loaded)
+            if entry.mesh is not entry.loaded:
+                # Concatenated scenes hold a second copy of the geometry
+                extra = _estimate_nbytes(entry.mesh)
+                with self._lock:
+                    entry.nbytes += extra
+                    if self._entries.get(str(Path(path).resolve())) is entry:
+                        self._bytes += extra
+                        self._evict()
+        return entry.mesh
+
+    def get_loaded(self, path: str):
+        """Return the raw `trimesh.load` result (Trimesh or Scene)."""
+        return self._entry(path).loaded
+
+    def get_mesh(self, path: str) -> trimesh.Trimesh:
+        """Return the file's geometry flattened into a single Trimesh."""
+        return self._flattened(path, self._entry(path))
+
+    def get_arrays(self, path: str) -> MeshArrays:
+        """
+        Return flat vertex/face arrays for geometry-only consumers.
+
+        Prefers the memory-mapped binary sidecar written at generation
+        time; falls back to the parsed (and cached) mesh otherwise.
+        """
+        with span("mesh_load"):
+            sidecar = load_sidecar(path)
+        if sidecar is not None:
+            with self._lock:
+                self.sidecar_hits += 1
+                MESH_CACHE_LOOKUPS.labels("sidecar").inc()
+            return sidecar
+
+        # One lookup: a second would count twice, and reparse meshes too big to cache
+        entry = self._entry(path)
+        mesh = self._flattened(path, entry)
+        return MeshArrays(
+            vertices=np.asarray(mesh.vertices),
+            faces=np.asarray(mesh.faces),
+            bounds=np.asarray(mesh.bounds),
+            centroid=np.asarray(mesh.centroid),
+            has_visual=_has_visual(entry.loaded),
+        )
+
+    def write_sidecar(self, path: str):
+        """Parse a mesh file once and persist its binary sidecar."""
+        entry = self._entry(path)
+        return write_sidecar(path, self._flattened(path, entry), _has_visual(entry.loaded))
+
+    def get_scene(self, path: str) -> trimesh.Scene:
+        """Return the file's geometry wrapped in a Scene for export."""
+        with span("mesh_load"):
+            sidecar = load_sidecar(path)
+        if sidecar is not None and not sidecar.has_visual:
+            # Geometry-only source: the sidecar is lossless, skip the parse
+            with self._lock:
+                self.sidecar_hits += 1
+                MESH_CACHE_LOOKUPS.labels("sidecar").inc()
+            mesh = trimesh.Trimesh(vertices=sidecar.vertices, faces=sidecar.faces, process=False)
+            return trimesh.Scene(geometry={'mesh': mesh})
+
+        loaded = self.get_loaded(path)
+        if isinstance(loaded, trimesh.Trimesh):
+            return trimesh.Scene(geometry={'mesh': loaded})
+        return loaded
+
+    def invalidate(self, path: Optional[str] = None):
+        """Drop one path from the cache, or everything when path is None."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            key = str(Path(path).resolve())
+            if key in self._entries:
+                self._drop(key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "sidecar_hits": self.sidecar_hits,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+mesh_cache = MeshCache(MESH_CACHE_MAX_BYTES)
+
+
+def write_mesh_sidecar(path: str):
+    """Module-level entry point so sidecar writes can run in worker processes."""
+    return mesh_cache.write_sidecar(path)
+
+
+def geometry_digest(path: str) -> str:
+    """Content hash of a mesh's geometry; precomputed in the sidecar when present."""
+    arrays = mesh_cache.get_arrays(path)
+    return arrays.digest or geometry_sha256(arrays.vertices, arrays.faces)
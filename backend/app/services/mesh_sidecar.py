@@ -0,0 +1,139 @@
+"""
+White Dwarf — Binary Mesh Sidecar
+Memory-mappable float32/uint32 copies of generated meshes, so later stages
+skip OBJ text parsing entirely.
+
+Layout next to `{stem}.obj`:
+    {stem}.vertices.npy  float32 (N, 3)
+    {stem}.faces.npy     uint32  (M, 3)
+    {stem}.mesh.json     bounds, centroid, counts and source signature
+"""
+import os
+import json
+import hashlib
+import numpy as np
+import logging
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_VERSION = 1
+
+
+class MeshArrays(NamedTuple):
+    """Flat geometry arrays plus precomputed summary values."""
+    vertices: np.ndarray   # (N, 3)
+    faces: np.ndarray      # (M, 3)
+    bounds: np.ndarray     # (2, 3) min/max corners
+    centroid: np.ndarray   # (3,) area-weighted surface centroid
+    has_visual: bool       # source carries UVs/colors/materials the arrays drop
+    digest: Optional[str] = None  # geometry_sha256 of the arrays, when precomputed
+
+
+def geometry_sha256(vertices: np.ndarray, faces: np.ndarray) -> str:
+    """Hash of the geometry itself (float32 positions + uint32 faces)."""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(vertices, dtype=np.float32).tobytes())
+    digest.update(np.ascontiguousarray(faces, dtype=np.uint32).tobytes())
+    return digest.hexdigest()
+
+
+def sidecar_paths(obj_path: str) -> Tuple[Path, Path, Path]:
+    """Return (vertices, faces, meta) sidecar paths for a mesh file."""
+    src = Path(obj_path)
+    stem = src.with_suffix("")
+    return (
+        stem.with_name(f"{stem.name}.vertices.npy"),
+        stem.with_name(f"{stem.name}.faces.npy"),
+        stem.with_name(f"{stem.name}.mesh.json"),
+    )
+
+
+def _source_signature(src: Path) -> Tuple[int, int]:
+    st = os.stat(src)
+    return st.st_mtime_ns, st.st_size
+
+
+def _save_atomic(path: Path, array: np.ndarray):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        np.save(fh, array)
+    os.replace(tmp, path)
+
+
+def write_sidecar(obj_path: str, mesh, has_visual: bool) -> Path:
+    """
+    Write the binary sidecar for an already-parsed mesh.
+
+    Args:
+        obj_path: Path of the source mesh the sidecar belongs to.
+        mesh: Flattened trimesh.Trimesh parsed from `obj_path`.
+        has_visual: Whether the source has attributes beyond positions/faces.
+
+    Returns:
+        Path to the sidecar metadata file.
+    """
+    src = Path(obj_path)
+    vertices_path, faces_path, meta_path = sidecar_paths(obj_path)
+
+    vertices = np.ascontiguousarray(mesh.vertices, dtype=np.float32)
+    faces = np.ascontiguousarray(mesh.faces, dtype=np.uint32)
+    _save_atomic(vertices_path, vertices)
+    _save_atomic(faces_path, faces)
+
+    mtime_ns, size = _source_signature(src)
+    meta = {
+        "version": SIDECAR_VERSION,
+        "source": src.name,
+        "source_mtime_ns": mtime_ns,
+        "source_size": size,
+        "vertex_count": int(len(mesh.vertices)),
+        "face_count": int(len(mesh.faces)),
+        "bounds": np.asarray(mesh.bounds, dtype=np.float64).tolist(),
+        "centroid": np.asarray(mesh.centroid, dtype=np.float64).tolist(),
+        "has_visual": bool(has_visual),
+        "geometry_sha256": geometry_sha256(vertices, faces),
+    }
+    tmp = meta_path.with_name(meta_path.name + ".tmp")
+    tmp.write_text(json.dumps(meta))
+    os.replace(tmp, meta_path)
+
+    logger.info(f"Mesh sidecar written: {meta_path.name} ({meta['face_count']} faces)")
+    return meta_path
+
+
+def load_sidecar(obj_path: str) -> Optional[MeshArrays]:
+    """
+    Memory-map the sidecar of a mesh file.
+
+    Returns None when no sidecar exists or it is stale relative to the
+    source file (different mtime/size or format version).
+    """
+    src = Path(obj_path)
+    vertices_path, faces_path, meta_path = sidecar_paths(obj_path)
+    if not meta_path.exists():
+        return None
+
+    try:
+        meta = json.loads(meta_path.read_text())
+        if meta.get("version") != SIDECAR_VERSION:
+            return None
+        if (meta["source_mtime_ns"], meta["source_size"]) != _source_signature(src):
+            logger.info(f"Ignoring stale mesh sidecar: {meta_path.name}")
+            return None
+
+        vertices = np.load(vertices_path, mmap_mode="r")
+        faces = np.load(faces_path, mmap_mode="r")
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Unreadable mesh sidecar {meta_path.name}: {e}")
+        return None
+
+    return MeshArrays(
+        vertices=vertices,
+        faces=faces,
+        bounds=np.asarray(meta["bounds"], dtype=np.float64),
+        centroid=np.asarray(meta["centroid"], dtype=np.float64),
+        has_visual=bool(meta.get("has_visual", False)),
+        digest=meta.get("geometry_sha256"),
+    )
@@ -0,0 +1,277 @@
+"""
+White Dwarf — Metrics
+Dependency-free Prometheus instrumentation: counters, gauges and
+histograms kept in plain Python structures, plus scrape-time collectors
+that read the stats() the services already keep. Updates are a dict
+lookup and a few additions on the event loop, cheap enough to leave on.
+"""
+import asyncio
+import logging
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds, from cache lookups to multi-minute predictions
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+LOOP_LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+
+# (label values, value) pairs produced by a collector at scrape time
+Samples = Iterable[Tuple[Tuple[str, ...], float]]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Registry:
+    """Metrics and collectors rendered together in the text exposition format."""
+
+    def __init__(self):
+        self._metrics: List["_Metric"] = []
+
+    def register(self, metric: "_Metric"):
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            try:
+                metric.render(lines)
+            except Exception as e:  # one broken collector must not blank the scrape
+                logger.warning(f"Metric {metric.name} failed to render: {e}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), registry: Registry = REGISTRY):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        registry.register(self)
+
+    def labels(self, *values: str):
+        """Child series for one combination of label values."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _header(self, lines: List[str]):
+        lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} {self.kind}")
+
+    def render(self, lines: List[str]):
+        self._header(lines)
+        for values, child in list(self._children.items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, values)} {_number(child.value)}")
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Counter(_Metric):
+    """Monotonically increasing total."""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def values(self) -> Dict[Tuple[str, ...], float]:
+        """Current total per label combination."""
+        return {labels: child.value for labels, child in list(self._children.items())}
+
+    def since(self, before: Dict[Tuple[str, ...], float]) -> Dict[Tuple[str, ...], float]:
+        """Increments since `before` (a values() snapshot), e.g. made in a worker process."""
+        return {
+            labels: value - before.get(labels, 0.0)
+            for labels, value in self.values().items() if value != before.get(labels, 0.0)
+        }
+
+    def add(self, deltas: Dict[Tuple[str, ...], float]):
+        """Apply increments reported by since() in another process."""
+        for labels, amount in deltas.items():
+            self.labels(*labels).inc(amount)
+
+
+class Gauge(_Metric):
+    """Value that goes up and down."""
+
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        # le buckets: a value equal to a bound belongs to that bound
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative `le` buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS, registry: Registry = REGISTRY):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def render(self, lines: List[str]):
+        self._header(lines)
+        for values, child in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), child.counts):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, values)} {_number(child.sum)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, values)} {child.count}")
+
+
+class Collector(_Metric):
+    """Series computed at scrape time by `fn`, e.g. from a service's stats()."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], fn: Callable[[], Samples],
+                 kind: str = "gauge", registry: Registry = REGISTRY):
+        self.kind = kind
+        self.fn = fn
+        super().__init__(name, help, labelnames, registry)
+
+    def render(self, lines: List[str]):
+        samples = list(self.fn())
+        self._header(lines)
+        for values, value in samples:
+            lines.append(f"{self.name}{_labels(self.labelnames, values)} {_number(value)}")
+
+
+# ── Pipeline ──────────────────────────────────────────────────
+STAGE_SECONDS = Histogram(
+    "whitedwarf_stage_seconds", "Wall-clock seconds per generate/texture pipeline stage", ["stage"],
+)
+PROVIDER_QUEUE_SECONDS = Histogram(
+    "whitedwarf_provider_queue_seconds", "Seconds a prediction waited before the provider started it",
+    ["provider", "kind"],
+)
+PROVIDER_RUN_SECONDS = Histogram(
+    "whitedwarf_provider_run_seconds", "Seconds from a prediction starting to its result", ["provider", "kind"],
+)
+PROVIDER_INFLIGHT = Gauge(
+    "whitedwarf_provider_inflight_predictions", "Predictions currently submitted or waiting for admission",
+    ["provider", "kind"],
+)
+PROVIDER_PREDICTIONS = Counter(
+    "whitedwarf_provider_predictions_total", "Finished predictions by outcome",
+    ["provider", "kind", "outcome"],
+)
+
+# ── Downloads & Outputs ───────────────────────────────────────
+DOWNLOAD_SECONDS = Histogram("whitedwarf_download_seconds", "Seconds per provider asset download")
+DOWNLOAD_BYTES = Counter("whitedwarf_download_bytes_total", "Bytes downloaded from provider CDNs")
+OUTPUT_BYTES = Counter(
+    "whitedwarf_output_bytes_written_total", "Bytes written to OUTPUTS_DIR", ["kind"],
+)
+
+# ── Geometry Workers ──────────────────────────────────────────
+GEOMETRY_TASK_SECONDS = Histogram(
+    "whitedwarf_geometry_task_seconds", "Seconds a geometry task ran inside its worker process", ["task"],
+)
+GEOMETRY_QUEUE_SECONDS = Histogram(
+    "whitedwarf_geometry_queue_seconds", "Seconds a geometry task waited for a worker (and for IPC)", ["task"],
+)
+EXPORT_FORMAT_SECONDS = Histogram(
+    "whitedwarf_export_format_seconds", "Seconds to export one AR format (to_glb / to_usdz)", ["format"],
+)
+# Counted where the mesh cache lives (a worker process) and reported back with each task
+MESH_CACHE_LOOKUPS = Counter(
+    "whitedwarf_mesh_cache_lookups_total", "Parsed-mesh cache lookups by outcome (hit, miss, sidecar)",
+    ["result"],
+)
+
+# ── Event Loop ────────────────────────────────────────────────
+LOOP_LAG_SECONDS = Histogram(
+    "whitedwarf_event_loop_lag_seconds", "How late the event loop ran a timer", buckets=LOOP_LAG_BUCKETS,
+)
+
+
+async def monitor_loop_lag(interval: float):
+    """Sleep `interval` seconds at a time and record how late each wake-up is."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        LOOP_LAG_SECONDS.observe(max(0.0, loop.time() - start - interval))
+
+
+def record_output(path: Path):
+    """Count a file just written to OUTPUTS_DIR, labelled by extension."""
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return
+    OUTPUT_BYTES.labels(path.suffix.lstrip(".").lower() or "other").inc(size)
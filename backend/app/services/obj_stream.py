@@ -0,0 +1,205 @@
+"""
+White Dwarf — Streaming OBJ Statistics
+Single-pass, chunked reader that computes the quantities physics needs
+(bounds, volume, center of mass, bottom footprint) from an OBJ file
+without building a Trimesh, so multi-million-face meshes are analyzed in
+bounded memory.
+"""
+import re
+import tempfile
+import logging
+from pathlib import Path
+from typing import Iterator, NamedTuple, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_VERTEX_RE = re.compile(rb"^v[ \t]+([^\r\n]*)", re.M)
+_FACE_RE = re.compile(rb"^f[ \t]+([^\r\n]*)", re.M)
+# Texture/normal references in face corners ("7/3/7", "7//7")
+_CORNER_SUFFIX_RE = re.compile(rb"/[^\s]*")
+
+# Rows of the vertex memmap visited at a time in the bounds/footprint passes
+_ROW_BLOCK = 1 << 18
+
+
+class ObjStats(NamedTuple):
+    """Geometry summary of the referenced part of an OBJ file."""
+    bounds: np.ndarray       # (2, 3) min/max corners
+    volume: float
+    center_mass: np.ndarray  # (3,)
+    base_area: float         # XZ hull area of the vertices in the bottom `base_fraction`
+    vertex_count: int
+    face_count: int
+
+
+def _blocks(path: Path, chunk_bytes: int) -> Iterator[bytes]:
+    """Successive byte blocks of the file, each ending on a line boundary."""
+    carry = b""
+    with open(path, "rb") as fh:
+        while True:
+            data = fh.read(chunk_bytes)
+            if not data:
+                break
+            data = carry + data
+            cut = data.rfind(b"\n") + 1
+            if cut == 0:
+                carry = data
+                continue
+            carry = data[cut:]
+            yield data[:cut]
+    if carry:
+        yield carry + b"\n"
+
+
+def _parse_vertices(lines: list) -> np.ndarray:
+    values = np.fromstring(b"\n".join(lines).decode(), dtype=np.float64, sep=" ")
+    if len(values) == 3 * len(lines):
+        return values.reshape(-1, 3)
+    # Optional w or per-vertex colors on some lines: keep x y z
+    return np.array([line.split()[:3] for line in lines], dtype=np.float64).reshape(-1, 3)
+
+
+def _parse_faces(lines: list, vertex_count: int) -> np.ndarray:
+    """Zero-based triangles; polygons are fan-triangulated like trimesh does."""
+    text = _CORNER_SUFFIX_RE.sub(b"", b"\n".join(lines))
+    values = np.fromstring(text.decode(), dtype=np.int64, sep=" ")
+    if len(values) == 3 * len(lines) and (values > 0).all():
+        return values.reshape(-1, 3) - 1
+
+    triangles = []
+    for line in _CORNER_SUFFIX_RE.sub(b"", b"\n".join(lines)).split(b"\n"):
+        corners = [int(token) for token in line.split()]
+        # Negative indices count back from the vertices read so far
+        corners = [c - 1 if c > 0 else vertex_count + c for c in corners]
+        triangles.extend((corners[0], corners[i], corners[i + 1]) for i in range(1, len(corners) - 1))
+    return np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+
+
+def _mass_terms(triangles: np.ndarray) -> Tuple[float, np.ndarray]:
+    """
+    Signed-volume and first-moment integrals of a batch of triangles.
+
+    These are the divergence-theorem terms trimesh.triangles.mass_properties
+    sums (equal to the signed tetrahedra-to-origin decomposition on closed
+    meshes), so totals accumulated over chunks match its result.
+    """
+    v0, v1, v2 = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    crosses = np.cross(v1 - v0, v2 - v0)
+    f1 = v0 + v1 + v2
+    f2 = v0 ** 2 + v1 ** 2 + v0 * v1 + v2 * f1
+    return float((crosses[:, 0] * f1[:, 0]).sum()), (crosses * f2).sum(axis=0)
+
+
+def _hull_points(points: np.ndarray) -> np.ndarray:
+    """Smallest subset of 2D points with the same convex hull."""
+    if len(points) < 3:
+        return points
+    from scipy.spatial import ConvexHull
+    try:
+        return points[ConvexHull(points).vertices]
+    except Exception:
+        # Collinear or coincident: the lexicographic extremes span the set
+        order = np.lexsort((points[:, 1], points[:, 0]))
+        return points[[order[0], order[-1]]]
+
+
+def obj_stats(obj_path: str, chunk_bytes: int = 4 << 20, base_fraction: float = 0.1) -> ObjStats:
+    """
+    Stream an OBJ file and summarize its geometry.
+
+    Vertex positions are spilled to a temporary memory-mapped file as they
+    are read; faces (which may only reference earlier vertices) are
+    resolved against it chunk by chunk, accumulating volume integrals and
+    marking referenced vertices. Bounds and the bottom footprint then come
+    from block-wise passes over the memmap, keeping only the running hull
+    of footprint points. Unreferenced vertices are ignored, as trimesh
+    drops them on load.
+
+    Raises:
+        ValueError: if the file has no faces.
+    """
+    volume_sum = 0.0
+    moment_sum = np.zeros(3)
+    vertex_count = face_count = 0
+
+    with tempfile.TemporaryDirectory(prefix="wd-obj-") as tmp:
+        vertices_file = Path(tmp) / "vertices.f64"
+        referenced_file = Path(tmp) / "referenced.u8"
+        with open(vertices_file, "wb") as vfh, open(referenced_file, "wb") as rfh:
+            for block in _blocks(Path(obj_path), chunk_bytes):
+                vertex_lines = _VERTEX_RE.findall(block)
+                if vertex_lines:
+                    # Faces in a block can reference vertices earlier in the same block
+                    vertices = _parse_vertices(vertex_lines)
+                    vfh.write(vertices.tobytes())
+                    rfh.write(bytes(len(vertices)))
+                    vertex_count += len(vertices)
+
+                face_lines = _FACE_RE.findall(block)
+                if not face_lines or not vertex_count:
+                    continue
+                vfh.flush()
+                rfh.flush()
+                faces = _parse_faces(face_lines, vertex_count)
+                if len(faces) and (faces.min() < 0 or faces.max() >= vertex_count):
+                    raise ValueError(f"Face references a vertex outside 1..{vertex_count}")
+
+                positions = np.memmap(vertices_file, dtype=np.float64, mode="r", shape=(vertex_count, 3))
+                volume, moment = _mass_terms(positions[faces])
+                volume_sum += volume
+                moment_sum += moment
+                face_count += len(faces)
+
+                referenced = np.memmap(referenced_file, dtype=np.uint8, mode="r+", shape=(vertex_count,))
+                referenced[faces.ravel()] = 1
+                referenced.flush()
+                del positions, referenced
+
+        if face_count == 0:
+            raise ValueError("No valid meshes found in the file")
+
+        positions = np.memmap(vertices_file, dtype=np.float64, mode="r", shape=(vertex_count, 3))
+        referenced = np.memmap(referenced_file, dtype=np.uint8, mode="r", shape=(vertex_count,))
+
+        lo = np.full(3, np.inf)
+        hi = np.full(3, -np.inf)
+        for start in range(0, vertex_count, _ROW_BLOCK):
+            used = positions[start:start + _ROW_BLOCK][referenced[start:start + _ROW_BLOCK].astype(bool)]
+            if len(used):
+                lo = np.minimum(lo, used.min(axis=0))
+                hi = np.maximum(hi, used.max(axis=0))
+
+        threshold = lo[1] + (hi[1] - lo[1]) * base_fraction
+        hull = np.empty((0, 2))
+        bottom_count = 0
+        for start in range(0, vertex_count, _ROW_BLOCK):
+            used = positions[start:start + _ROW_BLOCK][referenced[start:start + _ROW_BLOCK].astype(bool)]
+            bottom = used[used[:, 1] <= threshold][:, [0, 2]]
+            if len(bottom):
+                bottom_count += len(bottom)
+                hull = _hull_points(np.vstack([hull, bottom]))
+        del positions, referenced
+
+    base_area = 0.0
+    if bottom_count > 2:
+        try:
+            from scipy.spatial import ConvexHull
+            base_area = float(ConvexHull(hull).volume)  # In 2D, ConvexHull.volume = area
+        except Exception:
+            base_area = float((hull.max(axis=0) - hull.min(axis=0)).prod())
+
+    volume = volume_sum / 6.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        center_mass = (moment_sum / 24.0) / volume
+
+    logger.info(f"Streamed OBJ stats: {Path(obj_path).name} ({vertex_count} vertices, {face_count} faces)")
+    return ObjStats(
+        bounds=np.array([lo, hi]),
+        volume=volume,
+        center_mass=center_mass,
+        base_area=base_area,
+        vertex_count=vertex_count,
+        face_count=face_count,
+    )
@@ -0,0 +1,65 @@
+"""
+White Dwarf — Batch Physics
+Fans stability analysis of many meshes out across the geometry process
+pool and yields each result as soon as it finishes.
+"""
+import asyncio
+import logging
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple
+
+from .executor import GeometryExecutor, ExecutorBusyError, geometry_executor
+from .physics_engine import analyze_stability
+
+logger = logging.getLogger(__name__)
+
+# Attempts per mesh when other traffic has filled the pool's wait queue
+_BUSY_ATTEMPTS = 3
+
+
+async def _analyze(executor: GeometryExecutor, path: Path) -> dict:
+    for attempt in range(_BUSY_ATTEMPTS):
+        try:
+            return await executor.run(analyze_stability, str(path))
+        except ExecutorBusyError as e:
+            if attempt == _BUSY_ATTEMPTS - 1:
+                raise
+            await asyncio.sleep(e.retry_after)
+
+
+async def analyze_batch(
+    paths: List[Path],
+    executor: GeometryExecutor = geometry_executor,
+    concurrency: Optional[int] = None,
+) -> AsyncIterator[Tuple[int, Optional[dict], Optional[Exception]]]:
+    """
+    Analyze `paths` in parallel, yielding (index, result, error) in
+    completion order.
+
+    At most `concurrency` meshes (default: one per worker) are submitted
+    at once, so a large batch keeps every worker busy without flooding
+    the shared wait queue other requests rely on. Closing the iterator
+    early cancels the meshes not yet started.
+    """
+    semaphore = asyncio.Semaphore(concurrency or executor.workers)
+    finished: asyncio.Queue = asyncio.Queue()
+
+    async def one(index: int, path: Path):
+        async with semaphore:
+            try:
+                result = await _analyze(executor, path)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                finished.put_nowait((index, None, e))
+            else:
+                finished.put_nowait((index, result, None))
+
+    tasks = [asyncio.create_task(one(index, path)) for index, path in enumerate(paths)]
+    try:
+        for _ in range(len(tasks)):
+            yield await finished.get()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -6,10 +6,22 @@ import trimesh
 import numpy as np
 import logging
 from pathlib import Path
-from typing import Dict, Any
+from statistics import NormalDist
+from typing import Dict, Any, Optional, Tuple
+
+from ..config import (
+    PHYSICS_STREAM_MIN_BYTES, PHYSICS_STREAM_CHUNK_BYTES,
+    PHYSICS_FAST_SAMPLES, PHYSICS_FAST_CONFIDENCE,
+)
+from .mesh_cache import mesh_cache
+from .mesh_sidecar import load_sidecar
+from .obj_stream import obj_stats
 
 logger = logging.getLogger(__name__)
 
+# Vertices within this fraction of the height from the bottom form the base
+BASE_FRACTION = 0.1
+
 
 def analyze_stability(obj_path: str) -> Dict[str, Any]:
     """
@@ -27,44 +39,39 @@ def analyze_stability(obj_path: str) -> Dict[str, Any]:
     if not path.exists():
         raise FileNotFoundError(f"Mesh file not found: {obj_path}")
 
+    if _should_stream(path):
+        # Large OBJ without a sidecar: summarize it in bounded memory
+        # instead of parsing the whole mesh into a Trimesh
+        logger.info(f"Streaming mesh for physics analysis: {obj_path}")
+        stats = obj_stats(str(path), chunk_bytes=PHYSICS_STREAM_CHUNK_BYTES, base_fraction=BASE_FRACTION)
+        return _stability_result(stats.bounds, stats.center_mass, stats.base_area)
+
     logger.info(f"Loading mesh for physics analysis: {obj_path}")
 
-    # Load mesh — handle scenes with multiple meshes
-    loaded = trimesh.load(str(path), force='mesh')
-
-    if isinstance(loaded, trimesh.Scene):
-        # Concatenate all meshes in the scene
-        meshes = [g for g in loaded.geometry.values() if isinstance(g, trimesh.Trimesh)]
-        if not meshes:
-            raise ValueError("No valid meshes found in the file")
-        mesh = trimesh.util.concatenate(meshes)
-    elif isinstance(loaded, trimesh.Trimesh):
-        mesh = loaded
-    else:
-        raise ValueError(f"Unsupported mesh type: {type(loaded)}")
+    # Flat geometry: memory-mapped sidecar when present, else the parsed
+    # mesh from the shared cache (scenes flattened into one mesh)
+    arrays = mesh_cache.get_arrays(str(path))
+    vertices = np.asarray(arrays.vertices, dtype=np.float64)
+    if len(arrays.faces) == 0:
+        raise ValueError("No valid meshes found in the file")
 
     # ── Bounding Box ──────────────────────────────────────
-    bbox = mesh.bounding_box.extents  # [width, height, depth]
-    height = bbox[1] if len(bbox) > 1 else max(bbox)
+    bounds = arrays.bounds  # [[min_x, min_y, min_z], [max_x, max_y, max_z]]
 
     # ── Center of Mass ────────────────────────────────────
-    com = mesh.center_mass
-    bounds = mesh.bounds  # [[min_x, min_y, min_z], [max_x, max_y, max_z]]
-    min_y = bounds[0][1]
-    max_y = bounds[1][1]
-
-    # Normalize center of mass Y to 0 (bottom) - 1 (top)
-    if max_y - min_y > 0:
-        com_y_normalized = (com[1] - min_y) / (max_y - min_y)
-    else:
-        com_y_normalized = 0.5
+    # Same integration trimesh uses for Trimesh.center_mass
+    com = trimesh.triangles.mass_properties(
+        triangles=vertices[arrays.faces],
+        skip_inertia=True,
+    ).center_mass
 
     # ── Base Support Analysis ─────────────────────────────
     # Look at vertices near the bottom 10% of the mesh
-    y_range = max_y - min_y
-    bottom_threshold = min_y + y_range * 0.1
+    min_y = bounds[0][1]
+    max_y = bounds[1][1]
+    bottom_threshold = min_y + (max_y - min_y) * BASE_FRACTION
 
-    bottom_vertices = mesh.vertices[mesh.vertices[:, 1] <= bottom_threshold]
+    bottom_vertices = vertices[vertices[:, 1] <= bottom_threshold]
 
     if len(bottom_vertices) > 2:
         # Base footprint: convex hull area of bottom vertices projected to XZ plane
@@ -79,12 +86,50 @@ def analyze_stability(obj_path: str) -> Dict[str, Any]:
     else:
         base_area = 0.0
 
+    return _stability_result(bounds, com, base_area)
+
+
+def _should_stream(path: Path) -> bool:
+    """Stream large OBJ files unless a binary sidecar already has the arrays."""
+    if path.suffix.lower() != ".obj" or path.stat().st_size < PHYSICS_STREAM_MIN_BYTES:
+        return False
+    return load_sidecar(str(path)) is None
+
+
+def _stability_result(bounds: np.ndarray, com: np.ndarray, base_area: float) -> Dict[str, Any]:
+    """Normalize the geometry summary and turn it into a stability verdict."""
+    bbox = bounds[1] - bounds[0]  # [width, height, depth]
+    min_y = bounds[0][1]
+    max_y = bounds[1][1]
+
+    # Normalize center of mass Y to 0 (bottom) - 1 (top)
+    if max_y - min_y > 0:
+        com_y_normalized = (com[1] - min_y) / (max_y - min_y)
+    else:
+        com_y_normalized = 0.5
+
     # Total footprint: bounding box XZ area
     total_footprint = bbox[0] * bbox[2] if len(bbox) > 2 else bbox[0] ** 2
     base_support_ratio = base_area / total_footprint if total_footprint > 0 else 0.0
     base_support_ratio = min(base_support_ratio, 1.0)
 
     # ── Stability Verdict ─────────────────────────────────
+    is_stable, verdict = _verdict(com_y_normalized, base_support_ratio)
+
+    result = {
+        "is_stable": bool(is_stable),
+        "center_of_mass_y": float(com_y_normalized),
+        "base_support_ratio": float(base_support_ratio),
+        "bounding_box": [float(x) for x in bbox[:3]],
+        "verdict": verdict,
+    }
+
+    logger.info(f"Physics result: {verdict} (CoM_Y={com_y_normalized:.3f}, base={base_support_ratio:.2f})")
+    return result
+
+
+def _verdict(com_y_normalized: float, base_support_ratio: float) -> Tuple[bool, str]:
+    """Stability flag and human-readable verdict for normalized metrics."""
     # Heuristic: stable if COM is in lower 60% AND base ratio > 0.3
     is_stable = com_y_normalized < 0.6 and base_support_ratio > 0.3
 
@@ -102,14 +147,146 @@ def analyze_stability(obj_path: str) -> Dict[str, Any]:
             verdict = "Narrow Base — Support area is too small for stability"
         else:
             verdict = "Unstable — Consider widening the base or lowering the center of mass"
+    return is_stable, verdict
 
-    result = {
+
+def _hull_area(points_2d: np.ndarray) -> float:
+    if len(points_2d) <= 2:
+        return 0.0
+    try:
+        from scipy.spatial import ConvexHull
+        return float(ConvexHull(points_2d).volume)
+    except Exception:
+        return float((points_2d.max(axis=0) - points_2d.min(axis=0)).prod())
+
+
+def analyze_stability_fast(
+    obj_path: str,
+    samples: Optional[int] = None,
+    confidence: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Approximate stability analysis in bounded time, with error estimates.
+
+    Samples `samples` faces and vertices instead of touching the whole mesh:
+
+    - center of mass: ratio estimate of the same volume/moment surface
+      integrals the exact path sums, with a delta-method confidence interval
+    - base support: convex hull of the sampled bottom vertices, a lower
+      bound on the true hull; the interval's upper end extrapolates how
+      the sample hull grew from half the sample
+
+    Samples only from the memory-mapped binary sidecar: without one the
+    whole file would have to be parsed first, so `analyze_stability` runs
+    instead and `mode` reports "exact". It also runs when the mesh is small
+    enough to analyze exactly, or when the verdict could change anywhere
+    inside the confidence intervals (`escalated` is then True).
+
+    Returns:
+        The `analyze_stability` keys plus mode, samples, escalated and
+        center_of_mass_y_ci / base_support_ratio_ci ([low, high], None when exact).
+    """
+    samples = samples or PHYSICS_FAST_SAMPLES
+    z = NormalDist().inv_cdf(0.5 + (confidence or PHYSICS_FAST_CONFIDENCE) / 2)
+
+    path = Path(obj_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Mesh file not found: {obj_path}")
+
+    def exact(escalated: bool) -> Dict[str, Any]:
+        result = analyze_stability(obj_path)
+        result.update(mode="exact", samples=None, escalated=escalated,
+                      center_of_mass_y_ci=None, base_support_ratio_ci=None)
+        return result
+
+    arrays = load_sidecar(str(path))
+    if arrays is None:
+        logger.info(f"No mesh sidecar, fast physics unavailable: {obj_path}")
+        return exact(escalated=False)
+
+    faces, vertices = arrays.faces, arrays.vertices
+    if len(faces) == 0:
+        raise ValueError("No valid meshes found in the file")
+    if len(faces) <= samples:
+        return exact(escalated=False)
+
+    # Fixed seed: repeated requests for one mesh give one answer
+    rng = np.random.default_rng(0)
+    bounds = arrays.bounds
+    bbox = bounds[1] - bounds[0]
+    min_y, max_y = bounds[0][1], bounds[1][1]
+    height = max_y - min_y
+
+    # ── Center of Mass ────────────────────────────────────
+    face_count = len(faces)
+    picked = np.sort(rng.choice(face_count, size=samples, replace=False))
+    triangles = np.asarray(vertices[np.asarray(faces[picked])], dtype=np.float64)
+    v0, v1, v2 = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    crosses = np.cross(v1 - v0, v2 - v0)
+    f1 = v0 + v1 + v2
+    f2 = v0 ** 2 + v1 ** 2 + v0 * v1 + v2 * f1
+    volume_terms = crosses[:, 0] * f1[:, 0] / 6.0
+    moment_terms = crosses[:, 1] * f2[:, 1] / 24.0
+
+    mean_volume = volume_terms.mean()
+    com_y = moment_terms.mean() / mean_volume
+    residual = moment_terms - com_y * volume_terms
+    fpc = 1.0 - samples / face_count
+    com_se = np.sqrt(fpc * residual.var(ddof=1) / samples) / abs(mean_volume)
+
+    if height > 0:
+        com_y_normalized = (com_y - min_y) / height
+        com_half_width = z * com_se / height
+    else:
+        com_y_normalized, com_half_width = 0.5, 0.0
+
+    # ── Base Support Analysis ─────────────────────────────
+    vertex_count = len(vertices)
+    if vertex_count > samples:
+        chosen = np.sort(rng.choice(vertex_count, size=samples, replace=False))
+        points = np.asarray(vertices[chosen], dtype=np.float64)
+    else:
+        points = np.asarray(vertices, dtype=np.float64)
+    bottom = points[points[:, 1] <= min_y + height * BASE_FRACTION][:, [0, 2]]
+
+    base_area = _hull_area(bottom)
+    half_area = (_hull_area(bottom[::2]) + _hull_area(bottom[1::2])) / 2
+    # Sample hulls converge roughly as n^(-2/3): extrapolate the remaining gap
+    shortfall = max(0.0, base_area - half_area) / (2 ** (2 / 3) - 1) if vertex_count > samples else 0.0
+
+    total_footprint = bbox[0] * bbox[2]
+    if total_footprint > 0:
+        # Report the sample hull itself: it never overstates the support
+        base_support_ratio = min(base_area / total_footprint, 1.0)
+        base_ci = [base_support_ratio, min((base_area + 2 * shortfall) / total_footprint, 1.0)]
+    else:
+        base_support_ratio, base_ci = 0.0, [0.0, 0.0]
+
+    com_ci = [com_y_normalized - com_half_width, com_y_normalized + com_half_width]
+    if not np.isfinite(com_ci).all():
+        return exact(escalated=True)
+
+    # Verdict regions are bounded by axis-aligned thresholds, so the
+    # verdict is unambiguous iff all four corners of the interval box agree
+    corners = {_verdict(c, b)[1] for c in com_ci for b in base_ci}
+    if len(corners) > 1:
+        logger.info(f"Fast physics near a threshold, escalating to exact: {obj_path}")
+        return exact(escalated=True)
+
+    is_stable, verdict = _verdict(com_y_normalized, base_support_ratio)
+    logger.info(
+        f"Fast physics result: {verdict} (CoM_Y={com_y_normalized:.3f}±{com_half_width:.3f}, "
+        f"base={base_support_ratio:.2f} in [{base_ci[0]:.2f}, {base_ci[1]:.2f}])"
+    )
+    return {
         "is_stable": bool(is_stable),
         "center_of_mass_y": float(com_y_normalized),
         "base_support_ratio": float(base_support_ratio),
         "bounding_box": [float(x) for x in bbox[:3]],
         "verdict": verdict,
+        "mode": "fast",
+        "samples": int(samples),
+        "escalated": False,
+        "center_of_mass_y_ci": [float(x) for x in com_ci],
+        "base_support_ratio_ci": [float(x) for x in base_ci],
     }
-
-    logger.info(f"Physics result: {verdict} (CoM_Y={com_y_normalized:.3f}, base={base_support_ratio:.2f})")
-    return result
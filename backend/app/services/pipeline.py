@@ -0,0 +1,249 @@
+"""
+White Dwarf — Pipeline Stages
+Generate and texture workflows shared by the synchronous routers and the
+background job workers.
+"""
+import time
+import base64
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from ..config import (
+    MESH_MODEL_ID, TEXTURE_MODEL_ID, OUTPUTS_DIR,
+    DEPTH_MAP_RESOLUTION, DEPTH_MAP_SUPERSAMPLE,
+)
+from .clients import providers
+from .download import download_file
+from .static_files import schedule_precompress
+from .executor import geometry_executor
+from .mesh_cache import write_mesh_sidecar, geometry_digest
+from .depth_renderer import render_depth_map
+from .mesh_sidecar import sidecar_paths
+from .result_cache import mesh_results, texture_results, cache_key, normalize_prompt, sha256_file
+from .single_flight import mesh_flights, texture_flights
+from .metrics import STAGE_SECONDS, record_output
+from .tracing import record_span, span
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimings:
+    """
+    Wall-clock seconds per named pipeline stage, also fed to the stage
+    histogram and the request's Server-Timing spans.
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self.current: Optional[str] = None
+
+    @contextmanager
+    def stage(self, name: str):
+        self.current = name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings[name] = round(elapsed, 4)
+            self.current = None
+            STAGE_SECONDS.labels(name).observe(elapsed)
+            record_span(name, elapsed)
+
+    def record(self, name: str, seconds: float):
+        self.timings[name] = round(seconds, 4)
+        STAGE_SECONDS.labels(name).observe(seconds)
+        record_span(name, seconds)
+
+
+def _reference_image_digest(image_url: Optional[str]) -> Optional[str]:
+    """SHA-256 of a locally stored reference image, or of a remote URL."""
+    if not image_url:
+        return None
+    if image_url.startswith("/outputs/"):
+        local = OUTPUTS_DIR / image_url.split("/")[-1]
+        if local.exists():
+            return sha256_file(local)
+    return cache_key(url=image_url)
+
+
+def mesh_cache_key(prompt: str, image_url: Optional[str] = None) -> str:
+    """Content key for a generation request: prompt, reference image and model."""
+    return cache_key(
+        prompt=normalize_prompt(prompt),
+        image_sha256=_reference_image_digest(image_url),
+        model=MESH_MODEL_ID,
+    )
+
+
+async def generate_mesh_asset(
+    prompt: str,
+    job_id: str,
+    image_url: Optional[str] = None,
+    timings: Optional[StageTimings] = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    Generate a mesh via the provider, download it to OUTPUTS_DIR and write
+    its binary sidecar. Identical earlier requests are served from the
+    result cache unless `use_cache` is False, and identical concurrent
+    requests share one prediction.
+
+    Returns:
+        dict with mesh_url, bytes, sha256 and cached.
+    """
+    timings = timings or StageTimings()
+
+    key = mesh_cache_key(prompt, image_url)
+
+    def lookup() -> Optional[Dict[str, Any]]:
+        hit = mesh_results.get(key)
+        if hit is None:
+            return None
+        return {"mesh_url": hit["mesh_url"], "bytes": hit["bytes"], "sha256": hit.get("sha256"), "cached": True}
+
+    if use_cache:
+        with timings.stage("cache_lookup"):
+            hit = lookup()
+        if hit is not None:
+            logger.info(f"Mesh cache hit: {hit['mesh_url']}")
+            return hit
+    else:
+        mesh_results.note_bypass()
+
+    async def produce() -> Dict[str, Any]:
+        # Mesh generation on the fastest available provider
+        with timings.stage("provider"):
+            mesh_remote_url = await providers.generate_mesh(prompt=prompt, image_url=image_url)
+
+        # Download the generated mesh to local outputs folder
+        obj_filename = f"{job_id}_mesh.obj"
+        obj_path = OUTPUTS_DIR / obj_filename
+
+        with timings.stage("download"):
+            download = await download_file(mesh_remote_url, obj_path)
+
+        logger.info(f"Mesh saved: {obj_filename} ({download.bytes} bytes, sha256 {download.sha256[:12]})")
+        # The viewer fetches the OBJ right away; have its gzip/brotli copies ready
+        schedule_precompress(obj_path)
+
+        # Parse once now and persist a memory-mappable binary sidecar so
+        # physics, depth rendering and export never re-parse the OBJ text
+        with timings.stage("sidecar"):
+            try:
+                await geometry_executor.run(write_mesh_sidecar, str(obj_path))
+            except Exception as e:
+                logger.warning(f"Mesh sidecar not written for {obj_filename}: {e}")
+
+        result = {"mesh_url": f"/outputs/{obj_filename}", "bytes": download.bytes, "sha256": download.sha256}
+        files = [obj_filename] + [p.name for p in sidecar_paths(str(obj_path))]
+        mesh_results.put(key, files, result)
+        return {**result, "cached": False}
+
+    # Identical requests already in flight share one prediction
+    start = time.perf_counter()
+    result, shared = await mesh_flights.do(key, produce, lookup if use_cache else None)
+    if shared:
+        timings.record("coalesced", time.perf_counter() - start)
+    return result
+
+
+async def texture_mesh_asset(
+    mesh_path: Path,
+    mesh_url: str,
+    material_prompt: str,
+    job_id: str,
+    timings: Optional[StageTimings] = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    Render a depth map for the mesh, generate a texture with ControlNet
+    Depth and download it to OUTPUTS_DIR. The same geometry with the same
+    material is served from the result cache, skipping both the local
+    render and the cloud call, unless `use_cache` is False; concurrent
+    identical requests share one render and prediction.
+
+    Returns:
+        dict with textured_model_url, texture_image_url, depth_map_url and cached.
+    """
+    timings = timings or StageTimings()
+
+    def lookup() -> Optional[Dict[str, Any]]:
+        hit = texture_results.get(key)
+        if hit is None:
+            return None
+        return {"texture_image_url": hit["texture_image_url"], "depth_map_url": hit["depth_map_url"], "cached": True}
+
+    with timings.stage("cache_lookup"):
+        digest = await geometry_executor.run(geometry_digest, str(mesh_path))
+        key = cache_key(
+            geometry=digest,
+            material=normalize_prompt(material_prompt),
+            model=TEXTURE_MODEL_ID,
+            depth={"resolution": DEPTH_MAP_RESOLUTION, "supersample": DEPTH_MAP_SUPERSAMPLE},
+        )
+        hit = lookup() if use_cache else None
+    if hit is not None:
+        logger.info(f"Texture cache hit: {hit['texture_image_url']}")
+        return {"textured_model_url": mesh_url, **hit}
+    if not use_cache:
+        texture_results.note_bypass()
+
+    async def produce() -> Dict[str, Any]:
+        # 1. Render depth map from the mesh
+        with timings.stage("depth_render"):
+            depth_bytes = await geometry_executor.run(
+                render_depth_map,
+                str(mesh_path),
+                DEPTH_MAP_RESOLUTION,
+                DEPTH_MAP_SUPERSAMPLE,
+            )
+        depth_filename = f"{job_id}_depth.png"
+        depth_path = OUTPUTS_DIR / depth_filename
+        depth_path.write_bytes(depth_bytes)
+        record_output(depth_path)
+        logger.info(f"Depth map rendered: {depth_filename}")
+
+        # 2. Upload depth map — For Replicate, we need a public URL.
+        #    Use a data URI or serve from our static endpoint.
+        with span("depth_encode"):
+            depth_b64 = base64.b64encode(depth_bytes).decode()
+            depth_data_url = f"data:image/png;base64,{depth_b64}"
+
+        # 3. Call SDXL + ControlNet for texture generation
+        texture_prompt = f"Photorealistic texture render, {material_prompt}, high quality, studio lighting, 4K detail"
+
+        with timings.stage("provider"):
+            texture_url = await providers.generate_texture(
+                prompt=texture_prompt,
+                depth_image_url=depth_data_url,
+            )
+
+        # 4. Download texture image
+        texture_filename = f"{job_id}_texture.png"
+        texture_path = OUTPUTS_DIR / texture_filename
+
+        with timings.stage("download"):
+            download = await download_file(texture_url, texture_path)
+
+        logger.info(f"Texture saved: {texture_filename} ({download.bytes} bytes)")
+
+        urls = {
+            "texture_image_url": f"/outputs/{texture_filename}",
+            "depth_map_url": f"/outputs/{depth_filename}",
+        }
+        texture_results.put(key, [texture_filename, depth_filename], urls)
+        return {**urls, "cached": False}
+
+    # The same geometry + material already in flight shares one prediction
+    start = time.perf_counter()
+    result, shared = await texture_flights.do(key, produce, lookup if use_cache else None)
+    if shared:
+        timings.record("coalesced", time.perf_counter() - start)
+
+    return {
+        "textured_model_url": mesh_url,  # Original mesh + new texture
+        **result,
+    }
@@ -0,0 +1,65 @@
+"""
+White Dwarf — Sampling Profiler
+Low-overhead stack sampler for the event-loop thread, writing collapsed
+("folded") stacks that flamegraph.pl, speedscope and inferno read directly.
+"""
+import os
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of one thread every `interval` seconds from a daemon
+    thread.
+
+    Profiling the event-loop thread covers everything it runs while the
+    profile is open, including other requests interleaved with the one
+    being profiled. Work inside geometry worker processes is not sampled;
+    it shows up as time awaiting the executor.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+    def save(self, path: Path) -> Path:
+        """Write `stack count` lines, root frame first."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as fh:
+            for stack, count in self.stacks.most_common():
+                fh.write(f"{stack} {count}\n")
+        return path
@@ -0,0 +1,347 @@
+"""
+White Dwarf — Provider Router
+Sends each mesh/texture prediction to whichever configured provider
+(Replicate, RunPod) currently has the lowest expected latency, learned from
+rolling queue and run times, and optionally hedges predictions that sit in
+a provider queue for too long.
+"""
+import time
+import asyncio
+import logging
+import statistics
+import contextvars
+from collections import deque
+from contextlib import AsyncExitStack
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .completion import detach
+from .admission import Admission, ProviderBusyError
+from .metrics import PROVIDER_QUEUE_SECONDS, PROVIDER_RUN_SECONDS, PROVIDER_INFLIGHT, PROVIDER_PREDICTIONS
+from .tracing import record_span
+
+logger = logging.getLogger(__name__)
+
+# Task kinds and the client method each maps to
+MESH = "mesh"
+TEXTURE = "texture"
+_METHODS = {MESH: "generate_mesh", TEXTURE: "generate_texture"}
+
+# Provider name → semaphore of the background job being run (set by the job
+# workers); each prediction holds the one of the provider it is sent to
+job_slots: contextvars.ContextVar[Optional[Callable[[str], asyncio.Semaphore]]] = contextvars.ContextVar(
+    "white_dwarf_job_slots", default=None
+)
+
+
+class Provider:
+    """
+    One inference backend as seen by the router.
+
+    `client` exposes `generate_mesh(model, prompt, image_url, on_start=)`
+    and `generate_texture(model, prompt, depth_image_url, on_start=)`
+    (ReplicateClient and RunPodClient both do); `models` maps a task kind
+    to the model version / endpoint id serving it on this provider.
+    `configured` says whether credentials are set at all; `enabled` whether
+    the provider takes work right now (e.g. its circuit is not open).
+    """
+
+    def __init__(self, name: str, client: Any, models: Dict[str, str], enabled: Callable[[], bool],
+                 configured: Callable[[], bool] = lambda: True):
+        self.name = name
+        self.client = client
+        self.models = models
+        self._enabled = enabled
+        self._configured = configured
+
+    def configured_for(self, kind: str) -> bool:
+        return bool(self.models.get(kind)) and self._configured()
+
+    def serves(self, kind: str) -> bool:
+        return self.configured_for(kind) and self._enabled()
+
+
+class LatencyStats:
+    """Rolling queue/run latency of one provider model plus its in-queue predictions."""
+
+    def __init__(self, window: int):
+        self.queue: Deque[float] = deque(maxlen=window)
+        self.run: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)  # True for a failed prediction
+        self.waiting: Dict[int, float] = {}  # attempt id → submit time, until it starts
+        self.started = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.busy = 0
+        self.cancelled = 0
+
+    def expected(self, now: float, default_run: float = 0.0) -> float:
+        """
+        Expected seconds to a result; unmeasured providers score 0 so they
+        get tried. Without run samples, `default_run` (another provider's
+        run time for the same task) stands in.
+        """
+        queue = statistics.median(self.queue) if self.queue else 0.0
+        # Predictions still queued right now bound the current queue time from below
+        if self.waiting:
+            queue = max(queue, now - min(self.waiting.values()))
+        run = statistics.median(self.run) if self.run else default_run
+        return queue + run
+
+    def failure_rate(self) -> float:
+        return sum(self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def score(self, now: float, default_run: float, failure_penalty: float) -> float:
+        """Ranking key: expected latency plus a penalty for recent failures."""
+        return self.expected(now, default_run) + self.failure_rate() * failure_penalty
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        def p50(samples: Deque[float]) -> Optional[float]:
+            return round(statistics.median(samples), 3) if samples else None
+
+        return {
+            "queue_p50_s": p50(self.queue),
+            "run_p50_s": p50(self.run),
+            "expected_s": round(self.expected(now), 3),
+            "failure_rate": round(self.failure_rate(), 3),
+            "samples": len(self.run),
+            "queued_now": len(self.waiting),
+            "started": self.started,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "busy": self.busy,
+            "cancelled": self.cancelled,
+        }
+
+
+class _Attempt:
+    """One prediction on one provider, reporting start/finish to the race."""
+
+    _ids = 0
+
+    def __init__(self, router: "ProviderRouter", provider: Provider, kind: str,
+                 kwargs: Dict[str, Any], events: asyncio.Queue, hedge: bool = False):
+        _Attempt._ids += 1
+        self.id = _Attempt._ids
+        self.provider = provider
+        self.kind = kind
+        self.model = provider.models[kind]
+        self.stats = router.stats_for(provider.name, self.model)
+        self.gate = router.admission.gate(provider.name, self.model) if router.admission else None
+        slots = job_slots.get()
+        self.job_slot = slots(provider.name) if slots else None
+        self.events = events
+        self.submitted = time.monotonic()
+        self.started_at: Optional[float] = None
+        # Set when another provider started first and this attempt is dropped
+        self.lost = False
+        # Created by the hedge timer rather than as the first try or a failover
+        self.hedge = hedge
+        self.stats.waiting[self.id] = self.submitted
+
+        method = getattr(provider.client, _METHODS[kind])
+        self.task = asyncio.create_task(self._run(method, kwargs))
+
+    def _on_start(self):
+        if self.started_at is not None:
+            return
+        self.started_at = time.monotonic()
+        self.stats.waiting.pop(self.id, None)
+        queued = self.started_at - self.submitted
+        self.stats.queue.append(queued)
+        PROVIDER_QUEUE_SECONDS.labels(self.provider.name, self.kind).observe(queued)
+        record_span(f"{self.provider.name}_queue", queued)
+        self.stats.started += 1
+        self.events.put_nowait((self, "started"))
+
+    async def _run(self, method: Callable, kwargs: Dict[str, Any]) -> str:
+        inflight = PROVIDER_INFLIGHT.labels(self.provider.name, self.kind)
+        inflight.inc()
+        try:
+            # Time spent waiting for a job slot or admission counts as provider queue time
+            async with AsyncExitStack() as held:
+                if self.job_slot is not None:
+                    await held.enter_async_context(self.job_slot)
+                if self.gate is not None:
+                    await held.enter_async_context(self.gate.slot())
+                result = await method(self.model, on_start=self._on_start, **kwargs)
+        except asyncio.CancelledError:
+            self.stats.cancelled += 1
+            if self.lost and self.started_at is None:
+                # Still queued when it lost the race: a lower bound on the queue time
+                self.stats.queue.append(time.monotonic() - self.submitted)
+            PROVIDER_PREDICTIONS.labels(self.provider.name, self.kind, "cancelled").inc()
+            raise
+        except ProviderBusyError:
+            # Our own admission queue is full: the provider never saw the prediction
+            self.stats.busy += 1
+            PROVIDER_PREDICTIONS.labels(self.provider.name, self.kind, "busy").inc()
+            raise
+        except Exception:
+            self.stats.failed += 1
+            self.stats.outcomes.append(True)
+            PROVIDER_PREDICTIONS.labels(self.provider.name, self.kind, "failed").inc()
+            raise
+        else:
+            # Providers that answer inline never report a separate start
+            self._on_start()
+            run = time.monotonic() - self.started_at
+            self.stats.run.append(run)
+            self.stats.succeeded += 1
+            self.stats.outcomes.append(False)
+            PROVIDER_RUN_SECONDS.labels(self.provider.name, self.kind).observe(run)
+            record_span(f"{self.provider.name}_run", run)
+            PROVIDER_PREDICTIONS.labels(self.provider.name, self.kind, "succeeded").inc()
+            return result
+        finally:
+            inflight.dec()
+            self.stats.waiting.pop(self.id, None)
+            self.events.put_nowait((self, "done"))
+
+
+class ProviderRouter:
+    """
+    Latency-aware dispatch over interchangeable providers.
+
+    Each call goes to the provider/model with the lowest expected latency
+    (median queue + median run time over the last `window` predictions,
+    where predictions still queued raise the queue estimate). With
+    `hedge_after` > 0, a prediction that has not started running after
+    that many seconds is duplicated on the next-best provider; whichever
+    starts first is kept and the other is cancelled upstream; a hedged
+    prediction dropped while queued still counts its time in the queue.
+    Recent failures add up to `failure_penalty` seconds to a provider's
+    score, and a prediction that fails is retried once on a provider not
+    tried yet. With an `admission` registry, each prediction holds its provider model's
+    admission slot while it runs, and providers whose admission queue is
+    full are ranked last.
+    """
+
+    def __init__(self, providers: List[Provider], window: int, hedge_after: float,
+                 admission: Optional[Admission] = None, failure_penalty: float = 0.0):
+        self.providers = providers
+        self.window = window
+        self.hedge_after = hedge_after
+        self.failure_penalty = failure_penalty
+        self.admission = admission
+        self._stats: Dict[Tuple[str, str], LatencyStats] = {}
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+
+    def stats_for(self, provider: str, model: str) -> LatencyStats:
+        key = (provider, model)
+        if key not in self._stats:
+            self._stats[key] = LatencyStats(self.window)
+        return self._stats[key]
+
+    def configured(self, kind: str) -> bool:
+        """Whether any provider has credentials and a model for `kind`."""
+        return any(p.configured_for(kind) for p in self.providers)
+
+    def rank(self, kind: str) -> List[Provider]:
+        """Providers able to serve `kind`, fastest expected first; full admission queues go last."""
+        candidates = [p for p in self.providers if p.serves(kind)]
+        if not candidates:
+            # Nothing configured: let the default provider raise its own setup error
+            return self.providers[:1]
+        now = time.monotonic()
+        # Providers never measured running assume the fastest measured run time
+        runs = [
+            statistics.median(stats.run)
+            for stats in (self.stats_for(p.name, p.models[kind]) for p in candidates) if stats.run
+        ]
+        default_run = min(runs) if runs else 0.0
+
+        def key(p: Provider) -> Tuple[bool, float]:
+            model = p.models[kind]
+            full = self.admission is not None and not self.admission.gate(p.name, model).has_room()
+            return full, self.stats_for(p.name, model).score(now, default_run, self.failure_penalty)
+
+        return sorted(candidates, key=key)
+
+    async def generate_mesh(self, prompt: str, image_url: Optional[str] = None) -> str:
+        """Generate a mesh on the best provider. Returns the mesh file URL."""
+        return await self._dispatch(MESH, prompt=prompt, image_url=image_url)
+
+    async def generate_texture(self, prompt: str, depth_image_url: str) -> str:
+        """Generate a texture on the best provider. Returns the texture image URL."""
+        return await self._dispatch(TEXTURE, prompt=prompt, depth_image_url=depth_image_url)
+
+    async def _dispatch(self, kind: str, **kwargs) -> str:
+        ranked = self.rank(kind)
+        events: asyncio.Queue = asyncio.Queue()
+        attempts = [_Attempt(self, ranked[0], kind, kwargs, events)]
+        logger.info(f"Routing {kind} prediction to {ranked[0].name}")
+
+        loop = asyncio.get_running_loop()
+        can_hedge = self.hedge_after > 0 and len(ranked) > 1
+        hedge_at = loop.time() + self.hedge_after
+        leader: Optional[_Attempt] = None
+        errors: List[BaseException] = []
+        failed_over = False
+
+        try:
+            while True:
+                timeout = None
+                if can_hedge and leader is None and len(attempts) == 1:
+                    timeout = max(0.0, hedge_at - loop.time())
+                try:
+                    attempt, event = await asyncio.wait_for(events.get(), timeout)
+                except asyncio.TimeoutError:
+                    backup = ranked[1]
+                    logger.info(
+                        f"{kind} prediction still queued on {ranked[0].name} after "
+                        f"{self.hedge_after}s, hedging on {backup.name}"
+                    )
+                    self.hedged += 1
+                    attempts.append(_Attempt(self, backup, kind, kwargs, events, hedge=True))
+                    continue
+
+                if event == "started":
+                    if leader is None:
+                        leader = attempt
+                        if attempt.hedge:
+                            self.hedge_wins += 1
+                        # The others are still queued: drop them before they cost anything
+                        for other in attempts:
+                            if other is not attempt:
+                                other.lost = True
+                                other.task.cancel()
+                    continue
+
+                if not attempt.task.cancelled():
+                    error = attempt.task.exception()
+                    if error is None:
+                        return attempt.task.result()
+                    errors.append(error)
+                    logger.warning(f"{kind} prediction failed on {attempt.provider.name}: {error}")
+                if all(a.task.done() for a in attempts):
+                    tried = {a.provider.name for a in attempts}
+                    untried = [p for p in self.rank(kind) if p.name not in tried and p.serves(kind)]
+                    if errors and not failed_over and untried:
+                        failed_over = True
+                        self.failovers += 1
+                        logger.info(f"Retrying {kind} prediction on {untried[0].name}")
+                        leader = None
+                        attempts.append(_Attempt(self, untried[0], kind, kwargs, events))
+                        continue
+                    raise errors[0]
+        finally:
+            for attempt in attempts:
+                if not attempt.task.done():
+                    attempt.task.cancel()
+                    detach(asyncio.gather(attempt.task, return_exceptions=True))
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "hedge_after_s": self.hedge_after,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "failovers": self.failovers,
+            "providers": {
+                f"{provider}:{model}": stats.snapshot(now)
+                for (provider, model), stats in self._stats.items()
+            },
+            "admission": self.admission.stats() if self.admission else {},
+        }
@@ -2,16 +2,25 @@
 White Dwarf — Replicate API Wrapper
 Handles all cloud inference calls to Replicate.com
 """
-import httpx
 import asyncio
 import logging
 from typing import Optional, Dict, Any
 
+import httpx
+
+from ..config import HTTP_CREATE_TIMEOUT, HTTP_POLL_TIMEOUT
+from .http_pool import ManagedClient
+from .resilience import for_provider
+from .completion import (
+    completions, webhook_url, PollSchedule, record_run_time, wait_or_sleep,
+    StartCallback, detach,
+)
+
 logger = logging.getLogger(__name__)
 
 
 class ReplicateClient:
-    """Clean wrapper for Replicate API endpoints with retry logic and polling."""
+    """Clean wrapper for Replicate API endpoints with retries, circuit breaking and polling."""
 
     BASE_URL = "https://api.replicate.com/v1"
 
@@ -21,6 +30,15 @@ class ReplicateClient:
             "Authorization": f"Bearer {api_token}",
             "Content-Type": "application/json",
         }
+        # One keep-alive pool shared by every create and poll
+        self._http = ManagedClient("replicate", self.headers)
+        self.resilience = for_provider("replicate")
+
+    def start(self):
+        self._http.start()
+
+    async def aclose(self):
+        await self._http.aclose()
 
     def _check_token(self):
         if not self.api_token:
@@ -35,44 +53,103 @@ class ReplicateClient:
         """Create a prediction and return the initial response."""
         self._check_token()
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(
+        body = {
+            "version": model_version.split(":")[-1] if ":" in model_version else model_version,
+            "input": input_data,
+        }
+        callback = webhook_url("replicate")
+        if callback:
+            body["webhook"] = callback
+            body["webhook_events_filter"] = ["completed"]
+
+        # Not idempotent: only retried when Replicate cannot have created it
+        response = await self.resilience.send(
+            lambda: self._http.client.post(
                 f"{self.BASE_URL}/predictions",
-                headers=self.headers,
-                json={
-                    "version": model_version.split(":")[-1] if ":" in model_version else model_version,
-                    "input": input_data,
-                },
-            )
+                json=body,
+                timeout=HTTP_CREATE_TIMEOUT,
+            ),
+            idempotent=False,
+            what="create prediction",
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def cancel_prediction(self, prediction: Dict):
+        """Ask Replicate to stop a prediction we no longer need (best effort)."""
+        cancel_url = prediction.get("urls", {}).get("cancel")
+        if not cancel_url:
+            return
+        try:
+            response = await self._http.client.post(cancel_url, timeout=HTTP_CREATE_TIMEOUT)
             response.raise_for_status()
-            return response.json()
+            logger.info(f"Prediction {prediction.get('id')} canceled")
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not cancel prediction {prediction.get('id')}: {e}")
 
     async def _poll_prediction(
-        self, prediction_url: str, max_wait: int = 300, interval: int = 3
+        self, prediction: Dict, model_version: str, max_wait: int = 300,
+        on_start: Optional[StartCallback] = None,
     ) -> Dict:
-        """Poll a prediction until it completes, fails, or times out."""
-        elapsed = 0
+        """
+        Wait for a prediction to complete, fail, or time out.
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            while elapsed < max_wait:
-                response = await client.get(prediction_url, headers=self.headers)
-                response.raise_for_status()
-                data = response.json()
+        Returns as soon as the completion webhook lands; otherwise polls on
+        an adaptive schedule driven by the prediction's status. `on_start`
+        is called once the prediction is seen running. If the waiting
+        coroutine is cancelled, the prediction is canceled upstream too.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+        poll_url = prediction.get("urls", {}).get("get", prediction.get("url", ""))
+
+        key = f"replicate:{prediction.get('id')}"
+        future = completions.register(key) if webhook_url("replicate") and prediction.get("id") else None
+        schedule = PollSchedule(model_version, webhook=future is not None)
+        data = prediction
 
+        try:
+            while True:
                 status = data.get("status")
+                if on_start is not None and status not in (None, "starting"):
+                    on_start()
+                    on_start = None
                 if status == "succeeded":
+                    record_run_time(model_version, (data.get("metrics") or {}).get("predict_time"))
                     return data
                 elif status in ("failed", "canceled"):
                     error = data.get("error", "Unknown error")
                     raise RuntimeError(f"Prediction failed: {error}")
 
-                await asyncio.sleep(interval)
-                elapsed += interval
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+
+                delay = schedule.next_interval(status, running=status == "processing")
+                pushed = await wait_or_sleep(future, min(delay, remaining))
+                if pushed is not None:
+                    data, future = pushed, None
+                    continue
+
+                response = await self.resilience.send(
+                    lambda: self._http.client.get(poll_url, timeout=HTTP_POLL_TIMEOUT),
+                    idempotent=True,
+                    what="poll prediction",
+                    deadline=deadline,
+                )
+                response.raise_for_status()
+                data = response.json()
+        except asyncio.CancelledError:
+            detach(self.cancel_prediction(prediction))
+            raise
+        finally:
+            completions.discard(key)
 
         raise TimeoutError(f"Prediction timed out after {max_wait}s")
 
     async def generate_mesh(
-        self, model_version: str, prompt: str, image_url: Optional[str] = None
+        self, model_version: str, prompt: str, image_url: Optional[str] = None,
+        on_start: Optional[StartCallback] = None,
     ) -> str:
         """
         Generate a 3D mesh from text (and optionally an image).
@@ -85,8 +162,7 @@ class ReplicateClient:
         logger.info(f"Starting mesh generation: '{prompt[:50]}...'")
         prediction = await self._create_prediction(model_version, input_data)
 
-        poll_url = prediction.get("urls", {}).get("get", prediction.get("url", ""))
-        result = await self._poll_prediction(poll_url)
+        result = await self._poll_prediction(prediction, model_version, on_start=on_start)
 
         output = result.get("output")
         if isinstance(output, str):
@@ -105,6 +181,7 @@ class ReplicateClient:
         prompt: str,
         depth_image_url: str,
         num_samples: int = 1,
+        on_start: Optional[StartCallback] = None,
     ) -> str:
         """
         Generate a texture using ControlNet Depth.
@@ -122,8 +199,7 @@ class ReplicateClient:
         logger.info(f"Starting texture generation: '{prompt[:50]}...'")
         prediction = await self._create_prediction(model_version, input_data)
 
-        poll_url = prediction.get("urls", {}).get("get", prediction.get("url", ""))
-        result = await self._poll_prediction(poll_url)
+        result = await self._poll_prediction(prediction, model_version, on_start=on_start)
 
         output = result.get("output")
         if isinstance(output, list) and len(output) > 0:
@@ -0,0 +1,233 @@
+"""
+White Dwarf — Provider Resilience
+Retries with jittered exponential backoff (honoring Retry-After) and a
+per-provider circuit breaker around cloud inference HTTP calls, so a
+rate-limit blip or dropped connection does not throw away a prediction
+while a provider outage fails fast instead of piling up requests.
+"""
+import time
+import random
+import asyncio
+import logging
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from ..config import (
+    PROVIDER_RETRY_ATTEMPTS, PROVIDER_RETRY_BASE_DELAY, PROVIDER_RETRY_MAX_DELAY,
+    PROVIDER_RETRY_AFTER_MAX, BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth another try; creates only retry the ones that mean the
+# request was not acted on
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+CREATE_RETRY_STATUSES = {429, 503}
+# Transport failures that happen before the request reaches the provider
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the provider while its circuit is open."""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Delay requested by a Retry-After header (seconds or HTTP date), if any."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After `failure_threshold` failures in a row the circuit opens and calls
+    fail immediately for `reset_timeout` seconds. Then one probe call is let
+    through (half-open): success closes the circuit, failure re-opens it.
+    A probe that never reports back is replaced after another timeout.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+
+    def allows(self) -> bool:
+        """Whether a call would currently be let through (no side effects)."""
+        now = time.monotonic()
+        if self.state == self.OPEN:
+            return now - self.opened_at >= self.reset_timeout
+        if self.state == self.HALF_OPEN:
+            return now - self.probe_at >= self.reset_timeout
+        return True
+
+    def check(self):
+        """Admit a call or raise CircuitOpenError."""
+        now = time.monotonic()
+        if self.state == self.CLOSED:
+            return
+        if not self.allows():
+            self.rejected += 1
+            since = self.opened_at if self.state == self.OPEN else self.probe_at
+            wait = max(1, int(self.reset_timeout - (now - since) + 0.999))
+            raise CircuitOpenError(f"{self.name} is unavailable (circuit open)", retry_after=wait)
+        self.state = self.HALF_OPEN
+        self.probe_at = now
+        logger.info(f"[{self.name}] Circuit half-open, probing")
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info(f"[{self.name}] Circuit closed")
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self.times_opened += 1
+            logger.warning(f"[{self.name}] Circuit opened after {self.failures} consecutive failures")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+class Resilience:
+    """
+    Retry policy plus circuit breaker for one provider's HTTP calls.
+
+    `send()` retries transport errors and RETRY_STATUSES for idempotent
+    calls (status polls, cancels). Non-idempotent calls (prediction
+    creates) are retried only when the provider cannot have acted on
+    them: connection failures before sending, 429 and 503. Delays are
+    full-jitter exponential, stretched to honor Retry-After up to
+    `retry_after_max`. Transport errors and 5xx answers count as breaker
+    failures; 429 does not, since the provider is up.
+
+    Only calls that would start new work fail fast on an open circuit.
+    Polls of predictions that already exist pass their `deadline` and wait
+    for the circuit to let a probe through instead, so a provider blip does
+    not throw away work that is running and paid for.
+    """
+
+    # Seconds between breaker checks while a poll waits for an open circuit
+    CIRCUIT_WAIT_INTERVAL = 0.5
+
+    def __init__(self, name: str, attempts: int, base_delay: float, max_delay: float,
+                 retry_after_max: float, breaker: CircuitBreaker):
+        self.name = name
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_after_max = retry_after_max
+        self.breaker = breaker
+        self.retries = 0
+
+    async def _admit(self, deadline: Optional[float], what: str):
+        """Pass the breaker; with a deadline, wait out an open circuit rather than raise."""
+        if deadline is None:
+            self.breaker.check()
+            return
+        loop = asyncio.get_running_loop()
+        while not self.breaker.allows():
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise TimeoutError(f"[{self.name}] {what}: circuit still open at the deadline")
+            await asyncio.sleep(min(self.CIRCUIT_WAIT_INTERVAL, remaining))
+        self.breaker.check()
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    async def send(
+        self,
+        request: Callable[[], Awaitable[httpx.Response]],
+        idempotent: bool,
+        what: str = "request",
+        deadline: Optional[float] = None,
+    ) -> httpx.Response:
+        """
+        Issue `request()` with retries; returns the last response.
+
+        The caller still checks the returned status (raise_for_status), so
+        non-retryable errors surface unchanged. Raises the last transport
+        error, or CircuitOpenError when the breaker rejects the call; with
+        a `deadline` (event-loop time) it waits for the circuit instead and
+        raises TimeoutError only if the deadline passes first.
+        """
+        for attempt in range(1, self.attempts + 1):
+            await self._admit(deadline, what)
+            try:
+                response = await request()
+            except httpx.TransportError as e:
+                self.breaker.record_failure()
+                if attempt == self.attempts or not (idempotent or isinstance(e, _NOT_SENT_ERRORS)):
+                    raise
+                delay = self._backoff(attempt)
+                reason = type(e).__name__
+            else:
+                status = response.status_code
+                if status >= 500:
+                    self.breaker.record_failure()
+                elif status != 429:
+                    self.breaker.record_success()
+                retryable = status in (RETRY_STATUSES if idempotent else CREATE_RETRY_STATUSES)
+                if not retryable or attempt == self.attempts:
+                    return response
+                delay = self._backoff(attempt)
+                requested = retry_after_seconds(response)
+                if requested is not None:
+                    delay = max(delay, min(requested, self.retry_after_max))
+                reason = f"HTTP {status}"
+
+            self.retries += 1
+            logger.warning(
+                f"[{self.name}] {what} failed ({reason}), retry {attempt}/{self.attempts - 1} in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"retries": self.retries, **self.breaker.stats()}
+
+
+def for_provider(name: str) -> Resilience:
+    """Resilience policy for one provider, configured from the environment."""
+    return Resilience(
+        name,
+        attempts=PROVIDER_RETRY_ATTEMPTS,
+        base_delay=PROVIDER_RETRY_BASE_DELAY,
+        max_delay=PROVIDER_RETRY_MAX_DELAY,
+        retry_after_max=PROVIDER_RETRY_AFTER_MAX,
+        breaker=CircuitBreaker(name, BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT),
+    )
@@ -0,0 +1,266 @@
+"""
+White Dwarf — Result Cache
+Persistent content-addressed index of generated artifacts in OUTPUTS_DIR,
+so identical requests reuse earlier cloud results instead of paying for
+another round trip.
+"""
+import glob
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from ..config import OUTPUTS_DIR, RESULT_CACHE_DB_PATH, RESULT_CACHE_MAX_BYTES, RESULT_CACHE_MAX_AGE
+from .static_files import discard_encodings
+
+logger = logging.getLogger(__name__)
+
+# Callables that return which of the given output file names are still
+# referenced elsewhere (job results, catalog assets); those are never deleted
+_file_users: List[Callable[[Set[str]], Set[str]]] = []
+
+
+def register_file_users(fn: Callable[[Set[str]], Set[str]]):
+    """Register a check for output files that must outlive their cache entry."""
+    _file_users.append(fn)
+
+
+def files_in_use(names: Iterable[str]) -> Set[str]:
+    names = set(names)
+    used: Set[str] = set()
+    for fn in _file_users:
+        try:
+            used |= fn(names)
+        except Exception as e:
+            # When in doubt, keep the files
+            logger.warning(f"File reference check failed, keeping {len(names)} files: {e}")
+            return names
+    return used
+
+
+def derived_files(name: str) -> List[str]:
+    """Exports convert_mesh writes next to a mesh in OUTPUTS_DIR (GLB, USDZ, LODs, manifest)."""
+    path = Path(name)
+    if path.suffix.lower() != ".obj":
+        return []
+    stem = path.stem
+    names = [f"{stem}.glb", f"{stem}.usdz", f"{stem}.export.json"]
+    names += [p.name for p in OUTPUTS_DIR.glob(f"{glob.escape(stem)}_lod*.glb")]
+    return [n for n in names if (OUTPUTS_DIR / n).exists()]
+
+
+def cache_key(**parts: Any) -> str:
+    """Stable SHA-256 over the JSON encoding of the key parts."""
+    blob = json.dumps(parts, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Case- and whitespace-insensitive form of a prompt for cache keys."""
+    return " ".join(prompt.lower().split())
+
+
+def sha256_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    SQLite index mapping a content key to artifact files in OUTPUTS_DIR.
+
+    Each namespace ("mesh", "texture", ...) shares one database but is
+    evicted independently: entries older than `max_age` seconds go first,
+    then least-recently-used entries until the namespace fits `max_bytes`.
+    Evicting an entry deletes its files and the exports made from them,
+    except that entries whose files a job or catalog record still uses are
+    kept until nothing does. Refreshing a key never deletes the files it
+    pointed at before: they stay on as a superseded entry that ages out.
+    """
+
+    def __init__(self, namespace: str, db_path: Path, max_bytes: int, max_age: float):
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    files TEXT NOT NULL,
+                    meta TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+                """
+            )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the entry's meta (plus `files`) or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT files, meta FROM results WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+
+        if row is not None:
+            files = json.loads(row["files"])
+            if all((OUTPUTS_DIR / name).exists() for name in files):
+                with self._lock:
+                    self._conn.execute(
+                        "UPDATE results SET last_used_at = ? WHERE namespace = ? AND key = ?",
+                        (time.time(), self.namespace, key),
+                    )
+                self.hits += 1
+                return {**json.loads(row["meta"]), "files": files}
+            # Artifacts were removed out from under us; drop the rest unless still used
+            self._delete(key, files)
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, files: List[str], meta: Dict[str, Any]):
+        """Record artifacts (file names in OUTPUTS_DIR) for a key, then evict."""
+        files = [name for name in files if (OUTPUTS_DIR / name).exists()]
+        size = sum((OUTPUTS_DIR / name).stat().st_size for name in files)
+        now = time.time()
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT * FROM results WHERE namespace = ? AND key = ?", (self.namespace, key)
+            ).fetchone()
+            if previous is not None:
+                # A refreshed entry (cache bypass) gets new file names; the old
+                # files may still be linked from earlier responses, so they are
+                # kept under a key lookups never use and evicted like any entry
+                old = [n for n in json.loads(previous["files"]) if n not in files]
+                if old:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (self.namespace, f"{key}@{previous['created_at']:.6f}", json.dumps(old),
+                         previous["meta"], self._size(old), previous["created_at"], previous["last_used_at"]),
+                    )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(files), json.dumps(meta), size, now, now),
+            )
+        self.evict()
+
+    @staticmethod
+    def _size(files: List[str]) -> int:
+        total = 0
+        for name in files:
+            try:
+                total += (OUTPUTS_DIR / name).stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def note_bypass(self):
+        self.bypasses += 1
+
+    @staticmethod
+    def _owned(files: List[str]) -> List[str]:
+        """An entry's files plus the exports generated from them."""
+        return list(dict.fromkeys(files + [d for name in files for d in derived_files(name)]))
+
+    def _delete(self, key: str, files: List[str]):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM results WHERE namespace = ? AND key = ?", (self.namespace, key)
+            )
+        owned = self._owned(files)
+        used = files_in_use(owned)
+        for name in owned:
+            if name in used:
+                continue
+            (OUTPUTS_DIR / name).unlink(missing_ok=True)
+            discard_encodings(name)
+
+    def _evictable(self, files: List[str]) -> bool:
+        return not files_in_use(self._owned(files))
+
+    def evict(self):
+        """Drop expired entries, then LRU entries until under the byte budget."""
+        cutoff = time.time() - self.max_age
+        with self._lock:
+            expired = self._conn.execute(
+                "SELECT key, files FROM results WHERE namespace = ? AND created_at < ?",
+                (self.namespace, cutoff),
+            ).fetchall()
+        evicted, kept = 0, set()
+        for row in expired:
+            files = json.loads(row["files"])
+            if not self._evictable(files):
+                kept.add(row["key"])
+                continue
+            self._delete(row["key"], files)
+            evicted += 1
+
+        with self._lock:
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM results WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+            candidates = []
+            if total > self.max_bytes:
+                candidates = self._conn.execute(
+                    "SELECT key, files, size FROM results WHERE namespace = ? ORDER BY last_used_at",
+                    (self.namespace,),
+                ).fetchall()
+        for row in candidates:
+            if total <= self.max_bytes:
+                break
+            files = json.loads(row["files"])
+            if row["key"] in kept or not self._evictable(files):
+                kept.add(row["key"])
+                continue
+            self._delete(row["key"], files)
+            evicted += 1
+            total -= row["size"]
+
+        self.evictions += evicted
+        if evicted:
+            logger.info(
+                f"Result cache [{self.namespace}] evicted {evicted} entries, kept {len(kept)} still in use"
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results WHERE namespace = ?",
+                (self.namespace,),
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+mesh_results = ResultCache("mesh", RESULT_CACHE_DB_PATH, RESULT_CACHE_MAX_BYTES, RESULT_CACHE_MAX_AGE)
+texture_results = ResultCache("texture", RESULT_CACHE_DB_PATH, RESULT_CACHE_MAX_BYTES, RESULT_CACHE_MAX_AGE)
@@ -2,11 +2,20 @@
 White Dwarf — RunPod Serverless API Wrapper
 Alternative cloud inference backend using RunPod.
 """
-import httpx
 import asyncio
 import logging
 from typing import Optional, Dict, Any
 
+import httpx
+
+from ..config import HTTP_CREATE_TIMEOUT, HTTP_POLL_TIMEOUT
+from .http_pool import ManagedClient
+from .resilience import for_provider
+from .completion import (
+    completions, webhook_url, PollSchedule, record_run_time, wait_or_sleep,
+    StartCallback, detach,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +33,15 @@ class RunPodClient:
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
         }
+        # One keep-alive pool shared by every submit and status poll
+        self._http = ManagedClient("runpod", self.headers)
+        self.resilience = for_provider("runpod")
+
+    def start(self):
+        self._http.start()
+
+    async def aclose(self):
+        await self._http.aclose()
 
     def _check_key(self):
         if not self.api_key:
@@ -33,59 +51,118 @@ class RunPodClient:
             )
 
     async def _run_endpoint(
-        self, endpoint_id: str, input_data: Dict[str, Any]
+        self, endpoint_id: str, input_data: Dict[str, Any],
+        on_start: Optional[StartCallback] = None,
     ) -> Dict:
         """Submit a job to a RunPod serverless endpoint."""
         self._check_key()
 
-        async with httpx.AsyncClient(timeout=30) as client:
-            response = await client.post(
-                f"{self.BASE_URL}/{endpoint_id}/runsync",
-                headers=self.headers,
-                json={"input": input_data},
+        # With a reachable webhook, submit asynchronously and let the
+        # callback wake us; otherwise runsync may answer inline
+        callback = webhook_url("runpod")
+        body: Dict[str, Any] = {"input": input_data}
+        if callback:
+            body["webhook"] = callback
+
+        # Not idempotent: only retried when RunPod cannot have queued it
+        response = await self.resilience.send(
+            lambda: self._http.client.post(
+                f"{self.BASE_URL}/{endpoint_id}/{'run' if callback else 'runsync'}",
+                json=body,
+                timeout=HTTP_CREATE_TIMEOUT,
+            ),
+            idempotent=False,
+            what="submit job",
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        # RunPod runsync returns result directly if fast enough
+        if data.get("status") == "COMPLETED":
+            return data.get("output", {})
+
+        # Otherwise wait for the webhook / poll
+        if data.get("id"):
+            return await self._poll_job(endpoint_id, data, on_start=on_start)
+
+        return data
+
+    async def cancel_job(self, endpoint_id: str, job_id: str):
+        """Ask RunPod to stop a job we no longer need (best effort)."""
+        try:
+            response = await self._http.client.post(
+                f"{self.BASE_URL}/{endpoint_id}/cancel/{job_id}",
+                timeout=HTTP_CREATE_TIMEOUT,
             )
             response.raise_for_status()
-            data = response.json()
-
-            # RunPod runsync returns result directly if fast enough
-            if data.get("status") == "COMPLETED":
-                return data.get("output", {})
-
-            # Otherwise poll
-            job_id = data.get("id")
-            if job_id:
-                return await self._poll_job(endpoint_id, job_id)
-
-            return data
+            logger.info(f"[RunPod] Job {job_id} cancelled")
+        except httpx.HTTPError as e:
+            logger.warning(f"[RunPod] Could not cancel job {job_id}: {e}")
 
     async def _poll_job(
-        self, endpoint_id: str, job_id: str, max_wait: int = 300, interval: int = 3
+        self, endpoint_id: str, job: Dict, max_wait: int = 300,
+        on_start: Optional[StartCallback] = None,
     ) -> Dict:
-        """Poll a RunPod job until completion."""
-        elapsed = 0
-
-        async with httpx.AsyncClient(timeout=30) as client:
-            while elapsed < max_wait:
-                response = await client.get(
-                    f"{self.BASE_URL}/{endpoint_id}/status/{job_id}",
-                    headers=self.headers,
-                )
-                response.raise_for_status()
-                data = response.json()
-
+        """
+        Wait for a RunPod job to complete.
+
+        Returns as soon as the completion webhook lands; otherwise polls
+        the status endpoint on an adaptive schedule. `on_start` is called
+        once the job is seen running; cancelling the wait cancels the job.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+        job_id = job["id"]
+
+        key = f"runpod:{job_id}"
+        future = completions.register(key) if webhook_url("runpod") else None
+        schedule = PollSchedule(endpoint_id, webhook=future is not None)
+        data = job
+
+        try:
+            while True:
                 status = data.get("status")
+                if on_start is not None and status not in (None, "IN_QUEUE"):
+                    on_start()
+                    on_start = None
                 if status == "COMPLETED":
+                    record_run_time(endpoint_id, (data.get("executionTime") or 0) / 1000)
                     return data.get("output", {})
-                elif status == "FAILED":
-                    raise RuntimeError(f"RunPod job failed: {data.get('error', 'Unknown')}")
-
-                await asyncio.sleep(interval)
-                elapsed += interval
+                elif status in ("FAILED", "CANCELLED", "TIMED_OUT"):
+                    raise RuntimeError(f"RunPod job failed: {data.get('error', status)}")
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+
+                delay = schedule.next_interval(status, running=status == "IN_PROGRESS")
+                pushed = await wait_or_sleep(future, min(delay, remaining))
+                if pushed is not None:
+                    data, future = pushed, None
+                    continue
+
+                response = await self.resilience.send(
+                    lambda: self._http.client.get(
+                        f"{self.BASE_URL}/{endpoint_id}/status/{job_id}",
+                        timeout=HTTP_POLL_TIMEOUT,
+                    ),
+                    idempotent=True,
+                    what="poll job",
+                    deadline=deadline,
+                )
+                response.raise_for_status()
+                data = response.json()
+        except asyncio.CancelledError:
+            detach(self.cancel_job(endpoint_id, job_id))
+            raise
+        finally:
+            completions.discard(key)
 
         raise TimeoutError(f"RunPod job timed out after {max_wait}s")
 
     async def generate_mesh(
-        self, endpoint_id: str, prompt: str, image_url: Optional[str] = None
+        self, endpoint_id: str, prompt: str, image_url: Optional[str] = None,
+        on_start: Optional[StartCallback] = None,
     ) -> str:
         """Generate a 3D mesh via RunPod. Returns the mesh file URL."""
         input_data = {"prompt": prompt}
@@ -93,7 +170,7 @@ class RunPodClient:
             input_data["image"] = image_url
 
         logger.info(f"[RunPod] Mesh generation: '{prompt[:50]}...'")
-        result = await self._run_endpoint(endpoint_id, input_data)
+        result = await self._run_endpoint(endpoint_id, input_data, on_start=on_start)
 
         if isinstance(result, str):
             return result
@@ -102,7 +179,8 @@ class RunPodClient:
         raise RuntimeError(f"Unexpected RunPod output: {result}")
 
     async def generate_texture(
-        self, endpoint_id: str, prompt: str, depth_image_url: str
+        self, endpoint_id: str, prompt: str, depth_image_url: str,
+        on_start: Optional[StartCallback] = None,
     ) -> str:
         """Generate texture via RunPod. Returns the texture image URL."""
         input_data = {
@@ -111,7 +189,7 @@ class RunPodClient:
         }
 
         logger.info(f"[RunPod] Texture generation: '{prompt[:50]}...'")
-        result = await self._run_endpoint(endpoint_id, input_data)
+        result = await self._run_endpoint(endpoint_id, input_data, on_start=on_start)
 
         if isinstance(result, str):
             return result
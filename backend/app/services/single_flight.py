@@ -0,0 +1,204 @@
+"""
+White Dwarf — Single-Flight Coalescing
+Concurrent requests for the same generation share one in-flight provider
+prediction instead of each paying for their own. Optionally coordinates
+across worker processes through SQLite leases, so only one worker runs a
+given key while the others wait for its cached result.
+"""
+import os
+import time
+import uuid
+import socket
+import asyncio
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from ..config import (
+    SINGLE_FLIGHT_LEASES, SINGLE_FLIGHT_DB_PATH,
+    SINGLE_FLIGHT_LEASE_TTL, SINGLE_FLIGHT_POLL_INTERVAL,
+)
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process as a lease holder
+OWNER = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class LeaseStore:
+    """SQLite table of expiring per-key leases shared by worker processes."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None, timeout=5)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS leases (
+                    key TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+
+    def acquire(self, key: str, owner: str, ttl: float) -> bool:
+        """Take the lease if it is free, expired or already ours."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                INSERT INTO leases VALUES (?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+                WHERE leases.expires_at < ? OR leases.owner = excluded.owner
+                """,
+                (key, owner, now + ttl, now),
+            )
+        return cursor.rowcount == 1
+
+    def renew(self, key: str, owner: str, ttl: float):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE leases SET expires_at = ? WHERE key = ? AND owner = ?",
+                (time.time() + ttl, key, owner),
+            )
+
+    def release(self, key: str, owner: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, owner))
+
+    def held(self, key: str) -> bool:
+        """Whether some process holds an unexpired lease on `key`."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM leases WHERE key = ? AND expires_at >= ?", (key, time.time())
+            ).fetchone()
+        return row is not None
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls by key.
+
+    The first caller for a key starts `fn()` in a task; callers arriving
+    while it runs await the same task. The task is cancelled only when
+    every waiting caller has gone away, so one client disconnecting does
+    not fail the others. With a lease store, the task first takes the
+    key's lease; if another process holds it, the task waits for the lease
+    to go away and returns `lookup()` (normally a result-cache read)
+    instead of running `fn()`.
+    """
+
+    def __init__(self, name: str, leases: Optional[LeaseStore] = None,
+                 lease_ttl: float = 60.0, poll_interval: float = 1.0):
+        self.name = name
+        self.leases = leases
+        self.lease_ttl = lease_ttl
+        self.poll_interval = poll_interval
+        self._flights: Dict[str, _Flight] = {}
+        self.started = 0
+        self.joined = 0
+        self.remote_waits = 0
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        lookup: Optional[Callable[[], Optional[Any]]] = None,
+    ) -> Tuple[Any, bool]:
+        """
+        Run `fn()` once per key at a time.
+
+        Returns:
+            (result, shared): `shared` is False only for the caller whose
+            own call produced the result.
+        """
+        flight = self._flights.get(key)
+        starter = flight is None
+        if starter:
+            flight = _Flight(asyncio.create_task(self._lead(key, fn, lookup)))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self.started += 1
+        else:
+            self.joined += 1
+            logger.info(f"[{self.name}] Joining in-flight request {key[:12]}")
+
+        flight.waiters += 1
+        try:
+            result, produced_here = await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+        return result, not (starter and produced_here)
+
+    def _forget(self, key: str, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def _lead(self, key: str, fn: Callable[[], Awaitable[Any]],
+                    lookup: Optional[Callable[[], Optional[Any]]]) -> Tuple[Any, bool]:
+        if self.leases is None:
+            return await fn(), True
+
+        lease_key = f"{self.name}:{key}"
+        waited = False
+        while True:
+            if self.leases.acquire(lease_key, OWNER, self.lease_ttl):
+                break
+            if not waited:
+                waited = True
+                self.remote_waits += 1
+                logger.info(f"[{self.name}] {key[:12]} is in flight in another worker, waiting")
+            while self.leases.held(lease_key):
+                await asyncio.sleep(self.poll_interval)
+            # The holder finished (or died): use its result if it left one
+            if lookup is not None:
+                hit = lookup()
+                if hit is not None:
+                    return hit, False
+
+        heartbeat = asyncio.create_task(self._renew(lease_key))
+        try:
+            # Another worker may have finished between our caller's cache
+            # check and taking the lease
+            if lookup is not None and not waited:
+                hit = lookup()
+                if hit is not None:
+                    return hit, False
+            return await fn(), True
+        finally:
+            heartbeat.cancel()
+            self.leases.release(lease_key, OWNER)
+
+    async def _renew(self, lease_key: str):
+        while True:
+            await asyncio.sleep(self.lease_ttl / 3)
+            self.leases.renew(lease_key, OWNER, self.lease_ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._flights),
+            "started": self.started,
+            "joined": self.joined,
+            "remote_waits": self.remote_waits,
+            "cross_worker": self.leases is not None,
+        }
+
+
+_leases = LeaseStore(SINGLE_FLIGHT_DB_PATH) if SINGLE_FLIGHT_LEASES else None
+mesh_flights = SingleFlight("mesh", _leases, SINGLE_FLIGHT_LEASE_TTL, SINGLE_FLIGHT_POLL_INTERVAL)
+texture_flights = SingleFlight("texture", _leases, SINGLE_FLIGHT_LEASE_TTL, SINGLE_FLIGHT_POLL_INTERVAL)
@@ -0,0 +1,215 @@
+"""
+White Dwarf — Output Static Files
+Serves generated assets with long-lived immutable caching, per-encoding
+strong ETags, conditional requests, byte ranges and gzip/brotli sidecars
+that are compressed once and reused for every later download.
+"""
+import os
+import gzip
+import shutil
+import asyncio
+import logging
+import mimetypes
+import importlib.util
+from pathlib import Path
+from typing import List, Optional, Set
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from ..config import STATIC_ENCODED_DIR, STATIC_CACHE_MAX_AGE
+
+logger = logging.getLogger(__name__)
+
+mimetypes.add_type("model/gltf-binary", ".glb")
+mimetypes.add_type("model/gltf+json", ".gltf")
+mimetypes.add_type("model/obj", ".obj")
+
+# Only downloadable assets are served: OUTPUTS_DIR also holds internal files
+# (mesh sidecars .npy/.mesh.json, export manifests, partial downloads)
+SERVED_SUFFIXES = {
+    ".obj", ".mtl", ".glb", ".gltf", ".usdz", ".ply", ".stl",  # models
+    ".png", ".jpg", ".jpeg", ".webp",  # textures, depth maps and reference images
+}
+# Text and binary mesh formats that shrink well; PNG/USDZ are already deflated
+COMPRESSIBLE_SUFFIXES = {".obj", ".mtl", ".glb", ".gltf", ".ply", ".stl"}
+MIN_COMPRESS_BYTES = 1024
+_CHUNK_SIZE = 1024 * 1024
+
+
+def brotli_available() -> bool:
+    """Brotli sidecars need the optional `brotli` package."""
+    return importlib.util.find_spec("brotli") is not None
+
+
+def _encodings() -> List[str]:
+    """Content codings we can produce, most preferred first."""
+    return (["br"] if brotli_available() else []) + ["gzip"]
+
+
+def _sidecar(name: str, encoding: str) -> Path:
+    return STATIC_ENCODED_DIR / f"{name}.{'br' if encoding == 'br' else 'gz'}"
+
+
+def _fresh_stat(sidecar: Path, source: os.stat_result) -> Optional[os.stat_result]:
+    """Sidecar stat if it was made from the current source version."""
+    try:
+        st = sidecar.stat()
+    except OSError:
+        return None
+    return st if st.st_mtime_ns == source.st_mtime_ns else None
+
+
+def _compress_file(src: Path, dest: Path, encoding: str, source: os.stat_result):
+    tmp = dest.with_name(dest.name + ".tmp")
+    with open(src, "rb") as fin, open(tmp, "wb") as fout:
+        if encoding == "br":
+            import brotli
+            compressor = brotli.Compressor(quality=5)
+            for chunk in iter(lambda: fin.read(_CHUNK_SIZE), b""):
+                fout.write(compressor.process(chunk))
+            fout.write(compressor.finish())
+        else:
+            with gzip.GzipFile(fileobj=fout, mode="wb", compresslevel=6, mtime=0) as gz:
+                shutil.copyfileobj(fin, gz, _CHUNK_SIZE)
+    # Tie the sidecar to this exact source version
+    os.utime(tmp, ns=(source.st_atime_ns, source.st_mtime_ns))
+    os.replace(tmp, dest)
+
+
+def precompress(path: Path):
+    """Write (or refresh) every encoded sidecar for a file in OUTPUTS_DIR."""
+    path = Path(path)
+    if path.suffix.lower() not in COMPRESSIBLE_SUFFIXES:
+        return
+    try:
+        source = path.stat()
+    except OSError:
+        return
+    if source.st_size < MIN_COMPRESS_BYTES:
+        return
+
+    STATIC_ENCODED_DIR.mkdir(parents=True, exist_ok=True)
+    for encoding in _encodings():
+        dest = _sidecar(path.name, encoding)
+        if _fresh_stat(dest, source) is not None:
+            continue
+        _compress_file(path, dest, encoding, source)
+        logger.info(
+            f"Precompressed {path.name} [{encoding}]: {source.st_size} → {dest.stat().st_size} bytes"
+        )
+
+
+_pending: Set[str] = set()
+
+
+def schedule_precompress(path: Path):
+    """Precompress in a background thread; no-op if one is already running."""
+    path = Path(path)
+    if path.name in _pending or path.suffix.lower() not in COMPRESSIBLE_SUFFIXES:
+        return
+    _pending.add(path.name)
+
+    def run():
+        try:
+            precompress(path)
+        except Exception as e:
+            logger.warning(f"Precompression of {path.name} failed: {e}")
+        finally:
+            _pending.discard(path.name)
+
+    asyncio.get_running_loop().run_in_executor(None, run)
+
+
+def discard_encodings(name: str):
+    """Remove the encoded sidecars of an output file that is being deleted."""
+    for encoding in ("br", "gzip"):
+        _sidecar(name, encoding).unlink(missing_ok=True)
+
+
+def _accepted(accept_encoding: str) -> Set[str]:
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class _AssetFileResponse(FileResponse):
+    # Fewer, larger reads for multi-MB meshes: uvicorn streams every body
+    chunk_size = _CHUNK_SIZE
+
+
+class OutputStaticFiles(StaticFiles):
+    """
+    StaticFiles for OUTPUTS_DIR, whose files are named by job id and never
+    change once written.
+
+    Compressible assets are served from gzip/brotli sidecars matching the
+    client's Accept-Encoding; the first request for a file without one gets
+    the identity body while the sidecar is built in the background. Range
+    requests always get the identity body so byte offsets stay meaningful.
+    Only SERVED_SUFFIXES are served; anything else in OUTPUTS_DIR is a 404.
+    """
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        path = Path(full_path)
+        # Also rejects partial files (.part/.tmp) still being written
+        if path.suffix.lower() not in SERVED_SUFFIXES:
+            raise HTTPException(status_code=404)
+
+        request_headers = Headers(scope=scope)
+        etag_base = f"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"
+        headers = {"cache-control": f"public, max-age={STATIC_CACHE_MAX_AGE}, immutable"}
+
+        compressible = (
+            path.suffix.lower() in COMPRESSIBLE_SUFFIXES and stat_result.st_size >= MIN_COMPRESS_BYTES
+        )
+        serve_path, serve_stat = path, stat_result
+        headers["etag"] = f'"{etag_base}"'
+        if compressible:
+            headers["vary"] = "Accept-Encoding"
+            if "range" not in request_headers:
+                accepted = _accepted(request_headers.get("accept-encoding", ""))
+                missing = False
+                for encoding in _encodings():
+                    if encoding not in accepted:
+                        continue
+                    sidecar_stat = _fresh_stat(_sidecar(path.name, encoding), stat_result)
+                    if sidecar_stat is None:
+                        missing = True
+                        continue
+                    serve_path, serve_stat = _sidecar(path.name, encoding), sidecar_stat
+                    headers["content-encoding"] = encoding
+                    headers["etag"] = f'"{etag_base}-{encoding}"'
+                    break
+                if missing:
+                    schedule_precompress(path)
+
+        response = _AssetFileResponse(
+            serve_path,
+            status_code=status_code,
+            headers=headers,
+            # Type of the original file, not of the .gz/.br sidecar
+            media_type=mimetypes.guess_type(path.name)[0] or "application/octet-stream",
+            stat_result=serve_stat,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
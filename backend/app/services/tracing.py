@@ -0,0 +1,139 @@
+"""
+White Dwarf — Request Tracing
+Per-request spans collected through a context variable and reported in a
+Server-Timing response header, plus an opt-in, admin-only sampling
+profiler that saves each profiled request as collapsed stacks.
+"""
+import os
+import re
+import hmac
+import time
+import logging
+import itertools
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import ADMIN_TOKEN, PROFILE_DIR, PROFILE_INTERVAL
+from .profiler import SamplingProfiler
+
+logger = logging.getLogger(__name__)
+
+# (name, seconds) pairs of the request being served; None outside requests
+_spans: contextvars.ContextVar[Optional[List[Tuple[str, float]]]] = contextvars.ContextVar(
+    "white_dwarf_spans", default=None
+)
+
+_TOKEN = re.compile(r"[^A-Za-z0-9_.-]")
+# With the pid, keeps profiles of same-second requests to one endpoint
+# (in any worker process) from overwriting each other
+_profile_seq = itertools.count(1)
+
+
+def record_span(name: str, seconds: float):
+    """Add a finished span to the current request's timings (no-op elsewhere)."""
+    spans = _spans.get()
+    if spans is not None:
+        spans.append((name, seconds))
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block as a span of the current request."""
+    spans = _spans.get()
+    if spans is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        spans.append((name, time.perf_counter() - start))
+
+
+@contextmanager
+def collect_spans() -> Iterator[List[Tuple[str, float]]]:
+    """Collect the spans recorded in the enclosed block, e.g. inside a worker process."""
+    spans: List[Tuple[str, float]] = []
+    token = _spans.set(spans)
+    try:
+        yield spans
+    finally:
+        _spans.reset(token)
+
+
+def server_timing(spans: List[Tuple[str, float]], total: float) -> str:
+    """Format spans as a Server-Timing value; repeated names are summed."""
+    merged: Dict[str, float] = {}
+    for name, seconds in spans:
+        key = _TOKEN.sub("_", name)
+        merged[key] = merged.get(key, 0.0) + seconds
+    merged["total"] = total
+    return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in merged.items())
+
+
+def _profile_name(scope: Scope) -> str:
+    path = _TOKEN.sub("_", scope.get("path", "").strip("/")) or "root"
+    stamp = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_profile_seq):04d}"
+    return f"{stamp}-{scope.get('method', 'GET').lower()}-{path[:60]}.folded"
+
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware (keeps the request's context variables intact)
+    that collects spans for each HTTP request and adds a Server-Timing
+    header to its response.
+
+    Requests carrying `X-Profile: 1` and a valid `X-Admin-Token` are also
+    run under a SamplingProfiler; the collapsed stacks are written to
+    PROFILE_DIR and the file name is returned in `X-Profile-File`.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    @staticmethod
+    def _wants_profile(headers: Headers) -> bool:
+        if headers.get("x-profile", "") not in ("1", "true", "yes"):
+            return False
+        token = headers.get("x-admin-token", "")
+        return bool(ADMIN_TOKEN) and hmac.compare_digest(token, ADMIN_TOKEN)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        spans: List[Tuple[str, float]] = []
+        token = _spans.set(spans)
+        start = time.perf_counter()
+
+        profiler: Optional[SamplingProfiler] = None
+        profile_name = None
+        if self._wants_profile(Headers(scope=scope)):
+            profiler = SamplingProfiler(PROFILE_INTERVAL)
+            profile_name = _profile_name(scope)
+            profiler.start()
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing(spans, time.perf_counter() - start))
+                if profile_name:
+                    headers.append("X-Profile-File", profile_name)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _spans.reset(token)
+            if profiler is not None:
+                profiler.stop()
+                try:
+                    path = profiler.save(PROFILE_DIR / profile_name)
+                    logger.info(f"Profile saved: {path} ({profiler.samples} samples)")
+                except OSError as e:
+                    logger.warning(f"Could not save profile {profile_name}: {e}")
@@ -0,0 +1,67 @@
+"""
+White Dwarf — Catalog Warming CLI
+Pre-generates meshes, physics results and AR exports for catalog items
+outside the web server. Safe to interrupt: re-running resumes with the
+items that are not ready yet.
+
+Usage (from backend/):
+    python -m app.warm_catalog [--force] [--only ITEM_ID ...] [--concurrency N]
+"""
+import sys
+import asyncio
+import argparse
+import logging
+
+from .config import CATALOG_PATH
+from .services.catalog_store import catalog_store
+from .services.catalog_warm import catalog_warmer
+from .services.clients import start_clients, close_clients
+from .services.executor import geometry_executor
+# Registers job file references, so cache eviction here spares files jobs link to
+from .services import jobs  # noqa: F401
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+async def _run(args) -> dict:
+    catalog_store.load(CATALOG_PATH)
+    ids = args.only or catalog_store.ids()
+    items = [catalog_store.get(item_id) for item_id in ids]
+    missing = [item_id for item_id, item in zip(ids, items) if item is None]
+    if missing:
+        raise SystemExit(f"Unknown catalog ids: {', '.join(missing)}")
+    if args.concurrency:
+        catalog_warmer.concurrency = args.concurrency
+
+    geometry_executor.start()
+    start_clients()
+    try:
+        return await catalog_warmer.run(items, force=args.force)
+    finally:
+        await close_clients()
+        geometry_executor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--force", action="store_true", help="regenerate items that are already up to date")
+    parser.add_argument("--only", nargs="+", metavar="ITEM_ID", help="warm just these catalog items")
+    parser.add_argument("--concurrency", type=int, help="concurrent provider generations")
+    args = parser.parse_args()
+
+    status = asyncio.run(_run(args))
+    print(
+        f"Catalog warm finished: {status['ready']} ready, {status['skipped']} up to date, "
+        f"{status['failed']} failed (of {status['total']})"
+    )
+    for item_id, error in status["errors"].items():
+        print(f"  {item_id}: {error}")
+    sys.exit(1 if status["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
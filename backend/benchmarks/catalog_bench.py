@@ -0,0 +1,136 @@
+"""
+White Dwarf — Catalog Query Benchmark
+
+Generates a synthetic catalog (default 100k items), loads it through the
+JSON and SQLite loaders, then times lookups, filtered pages, deep cursor
+pages, search and facets against CatalogStore. Every query should stay
+well under a millisecond.
+
+Usage (from backend/):
+    python -m benchmarks.catalog_bench --items 100000
+"""
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.catalog_store import CatalogStore  # noqa: E402
+
+CATEGORIES = ["Chairs", "Tables", "Sofas", "Storage", "Lighting", "Decor", "Beds", "Outdoor"]
+MATERIALS = ["oak", "walnut", "pine", "velvet", "linen", "leather", "marble", "glass", "brass", "steel", "rattan", "boucle"]
+STYLES = ["modern", "scandinavian", "industrial", "rustic", "luxury", "mid-century", "minimalist", "boho", "classic"]
+COLORS = ["black", "white", "cream", "sage", "emerald", "navy", "terracotta", "gray", "amber"]
+# Items skipped per step when building a deep cursor
+DEEP_STEP = 3000
+
+
+def make_items(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        category = rng.choice(CATEGORIES)
+        material, style, color = rng.choice(MATERIALS), rng.choice(STYLES), rng.choice(COLORS)
+        name = f"{style.title()} {material.title()} {category[:-1]} {i}"
+        items.append({
+            "id": f"sku-{i:06d}",
+            "name": name,
+            "description": f"A {color} {style} {category.lower()[:-1]} in {material} with a hand-finished surface.",
+            "category": category,
+            "price": rng.randint(49, 4999),
+            "modelPrompt": f"A {style} {category.lower()[:-1]} made of {material}, {color} finish",
+            "tags": sorted({style, material, color, rng.choice(STYLES)}),
+        })
+    return items
+
+
+def write_sources(items: list, directory: Path):
+    json_path = directory / "catalog.json"
+    json_path.write_text(json.dumps(items))
+
+    db_path = directory / "catalog.sqlite3"
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(
+        "CREATE TABLE items (id TEXT PRIMARY KEY, name TEXT, description TEXT, category TEXT, "
+        "price INTEGER, model_prompt TEXT, tags TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (i["id"], i["name"], i["description"], i["category"], i["price"], i["modelPrompt"], json.dumps(i["tags"]))
+            for i in items
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return json_path, db_path
+
+
+def timed(fn, repeat: int) -> dict:
+    fn()  # warm lazily built sets and cached totals
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return {
+        "p50_us": round(statistics.median(samples), 1),
+        "p99_us": round(samples[int(len(samples) * 0.99) - 1], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    items = make_items(args.items)
+    store = CatalogStore()
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path, db_path = write_sources(items, Path(tmp))
+        for path in (db_path, json_path):
+            start = time.perf_counter()
+            store.load(path)
+            print(f"load {path.suffix:<9} {time.perf_counter() - start:6.2f}s  ({len(store)} items)")
+
+    rng = random.Random(1)
+    ids = [item["id"] for item in items]
+    deep_cursor = store.query(category="Chairs", limit=1, cursor=None)
+    # Walk far into the category to time a deep page
+    for _ in range(3):
+        deep_cursor = store.query(category="Chairs", limit=DEEP_STEP, cursor=deep_cursor["next_cursor"])
+
+    queries = {
+        "get by id": lambda: store.get(rng.choice(ids)),
+        "first page": lambda: store.query(limit=50),
+        "category page": lambda: store.query(category="Chairs", limit=50),
+        "deep category page": lambda: store.query(category="Chairs", limit=50, cursor=deep_cursor["next_cursor"]),
+        "tag page": lambda: store.query(tags=["walnut"], limit=50),
+        "category + 2 tags": lambda: store.query(category="Sofas", tags=["velvet", "modern"], limit=50),
+        "search 1 token": lambda: store.query(q="emerald", limit=50),
+        "search 3 tokens": lambda: store.query(q="rustic oak table", limit=50),
+        "search + category": lambda: store.query(q="brass", category="Lighting", limit=50),
+        "no match": lambda: store.query(q="zebra", limit=50),
+        "facets": lambda: store.facets(),
+    }
+
+    print(f"\n{'query':<22}{'p50 µs':>10}{'p99 µs':>10}")
+    worst = 0.0
+    for name, fn in queries.items():
+        result = timed(fn, args.repeat)
+        worst = max(worst, result["p99_us"])
+        print(f"{name:<22}{result['p50_us']:>10}{result['p99_us']:>10}")
+    print(f"\nworst p99: {worst:.1f} µs ({'sub-ms' if worst < 1000 else 'OVER 1 ms'})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+White Dwarf — Geometry Hot-Path Benchmark
+
+Times the CPU-bound geometry functions on deterministic synthetic meshes
+(see benchmarks/meshes.py) and records throughput and peak RSS:
+
+  load               trimesh.load of the OBJ (what a mesh-cache miss costs)
+  analyze_stability  cold: mesh cache cleared before every run
+  render_depth_map   cold, DEPTH_MAP_RESOLUTION with DEPTH_MAP_SUPERSAMPLE
+  to_glb / to_usdz   export only: the scene is loaded before the clock starts
+
+Like the geometry workers, analyze_stability and render_depth_map read the
+binary sidecar written after download unless --no-sidecar is given. Every
+(operation, mesh) pair runs in a fresh process so its peak RSS is its own.
+No network access is needed.
+
+Results are written as JSON. With --baseline, each pair is compared with an
+earlier run and the process exits with status 1 when one got slower (or
+used more memory) by more than --threshold.
+
+Usage (from backend/):
+    python -m benchmarks.geometry_bench --sizes 1k,10k,100k,1m
+    python -m benchmarks.geometry_bench --sizes 5m --ops load,analyze_stability
+    python -m benchmarks.geometry_bench --baseline data/benchmarks/geometry-before.json
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from benchmarks.meshes import DEFAULT_DIR, KINDS, ensure_mesh, parse_size, size_label  # noqa: E402
+
+OPS = ("load", "analyze_stability", "render_depth_map", "to_glb", "to_usdz")
+RESULTS_DIR = BACKEND_DIR / "data" / "benchmarks"
+
+
+def _peak_rss_mb() -> float:
+    import resource
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _prepare(path: str, sidecar: bool):
+    """Write or remove the mesh's sidecar (runs in its own process)."""
+    from app.services.mesh_cache import write_mesh_sidecar
+    from app.services.mesh_sidecar import sidecar_paths
+
+    present = all(p.exists() for p in sidecar_paths(path))
+    if sidecar and not present:
+        write_mesh_sidecar(path)
+    elif not sidecar:
+        for p in sidecar_paths(path):
+            p.unlink(missing_ok=True)
+
+
+def _measure(op: str, path: str, repeat: int) -> Dict[str, Any]:
+    """Run `op` on `path` `repeat` times in this (fresh) process."""
+    logging.getLogger("app").setLevel(logging.ERROR)
+
+    import trimesh
+    from app.config import DEPTH_MAP_RESOLUTION, DEPTH_MAP_SUPERSAMPLE
+    from app.services.converter import to_glb, to_usdz
+    from app.services.depth_renderer import render_depth_map
+    from app.services.mesh_cache import mesh_cache
+    from app.services.physics_engine import analyze_stability
+
+    rss_before = _peak_rss_mb()
+    out_dir = tempfile.mkdtemp(prefix="wd-bench-")
+    out = os.path.join(out_dir, "out")
+
+    if op == "load":
+        run, cold = (lambda: trimesh.load(path)), False
+    elif op == "analyze_stability":
+        run, cold = (lambda: analyze_stability(path)), True
+    elif op == "render_depth_map":
+        run, cold = (lambda: render_depth_map(path, DEPTH_MAP_RESOLUTION, DEPTH_MAP_SUPERSAMPLE)), True
+    elif op == "to_glb":
+        mesh_cache.get_scene(path)
+        run, cold = (lambda: to_glb(path, out + ".glb")), False
+    elif op == "to_usdz":
+        mesh_cache.get_scene(path)
+        run, cold = (lambda: to_usdz(path, out + ".usdz")), False
+    else:
+        raise ValueError(f"Unknown operation: {op}")
+
+    samples = []
+    for _ in range(repeat):
+        if cold:
+            mesh_cache.invalidate()
+        start = time.perf_counter()
+        result = run()
+        samples.append(time.perf_counter() - start)
+        if op == "to_usdz" and result is None:
+            return {"skipped": "USDZ export unavailable (pip install usd-core)"}
+
+    for name in os.listdir(out_dir):
+        os.unlink(os.path.join(out_dir, name))
+    os.rmdir(out_dir)
+    return {
+        "samples_s": [round(s, 6) for s in samples],
+        "rss_before_mb": round(rss_before, 1),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def _in_fresh_process(fn, *args):
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        return pool.apply(fn, args)
+
+
+def _environment() -> Dict[str, Any]:
+    import numpy
+    import trimesh
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "trimesh": trimesh.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Regression messages for pairs slower or bigger than the baseline by more than `threshold`."""
+    before = {(r["op"], r["mesh"]): r for r in baseline.get("results", []) if "median_s" in r}
+    regressions = []
+    print(f"\n{'operation':<19}{'mesh':<14}{'time Δ':>9}{'RSS Δ':>9}")
+    for r in results:
+        old = before.get((r["op"], r["mesh"]))
+        if old is None or "median_s" not in r:
+            continue
+        time_ratio = r["median_s"] / old["median_s"] if old["median_s"] else 1.0
+        rss_ratio = r["peak_rss_mb"] / old["peak_rss_mb"] if old["peak_rss_mb"] else 1.0
+        flags = []
+        if time_ratio > 1 + threshold:
+            flags.append("SLOWER")
+            regressions.append(f"{r['op']} on {r['mesh']}: {time_ratio:.2f}× time")
+        if rss_ratio > 1 + threshold:
+            flags.append("MORE MEMORY")
+            regressions.append(f"{r['op']} on {r['mesh']}: {rss_ratio:.2f}× peak RSS")
+        print(f"{r['op']:<19}{r['mesh']:<14}{time_ratio - 1:>+9.1%}{rss_ratio - 1:>+9.1%}  {' '.join(flags)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--kinds", default=",".join(KINDS), help="mesh kinds: sphere, chair, scan")
+    parser.add_argument("--sizes", default="1k,10k,100k,1m", help="face counts, e.g. 1k,100k,5m")
+    parser.add_argument("--ops", default=",".join(OPS))
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per operation and mesh")
+    parser.add_argument("--no-sidecar", action="store_true", help="parse (or stream) the OBJ instead of the sidecar")
+    parser.add_argument("--mesh-dir", type=Path, default=DEFAULT_DIR, help="where generated meshes are cached")
+    parser.add_argument("--output", type=Path, default=None, help="JSON results file")
+    parser.add_argument("--baseline", type=Path, default=None, help="earlier JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before flagging (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    ops = [op for op in args.ops.split(",") if op]
+    unknown = set(ops) - set(OPS)
+    if unknown:
+        parser.error(f"unknown operations: {', '.join(sorted(unknown))}")
+    output = args.output or RESULTS_DIR / f"geometry-{time.strftime('%Y%m%d-%H%M%S')}.json"
+
+    results: List[Dict[str, Any]] = []
+    print(f"{'operation':<19}{'mesh':<14}{'faces':>9}{'median s':>10}{'Mfaces/s':>10}{'peak RSS MB':>13}")
+    for kind in args.kinds.split(","):
+        for size in args.sizes.split(","):
+            path, counts = ensure_mesh(kind, parse_size(size), args.mesh_dir)
+            _in_fresh_process(_prepare, str(path), not args.no_sidecar)
+            mesh = f"{kind}_{size_label(parse_size(size))}"
+            for op in ops:
+                measured = _in_fresh_process(_measure, op, str(path), args.repeat)
+                row: Dict[str, Any] = {"op": op, "mesh": mesh, "kind": kind, **counts,
+                                       "obj_bytes": path.stat().st_size, **measured}
+                if "samples_s" in measured:
+                    median = statistics.median(measured["samples_s"])
+                    row["median_s"] = round(median, 6)
+                    row["min_s"] = min(measured["samples_s"])
+                    row["faces_per_s"] = round(counts["faces"] / median) if median else None
+                    print(f"{op:<19}{mesh:<14}{counts['faces']:>9}{median:>10.4f}"
+                          f"{row['faces_per_s'] / 1e6 if row['faces_per_s'] else 0:>10.2f}{row['peak_rss_mb']:>13.1f}")
+                else:
+                    print(f"{op:<19}{mesh:<14}{counts['faces']:>9}  skipped: {measured['skipped']}")
+                results.append(row)
+
+    report = {
+        "environment": _environment(),
+        "settings": {"repeat": args.repeat, "sidecar": not args.no_sidecar},
+        "results": results,
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.baseline is not None:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print(f"\nNo regressions over {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
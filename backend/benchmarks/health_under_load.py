@@ -0,0 +1,126 @@
+"""
+White Dwarf — Health Latency Under Geometry Load
+
+Starts the API with uvicorn, samples GET /health latency while idle, then
+again while several ~1M-face meshes are analyzed concurrently through
+POST /api/physics. With geometry offloaded to the process pool the two
+latency distributions should be close.
+
+Usage (from backend/):
+    python -m benchmarks.health_under_load --meshes 4 --subdivisions 8
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import trimesh
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.config import OUTPUTS_DIR  # noqa: E402
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _write_meshes(count: int, subdivisions: int) -> list:
+    """Write `count` icospheres (~1.3M faces at subdivision 8) to OUTPUTS_DIR."""
+    sphere = trimesh.creation.icosphere(subdivisions=subdivisions)
+    names = []
+    for i in range(count):
+        name = f"bench_load_{i}_mesh.obj"
+        sphere.export(str(OUTPUTS_DIR / name))
+        names.append(name)
+    print(f"Wrote {count} meshes with {len(sphere.faces)} faces each")
+    return names
+
+
+async def _sample_health(client: httpx.AsyncClient, stop: asyncio.Event, interval: float) -> list:
+    latencies = []
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        resp = await client.get("/health")
+        resp.raise_for_status()
+        latencies.append((time.perf_counter() - t0) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+def _summary(label: str, ms: list):
+    ms = sorted(ms)
+    p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+    print(
+        f"{label:>8}: n={len(ms):4d}  p50={statistics.median(ms):7.2f} ms  "
+        f"p99={p99:7.2f} ms  max={ms[-1]:7.2f} ms"
+    )
+
+
+async def _run(base_url: str, names: list, idle_seconds: float, interval: float):
+    async with httpx.AsyncClient(base_url=base_url, timeout=600) as client:
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(_sample_health(client, stop, interval))
+        await asyncio.sleep(idle_seconds)
+        stop.set()
+        idle = await sampler
+
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(_sample_health(client, stop, interval))
+        t0 = time.perf_counter()
+        results = await asyncio.gather(*[
+            client.post("/api/physics", json={"mesh_url": f"/outputs/{n}"}) for n in names
+        ])
+        elapsed = time.perf_counter() - t0
+        stop.set()
+        loaded = await sampler
+
+    for r in results:
+        r.raise_for_status()
+    print(f"Analyzed {len(names)} meshes concurrently in {elapsed:.2f}s")
+    _summary("idle", idle)
+    _summary("loaded", loaded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meshes", type=int, default=4, help="Concurrent physics requests")
+    parser.add_argument("--subdivisions", type=int, default=8, help="Icosphere subdivisions (8 ≈ 1.3M faces)")
+    parser.add_argument("--idle-seconds", type=float, default=3.0)
+    parser.add_argument("--interval", type=float, default=0.05, help="Seconds between health probes")
+    args = parser.parse_args()
+
+    names = _write_meshes(args.meshes, args.subdivisions)
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=str(BACKEND_DIR),
+        env={**os.environ},
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(f"{base_url}/health", timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.1)
+        asyncio.run(_run(base_url, names, args.idle_seconds, args.interval))
+    finally:
+        server.terminate()
+        server.wait()
+        for name in names:
+            (OUTPUTS_DIR / name).unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+White Dwarf — Synthetic Benchmark Meshes
+
+Deterministic meshes of a requested face count, written as OBJ:
+  sphere  UV sphere, the smooth best case
+  chair   seat, back and four legs built from finely gridded boxes
+  scan    bumpy, noisy blob with a flattened base, like a photogrammetry scan
+
+The same (kind, faces) always produces byte-identical files, so timings are
+comparable across runs and machines. Generated files are cached by name,
+with their vertex/face counts in a small JSON file next to each OBJ.
+
+Usage (from backend/):
+    python -m benchmarks.meshes --kinds sphere,chair,scan --sizes 1k,100k --out /tmp/meshes
+"""
+import argparse
+import json
+import math
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+KINDS = ("sphere", "chair", "scan")
+# Bump when generator output changes so cached files are regenerated
+GENERATOR_VERSION = 1
+DEFAULT_DIR = Path(tempfile.gettempdir()) / "white-dwarf-bench-meshes"
+
+Mesh = Tuple[np.ndarray, np.ndarray]
+
+
+def parse_size(text: str) -> int:
+    """'1k' → 1000, '5m' → 5000000."""
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+def size_label(faces: int) -> str:
+    if faces >= 1_000_000 and faces % 1_000_000 == 0:
+        return f"{faces // 1_000_000}m"
+    if faces >= 1_000 and faces % 1_000 == 0:
+        return f"{faces // 1_000}k"
+    return str(faces)
+
+
+def _uv_sphere(faces: int, radius: float = 1.0) -> Mesh:
+    """UV sphere with about `faces` triangles (2 * lon * lat, lon = 2 * lat)."""
+    lat = max(2, round(math.sqrt(faces / 4)))
+    lon = 2 * lat
+    theta = np.linspace(0, np.pi, lat + 1)[1:-1]
+    phi = np.linspace(0, 2 * np.pi, lon, endpoint=False)
+    t, p = np.meshgrid(theta, phi, indexing="ij")
+    ring = np.stack([np.sin(t) * np.cos(p), np.cos(t), np.sin(t) * np.sin(p)], axis=-1).reshape(-1, 3)
+    vertices = np.vstack([[0, 1, 0], ring, [0, -1, 0]]) * radius
+
+    rows = lat - 1
+    idx = 1 + np.arange(rows * lon).reshape(rows, lon)
+    nxt = np.roll(idx, -1, axis=1)
+    top = np.column_stack([np.zeros(lon, int), nxt[0], idx[0]])
+    bottom_pole = len(vertices) - 1
+    bottom = np.column_stack([np.full(lon, bottom_pole), idx[-1], nxt[-1]])
+    a, b, c, d = idx[:-1], nxt[:-1], idx[1:], nxt[1:]
+    quads = np.concatenate([
+        np.stack([a, b, c], axis=-1).reshape(-1, 3),
+        np.stack([b, d, c], axis=-1).reshape(-1, 3),
+    ])
+    return vertices, np.vstack([top, quads, bottom])
+
+
+def _grid_box(center, extents, n: int) -> Mesh:
+    """Box whose six sides are n×n quad grids, triangles wound outward."""
+    center, half = np.asarray(center, float), np.asarray(extents, float) / 2
+    u = np.linspace(-1, 1, n + 1)
+    uu, vv = np.meshgrid(u, u, indexing="ij")
+    grid = np.arange((n + 1) ** 2).reshape(n + 1, n + 1)
+    a, b, c, d = grid[:-1, :-1], grid[1:, :-1], grid[:-1, 1:], grid[1:, 1:]
+    tris = np.concatenate([np.stack([a, b, d], -1).reshape(-1, 3), np.stack([a, d, c], -1).reshape(-1, 3)])
+
+    vertices, faces = [], []
+    for axis in range(3):
+        i, j = [k for k in range(3) if k != axis]
+        for sign in (-1.0, 1.0):
+            side = np.empty((uu.size, 3))
+            side[:, axis] = sign
+            side[:, i] = uu.ravel()
+            side[:, j] = vv.ravel()
+            # (i, j, axis) is right-handed for axis 0 and 2, left-handed for 1
+            flip = (sign < 0) != (axis == 1)
+            offset = sum(len(v) for v in vertices)
+            faces.append((tris[:, ::-1] if flip else tris) + offset)
+            vertices.append(center + side * half)
+    return np.vstack(vertices), np.vstack(faces)
+
+
+def _chair(faces: int) -> Mesh:
+    parts = [
+        ((0.0, 0.45, 0.0), (0.5, 0.05, 0.5)),     # seat
+        ((0.0, 0.8, -0.225), (0.5, 0.65, 0.05)),  # back
+    ] + [
+        ((x, 0.2125, z), (0.05, 0.425, 0.05))     # legs
+        for x in (-0.225, 0.225) for z in (-0.225, 0.225)
+    ]
+    n = max(1, round(math.sqrt(faces / (len(parts) * 12))))
+    meshes = [_grid_box(center, extents, n) for center, extents in parts]
+    return _concatenate(meshes)
+
+
+def _scan(faces: int) -> Mesh:
+    vertices, tris = _uv_sphere(faces)
+    rng = np.random.default_rng(11)
+    theta = np.arccos(np.clip(vertices[:, 1], -1, 1))
+    phi = np.arctan2(vertices[:, 2], vertices[:, 0])
+    radius = 1 + 0.08 * np.sin(3 * theta) * np.cos(2 * phi) + rng.normal(0, 0.004, len(vertices))
+    vertices = vertices * radius[:, None] * np.array([1.0, 0.7, 0.9])
+    # Sitting on a table: the base is cut flat
+    vertices[:, 1] = np.maximum(vertices[:, 1], -0.55)
+    vertices[:, 1] -= vertices[:, 1].min()
+    return vertices, tris
+
+
+def _concatenate(meshes: List[Mesh]) -> Mesh:
+    offsets = np.cumsum([0] + [len(v) for v, _ in meshes[:-1]])
+    return np.vstack([v for v, _ in meshes]), np.vstack([f + o for (_, f), o in zip(meshes, offsets)])
+
+
+_GENERATORS = {"sphere": _uv_sphere, "chair": _chair, "scan": _scan}
+
+
+def generate(kind: str, faces: int) -> Mesh:
+    """(vertices, faces) of a synthetic mesh with roughly `faces` triangles."""
+    if kind not in _GENERATORS:
+        raise ValueError(f"Unknown mesh kind: {kind} (choose from {', '.join(KINDS)})")
+    vertices, tris = _GENERATORS[kind](faces)
+    if kind == "sphere":
+        vertices = vertices.copy()
+        vertices[:, 1] -= vertices[:, 1].min()
+    return vertices, tris
+
+
+def write_obj(path: Path, vertices: np.ndarray, faces: np.ndarray, rows_per_chunk: int = 1 << 16):
+    """Write an OBJ in chunks (1-based indices), atomically."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as fh:
+        fh.write(f"# White Dwarf benchmark mesh: {len(vertices)} vertices, {len(faces)} faces\n")
+        for start in range(0, len(vertices), rows_per_chunk):
+            block = vertices[start:start + rows_per_chunk]
+            fh.write("".join("v %.6f %.6f %.6f\n" % tuple(row) for row in block.tolist()))
+        for start in range(0, len(faces), rows_per_chunk):
+            block = faces[start:start + rows_per_chunk] + 1
+            fh.write("".join("f %d %d %d\n" % tuple(row) for row in block.tolist()))
+    tmp.replace(path)
+
+
+def ensure_mesh(kind: str, faces: int, directory: Path = DEFAULT_DIR) -> Tuple[Path, Dict[str, int]]:
+    """Path to the cached OBJ for (kind, faces) and its counts, generating it if missing."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{kind}_{size_label(faces)}_v{GENERATOR_VERSION}.obj"
+    meta = path.with_suffix(".counts.json")
+    if path.exists() and meta.exists():
+        try:
+            return path, json.loads(meta.read_text())
+        except ValueError:
+            pass
+
+    vertices, tris = generate(kind, faces)
+    if not path.exists():
+        write_obj(path, vertices, tris)
+    counts = {"vertices": len(vertices), "faces": len(tris)}
+    tmp = meta.with_name(meta.name + ".tmp")
+    tmp.write_text(json.dumps(counts))
+    tmp.replace(meta)
+    return path, counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--kinds", default=",".join(KINDS))
+    parser.add_argument("--sizes", default="1k,10k,100k,1m,5m")
+    parser.add_argument("--out", type=Path, default=DEFAULT_DIR)
+    args = parser.parse_args()
+
+    for kind in args.kinds.split(","):
+        for size in args.sizes.split(","):
+            path, counts = ensure_mesh(kind, parse_size(size), args.out)
+            print(f"{path}  {counts['faces']:>9} faces  {path.stat().st_size / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
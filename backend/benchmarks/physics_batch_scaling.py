@@ -0,0 +1,93 @@
+"""
+White Dwarf — Batch Physics Scaling Benchmark
+
+Writes a set of distinct synthetic meshes, then analyzes the whole batch
+through analyze_batch with a fresh GeometryExecutor per worker count and
+reports throughput, speedup and parallel efficiency. On an otherwise idle
+machine throughput should grow close to linearly up to the core count.
+
+Usage (from backend/):
+    python -m benchmarks.physics_batch_scaling --meshes 32 --subdivisions 6
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import trimesh
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.executor import GeometryExecutor  # noqa: E402
+from app.services.mesh_cache import write_mesh_sidecar  # noqa: E402
+from app.services.physics_batch import analyze_batch  # noqa: E402
+
+
+def write_meshes(directory: Path, count: int, subdivisions: int, sidecars: bool) -> list:
+    """Distinct meshes, so no worker can answer from its mesh cache."""
+    rng = np.random.default_rng(3)
+    base = trimesh.creation.icosphere(subdivisions=subdivisions)
+    paths = []
+    for i in range(count):
+        mesh = base.copy()
+        mesh.vertices *= rng.uniform(0.5, 2.0, size=3)
+        mesh.vertices[:, 1] -= mesh.vertices[:, 1].min()
+        path = directory / f"bench{i:03d}_mesh.obj"
+        mesh.export(str(path))
+        if sidecars:
+            write_mesh_sidecar(str(path))
+        paths.append(path)
+    return paths
+
+
+async def run_batch(paths: list, workers: int) -> float:
+    executor = GeometryExecutor(workers, max_queue=len(paths), task_timeout=600)
+    executor.start()
+    try:
+        # Spawn and import in every worker before the clock starts
+        await asyncio.gather(*(executor.run(os.getpid) for _ in range(workers * 2)))
+        start = time.perf_counter()
+        async for index, _, error in analyze_batch(paths, executor):
+            if error is not None:
+                raise RuntimeError(f"{paths[index].name}: {error}")
+        return time.perf_counter() - start
+    finally:
+        executor.shutdown()
+
+
+def main():
+    cores = os.cpu_count() or 1
+    default_workers = sorted({1, *(2 ** i for i in range(1, cores.bit_length()) if 2 ** i <= cores), cores})
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meshes", type=int, default=32)
+    parser.add_argument("--subdivisions", type=int, default=6, help="icosphere level (6 ≈ 82k faces)")
+    parser.add_argument("--workers", default=",".join(map(str, default_workers)),
+                        help="comma-separated worker counts to try")
+    parser.add_argument("--no-sidecar", action="store_true", help="force OBJ parsing in every worker")
+    args = parser.parse_args()
+    worker_counts = [int(w) for w in args.workers.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_meshes(Path(tmp), args.meshes, args.subdivisions, not args.no_sidecar)
+        faces = len(trimesh.creation.icosphere(subdivisions=args.subdivisions).faces)
+        print(f"{args.meshes} meshes × {faces} faces, {cores} cores, "
+              f"{'OBJ parse' if args.no_sidecar else 'sidecar'} input\n")
+        print(f"{'workers':>8}{'seconds':>10}{'meshes/s':>10}{'speedup':>9}{'efficiency':>12}")
+
+        baseline = None
+        for workers in worker_counts:
+            elapsed = asyncio.run(run_batch(paths, workers))
+            throughput = args.meshes / elapsed
+            baseline = baseline or throughput
+            speedup = throughput / baseline
+            print(f"{workers:>8}{elapsed:>10.2f}{throughput:>10.1f}{speedup:>8.2f}×{speedup / workers * worker_counts[0]:>11.0%}")
+
+
+if __name__ == "__main__":
+    main()
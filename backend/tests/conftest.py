@@ -0,0 +1,17 @@
+"""
+White Dwarf — Test Setup
+Points DATA_DIR at a throwaway directory before the app is imported so
+tests never touch local job, cache or catalog databases.
+
+Usage (from backend/):
+    python -m pytest tests
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="white-dwarf-tests-"))
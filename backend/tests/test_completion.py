@@ -0,0 +1,138 @@
+"""
+White Dwarf — Prediction Completion Tests
+Webhook wake-up, early callbacks and polling fallback against a local fake
+Replicate API, with callbacks delivered through the webhooks router.
+"""
+import asyncio
+import itertools
+import json
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.routers import webhooks
+from app.services import completion
+from app.services.replicate_client import ReplicateClient
+
+SECRET = "test-secret"
+MODEL = "owner/model:abc123"
+_ids = itertools.count(1)
+
+
+@pytest.fixture
+def webhooks_on(monkeypatch):
+    monkeypatch.setattr(completion, "WEBHOOK_BASE_URL", "https://white-dwarf.test")
+    monkeypatch.setattr(completion, "WEBHOOK_SECRET", SECRET)
+    monkeypatch.setattr(webhooks, "WEBHOOK_SECRET", SECRET)
+
+
+class FakeReplicate:
+    """Predictions API whose polls report `statuses` in turn (the last one repeats)."""
+
+    def __init__(self, statuses=("processing",)):
+        self.id = f"pred-{next(_ids)}"
+        self.statuses = list(statuses)
+        self.created = []
+        self.polls = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "POST" and request.url.path == "/v1/predictions":
+            self.created.append(json.loads(request.content))
+            return httpx.Response(201, json=self.prediction("starting"))
+        if request.method == "GET" and request.url.path == f"/v1/predictions/{self.id}":
+            self.polls += 1
+            status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+            return httpx.Response(200, json=self.prediction(status))
+        return httpx.Response(404)
+
+    def prediction(self, status: str):
+        data = {
+            "id": self.id,
+            "status": status,
+            "urls": {
+                "get": f"https://api.replicate.com/v1/predictions/{self.id}",
+                "cancel": f"https://api.replicate.com/v1/predictions/{self.id}/cancel",
+            },
+        }
+        if status == "succeeded":
+            data["output"] = "https://replicate.delivery/polled.glb"
+        return data
+
+
+def make_client(fake: FakeReplicate) -> ReplicateClient:
+    client = ReplicateClient("test-token")
+    client._http._client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handler))
+    return client
+
+
+async def post_webhook(fake: FakeReplicate, token: str = SECRET) -> httpx.Response:
+    app = FastAPI()
+    app.include_router(webhooks.router, prefix="/api")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+        return await http.post(
+            f"/api/webhooks/replicate?token={token}",
+            json={"id": fake.id, "status": "succeeded", "output": "https://replicate.delivery/pushed.glb"},
+        )
+
+
+def test_webhook_wakes_waiting_prediction(webhooks_on):
+    fake = FakeReplicate()
+    client = make_client(fake)
+
+    async def scenario():
+        waiter = asyncio.create_task(client.generate_mesh(MODEL, "a chair"))
+        await asyncio.sleep(0.05)
+        start = time.monotonic()
+        response = await post_webhook(fake)
+        url = await waiter
+        return response, url, time.monotonic() - start
+
+    response, url, elapsed = asyncio.run(scenario())
+
+    assert response.json() == {"accepted": True}
+    assert url == "https://replicate.delivery/pushed.glb"
+    assert elapsed < 1.0
+    assert fake.polls == 0
+    assert fake.created[0]["webhook"] == f"https://white-dwarf.test/api/webhooks/replicate?token={SECRET}"
+
+
+def test_callback_arriving_before_waiter_registers(webhooks_on):
+    fake = FakeReplicate()
+    client = make_client(fake)
+
+    async def scenario():
+        prediction = await client._create_prediction(MODEL, {"prompt": "a chair"})
+        # The provider finishes before our create call has returned
+        await post_webhook(fake)
+        return await asyncio.wait_for(client._poll_prediction(prediction, MODEL), 1.0)
+
+    result = asyncio.run(scenario())
+
+    assert result["output"] == "https://replicate.delivery/pushed.glb"
+    assert fake.polls == 0
+
+
+def test_polls_when_webhook_never_arrives(webhooks_on, monkeypatch):
+    monkeypatch.setattr(completion, "POLL_MIN_INTERVAL", 0.01)
+    monkeypatch.setattr(completion, "POLL_WEBHOOK_INTERVAL", 0.05)
+    fake = FakeReplicate(statuses=("processing", "succeeded"))
+    client = make_client(fake)
+
+    url = asyncio.run(asyncio.wait_for(client.generate_mesh(MODEL, "a chair"), 2.0))
+
+    assert url == "https://replicate.delivery/polled.glb"
+    assert fake.polls == 2
+
+
+def test_webhooks_disabled_without_secret(monkeypatch):
+    monkeypatch.setattr(completion, "WEBHOOK_BASE_URL", "https://white-dwarf.test")
+    monkeypatch.setattr(completion, "WEBHOOK_SECRET", "")
+    monkeypatch.setattr(webhooks, "WEBHOOK_SECRET", "")
+    fake = FakeReplicate()
+
+    response = asyncio.run(post_webhook(fake, token=""))
+
+    assert completion.webhook_url("replicate") is None
+    assert response.status_code == 403
@@ -0,0 +1,35 @@
+"""
+White Dwarf — Mesh Cache Tests
+Lookup accounting and metrics of the shared parsed-mesh cache.
+"""
+import trimesh
+
+from app.services.mesh_cache import MeshCache
+from app.services.metrics import MESH_CACHE_LOOKUPS
+
+
+def test_get_arrays_looks_the_mesh_up_once(tmp_path):
+    path = tmp_path / "sphere.obj"
+    trimesh.creation.icosphere(subdivisions=2).export(path)
+    cache = MeshCache(max_bytes=1 << 30)
+
+    arrays = cache.get_arrays(str(path))
+    assert len(arrays.faces) == 320
+    assert (cache.misses, cache.hits) == (1, 0)
+
+    cache.get_arrays(str(path))
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+def test_lookups_are_exported_as_counters(tmp_path):
+    path = tmp_path / "box.obj"
+    trimesh.creation.box().export(path)
+    cache = MeshCache(max_bytes=1 << 30)
+    before = MESH_CACHE_LOOKUPS.values()
+
+    cache.get_mesh(str(path))
+    cache.get_arrays(str(path))
+    cache.write_sidecar(str(path))
+    cache.get_arrays(str(path))
+
+    assert MESH_CACHE_LOOKUPS.since(before) == {("miss",): 1, ("hit",): 2, ("sidecar",): 1}
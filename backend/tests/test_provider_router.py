@@ -0,0 +1,170 @@
+"""
+White Dwarf — Provider Router Tests
+Selection, hedging, cancellation and failover against local fake providers.
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.services.admission import ProviderBusyError
+from app.services.provider_router import MESH, TEXTURE, Provider, ProviderRouter, job_slots
+
+
+class FakeClient:
+    """Provider client whose predictions queue, then run, for fixed times."""
+
+    def __init__(self, name: str, queue: float = 0.0, run: float = 0.0, error: Exception = None):
+        self.name = name
+        self.queue = queue
+        self.run = run
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+
+    async def generate_mesh(self, model, prompt, image_url=None, on_start=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.queue)
+            if self.error is not None:
+                raise self.error
+            on_start()
+            await asyncio.sleep(self.run)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return f"https://{self.name}.test/mesh.obj"
+
+
+def make_router(*clients: FakeClient, hedge_after: float = 0.0) -> ProviderRouter:
+    providers = [Provider(c.name, c, {MESH: f"{c.name}-model"}, enabled=lambda: True) for c in clients]
+    return ProviderRouter(providers, window=10, hedge_after=hedge_after, failure_penalty=60.0)
+
+
+def ranked(router: ProviderRouter):
+    return [p.name for p in router.rank(MESH)]
+
+
+def test_routes_to_lowest_expected_latency():
+    slow, fast = FakeClient("slow"), FakeClient("fast")
+    router = make_router(slow, fast)
+    router.stats_for("slow", "slow-model").run.extend([5.0, 5.0])
+    router.stats_for("fast", "fast-model").run.extend([1.0, 1.0])
+
+    url = asyncio.run(router.generate_mesh("a chair"))
+
+    assert url == "https://fast.test/mesh.obj"
+    assert (slow.calls, fast.calls) == (0, 1)
+
+
+def test_hedge_keeps_first_to_start_and_cancels_the_loser():
+    queued, quick = FakeClient("queued", queue=1.0), FakeClient("quick", queue=0.05, run=0.01)
+    router = make_router(queued, quick, hedge_after=0.2)
+
+    async def scenario():
+        start = time.monotonic()
+        url = await router.generate_mesh("a chair")
+        elapsed = time.monotonic() - start
+        await asyncio.sleep(0.01)
+        return url, elapsed
+
+    url, elapsed = asyncio.run(scenario())
+
+    assert url == "https://quick.test/mesh.obj"
+    assert elapsed < 0.5
+    assert queued.cancelled == 1
+    assert (router.hedged, router.hedge_wins) == (1, 1)
+    # The loser's time in the queue is remembered, so the next call skips it
+    assert ranked(router) == ["quick", "queued"]
+
+
+def test_caller_cancellation_cancels_queued_prediction():
+    queued = FakeClient("queued", queue=10.0)
+    router = make_router(queued)
+
+    async def scenario():
+        task = asyncio.create_task(router.generate_mesh("a chair"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.01)
+
+    asyncio.run(scenario())
+
+    stats = router.stats_for("queued", "queued-model")
+    assert queued.cancelled == 1
+    assert stats.cancelled == 1
+    assert not stats.waiting
+    # A caller giving up says nothing about the provider's queue
+    assert not stats.queue
+
+
+def test_failure_fails_over_and_penalises_the_provider():
+    broken = FakeClient("broken", error=RuntimeError("model crashed"))
+    working = FakeClient("working", run=0.01)
+    router = make_router(broken, working)
+
+    url = asyncio.run(router.generate_mesh("a chair"))
+
+    assert url == "https://working.test/mesh.obj"
+    assert (broken.calls, working.calls) == (1, 1)
+    assert router.failovers == 1
+    assert ranked(router) == ["working", "broken"]
+
+
+def test_error_raised_when_every_provider_fails():
+    first = FakeClient("first", error=RuntimeError("first down"))
+    second = FakeClient("second", error=RuntimeError("second down"))
+    router = make_router(first, second)
+
+    with pytest.raises(RuntimeError, match="first down"):
+        asyncio.run(router.generate_mesh("a chair"))
+    assert (first.calls, second.calls) == (1, 1)
+
+
+def test_configured_when_any_provider_has_credentials_for_the_kind():
+    replicate = Provider("replicate", FakeClient("replicate"), {MESH: "m", TEXTURE: "t"},
+                         enabled=lambda: False, configured=lambda: False)
+    runpod = Provider("runpod", FakeClient("runpod"), {MESH: "endpoint", TEXTURE: ""},
+                      enabled=lambda: False, configured=lambda: True)
+    router = ProviderRouter([replicate, runpod], window=10, hedge_after=0.0, failure_penalty=60.0)
+
+    # An open circuit does not make a provider unconfigured
+    assert router.configured(MESH)
+    assert not router.configured(TEXTURE)
+
+
+def test_failover_start_is_not_a_hedge_win():
+    broken = FakeClient("broken", error=RuntimeError("model crashed"))
+    working = FakeClient("working", run=0.01)
+    router = make_router(broken, working, hedge_after=5.0)
+
+    asyncio.run(router.generate_mesh("a chair"))
+
+    assert router.failovers == 1
+    assert (router.hedged, router.hedge_wins) == (0, 0)
+
+
+def test_busy_admission_is_not_a_provider_failure():
+    full = FakeClient("full", error=ProviderBusyError("full is at capacity", retry_after=3))
+    router = make_router(full)
+
+    with pytest.raises(ProviderBusyError):
+        asyncio.run(router.generate_mesh("a chair"))
+    stats = router.stats_for("full", "full-model")
+    assert (stats.busy, stats.failed, stats.failure_rate()) == (1, 0, 0.0)
+
+
+def test_job_predictions_hold_the_slot_of_the_routed_provider():
+    router = make_router(FakeClient("runpod", run=0.1))
+
+    async def scenario():
+        slots = {"replicate": asyncio.Semaphore(1), "runpod": asyncio.Semaphore(1)}
+        job_slots.set(slots.__getitem__)
+        start = time.monotonic()
+        await asyncio.gather(router.generate_mesh("a chair"), router.generate_mesh("a table"))
+        return time.monotonic() - start
+
+    # One runpod slot: the second prediction waits for the first
+    assert asyncio.run(scenario()) >= 0.2
@@ -0,0 +1,180 @@
+"""
+White Dwarf — Provider Resilience Tests
+Retries and circuit breaking against a local fault-injecting provider stub.
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services import completion
+from app.services.replicate_client import ReplicateClient
+from app.services.resilience import CircuitBreaker, CircuitOpenError, Resilience
+
+MODEL = "owner/model:abc123"
+PREDICTION_URL = "https://api.replicate.com/v1/predictions/pred-1"
+
+
+class FaultyServer:
+    """
+    Answers each request with the next scripted fault or response.
+
+    Script entries are a status code, a (status, headers, json) tuple, or an
+    exception to raise as a transport error; the last entry repeats.
+    """
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        step = self.script.pop(0) if len(self.script) > 1 else self.script[0]
+        if isinstance(step, Exception):
+            raise step
+        if isinstance(step, int):
+            return httpx.Response(step)
+        status, headers, body = step
+        return httpx.Response(status, headers=headers, json=body)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+def fast_policy(attempts: int = 4, threshold: int = 5, reset_timeout: float = 30.0) -> Resilience:
+    return Resilience(
+        "stub", attempts=attempts, base_delay=0.001, max_delay=0.01, retry_after_max=5.0,
+        breaker=CircuitBreaker("stub", threshold, reset_timeout),
+    )
+
+
+def prediction(status: str):
+    body = {"id": "pred-1", "status": status, "urls": {"get": PREDICTION_URL}}
+    if status == "succeeded":
+        body["output"] = "https://replicate.delivery/mesh.glb"
+    return body
+
+
+def replicate_against(server: FaultyServer) -> ReplicateClient:
+    client = ReplicateClient("test-token")
+    client._http._client = server.client
+    client.resilience = fast_policy()
+    return client
+
+
+def test_429_waits_for_retry_after():
+    server = FaultyServer((429, {"Retry-After": "0.2"}, {}), 201)
+    policy = fast_policy()
+
+    async def scenario():
+        async with server.client as http:
+            start = time.monotonic()
+            response = await policy.send(lambda: http.post(PREDICTION_URL), idempotent=False)
+            return response, time.monotonic() - start
+
+    response, elapsed = asyncio.run(scenario())
+
+    assert response.status_code == 201
+    assert len(server.requests) == 2
+    assert elapsed >= 0.2
+    # A rate limit means the provider is up: the breaker is untouched
+    assert (policy.retries, policy.breaker.failures) == (1, 0)
+
+
+def test_poll_survives_502_and_connection_reset(monkeypatch):
+    monkeypatch.setattr(completion, "POLL_MIN_INTERVAL", 0.01)
+    server = FaultyServer(
+        502,
+        httpx.ReadError("connection reset by peer"),
+        (200, {}, prediction("succeeded")),
+    )
+    client = replicate_against(server)
+
+    result = asyncio.run(client._poll_prediction(prediction("starting"), MODEL, max_wait=5))
+
+    assert result["output"] == "https://replicate.delivery/mesh.glb"
+    assert len(server.requests) == 3
+    assert client.resilience.retries == 2
+    assert client.resilience.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.parametrize("fault", [500, httpx.ReadError("connection reset by peer")])
+def test_create_is_not_retried_once_it_may_have_reached_the_provider(fault):
+    server = FaultyServer(fault, (201, {}, prediction("starting")))
+    client = replicate_against(server)
+
+    with pytest.raises((httpx.HTTPStatusError, httpx.ReadError)):
+        asyncio.run(client.generate_mesh(MODEL, "a chair"))
+    assert len(server.requests) == 1
+    assert client.resilience.retries == 0
+
+
+def test_breaker_opens_probes_and_closes():
+    server = FaultyServer(503, 503, 503, 200)
+    policy = fast_policy(attempts=1, threshold=2, reset_timeout=0.1)
+    breaker = policy.breaker
+
+    async def scenario():
+        async with server.client as http:
+            def send():
+                return policy.send(lambda: http.get(PREDICTION_URL), idempotent=True)
+
+            await send()
+            await send()
+            assert breaker.state == CircuitBreaker.OPEN
+
+            with pytest.raises(CircuitOpenError) as rejected:
+                await send()
+            assert rejected.value.retry_after >= 1
+            assert len(server.requests) == 2
+
+            # After the timeout one probe goes through; its failure re-opens
+            await asyncio.sleep(0.1)
+            await send()
+            assert breaker.state == CircuitBreaker.OPEN
+            assert breaker.times_opened == 2
+
+            await asyncio.sleep(0.1)
+            response = await send()
+            assert response.status_code == 200
+            assert breaker.state == CircuitBreaker.CLOSED
+            assert breaker.failures == 0
+
+    asyncio.run(scenario())
+    assert breaker.rejected == 1
+
+
+def test_open_circuit_fails_creates_fast_but_polls_wait():
+    server = FaultyServer(503, 200)
+    policy = fast_policy(attempts=1, threshold=1, reset_timeout=0.2)
+    policy.CIRCUIT_WAIT_INTERVAL = 0.01
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        async with server.client as http:
+            await policy.send(lambda: http.get(PREDICTION_URL), idempotent=True)
+            assert policy.breaker.state == CircuitBreaker.OPEN
+
+            with pytest.raises(CircuitOpenError):
+                await policy.send(lambda: http.post(PREDICTION_URL), idempotent=False)
+
+            # A poll of a running prediction waits to become the probe instead
+            start = time.monotonic()
+            response = await policy.send(
+                lambda: http.get(PREDICTION_URL), idempotent=True, deadline=loop.time() + 5,
+            )
+            assert response.status_code == 200
+            assert time.monotonic() - start >= 0.15
+            assert policy.breaker.state == CircuitBreaker.CLOSED
+
+            # ...but not past its own deadline
+            policy.breaker.record_failure()
+            with pytest.raises(TimeoutError):
+                await policy.send(
+                    lambda: http.get(PREDICTION_URL), idempotent=True, deadline=loop.time() + 0.05,
+                )
+
+    asyncio.run(scenario())
+    assert len(server.requests) == 2
@@ -0,0 +1,64 @@
+"""
+White Dwarf — Result Cache Tests
+File ownership on refresh and eviction: superseded results, files still
+linked from job or catalog records, and exports made from a cached mesh.
+"""
+import pytest
+
+from app.services import result_cache
+from app.services.result_cache import ResultCache
+
+
+@pytest.fixture
+def outputs(tmp_path, monkeypatch):
+    directory = tmp_path / "outputs"
+    directory.mkdir()
+    monkeypatch.setattr(result_cache, "OUTPUTS_DIR", directory)
+    monkeypatch.setattr(result_cache, "_file_users", [])
+    return directory
+
+
+def write(directory, name, size=100):
+    (directory / name).write_bytes(b"x" * size)
+    return name
+
+
+def make_cache(tmp_path, max_bytes=10_000, max_age=3600.0):
+    return ResultCache("mesh", tmp_path / "cache.db", max_bytes, max_age)
+
+
+def test_refresh_keeps_the_previous_files(outputs, tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("prompt", [write(outputs, "a_mesh.obj")], {"mesh_url": "/outputs/a_mesh.obj"})
+    cache.put("prompt", [write(outputs, "b_mesh.obj")], {"mesh_url": "/outputs/b_mesh.obj"})
+
+    assert (outputs / "a_mesh.obj").exists()
+    assert cache.get("prompt")["mesh_url"] == "/outputs/b_mesh.obj"
+    # The superseded files are still accounted for, so they age out later
+    assert cache.stats()["entries"] == 2
+
+
+def test_eviction_deletes_exports_with_the_mesh(outputs, tmp_path):
+    cache = make_cache(tmp_path, max_bytes=150)
+    old = write(outputs, "old_mesh.obj")
+    for name in ("old_mesh.glb", "old_mesh.export.json", "old_mesh_lod25.glb", "old_mesh_lod5.glb"):
+        write(outputs, name)
+    cache.put("old", [old], {})
+    cache.put("new", [write(outputs, "new_mesh.obj")], {})
+
+    assert sorted(p.name for p in outputs.iterdir()) == ["new_mesh.obj"]
+    assert cache.get("old") is None
+
+
+def test_eviction_spares_files_still_in_use(outputs, tmp_path):
+    cache = make_cache(tmp_path, max_bytes=150)
+    result_cache.register_file_users(lambda names: names & {"kept_mesh.glb"})
+    cache.put("kept", [write(outputs, "kept_mesh.obj")], {})
+    write(outputs, "kept_mesh.glb")
+    cache.put("other", [write(outputs, "other_mesh.obj")], {})
+    cache.put("third", [write(outputs, "third_mesh.obj")], {})
+
+    # The job-linked export pins its whole entry; the next LRU entry goes instead
+    assert (outputs / "kept_mesh.obj").exists() and (outputs / "kept_mesh.glb").exists()
+    assert not (outputs / "other_mesh.obj").exists()
+    assert cache.get("kept") is not None